@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import time
+from datetime import datetime, timezone
+
+from benchmarks.startup import ROOT, git_revision
+from src.browser_factory import BROWSER_NAMES, create_browser, template_profile_path
+from src.host_config import get_base_url
+
+HISTORY = os.path.join(ROOT, "benchmarks", "results", "launch.jsonl")
+
+
+def launch_once(browser_name: str, warm_profile: bool) -> tuple[float, float]:
+    started = time.perf_counter()
+    browser = create_browser(browser_name, warm_profile=warm_profile)
+    if browser is None:
+        raise RuntimeError(f"Browser {browser_name} is not installed or configured.")
+
+    try:
+        launched = time.perf_counter() - started
+        browser.get(get_base_url() + "login")
+        first_page = time.perf_counter() - started - launched
+    finally:
+        browser.quit()
+
+    return launched, first_page
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Compare browser start with an empty and with the warm profile."
+    )
+    parser.add_argument("--browser_name", default="firefox", choices=BROWSER_NAMES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Drop the template profile first"
+    )
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        shutil.rmtree(template_profile_path(args.browser_name), ignore_errors=True)
+
+    started = time.perf_counter()
+    create_browser(args.browser_name).quit()
+    template_build = time.perf_counter() - started
+
+    result = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "browser": args.browser_name,
+        "runs": args.runs,
+        "first_warm_launch": round(template_build, 3),
+    }
+
+    for mode, warm_profile in (("cold", False), ("warm", True)):
+        launches, first_pages = zip(
+            *(launch_once(args.browser_name, warm_profile) for _ in range(args.runs))
+        )
+        result[mode] = {
+            "launch": round(statistics.median(launches), 3),
+            "first_page": round(statistics.median(first_pages), 3),
+        }
+        print(
+            f"{mode}: launch median {result[mode]['launch']:.2f}s, "
+            f"login page median {result[mode]['first_page']:.2f}s "
+            f"over {args.runs} runs"
+        )
+
+    print(
+        f"warm saves {result['cold']['launch'] - result['warm']['launch']:.2f}s "
+        f"per launch and {result['cold']['first_page'] - result['warm']['first_page']:.2f}s "
+        f"on the first page"
+    )
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(HISTORY), exist_ok=True)
+        with open(HISTORY, "a") as file:
+            file.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
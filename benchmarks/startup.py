@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY = os.path.join(ROOT, "benchmarks", "results", "startup.jsonl")
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def collect_once(pytest_args: list[str]) -> tuple[float, int]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    match = re.search(r"(\d+) tests? collected", result.stdout)
+    if result.returncode != 0 or not match:
+        raise RuntimeError(f"Collection failed:\n{result.stdout}{result.stderr}")
+
+    return elapsed, int(match.group(1))
+
+
+def slowest_imports(pytest_args: list[str], limit: int) -> list[tuple[int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q"]
+        + pytest_args,
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)", line)
+        if match and not match.group(2):
+            imports.append((int(match.group(1)), match.group(3)))
+
+    return sorted(imports, reverse=True)[:limit]
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Measure how long `pytest --collect-only` takes."
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--imports", type=int, default=10, help="Show N slowest")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("pytest_args", nargs="*")
+    args = parser.parse_args(argv)
+
+    timings = []
+    tests = 0
+    for _ in range(args.runs):
+        elapsed, tests = collect_once(args.pytest_args)
+        timings.append(elapsed)
+
+    result = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "tests": tests,
+        "runs": args.runs,
+        "median": round(statistics.median(timings), 4),
+        "min": round(min(timings), 4),
+        "max": round(max(timings), 4),
+    }
+    print(
+        f"{tests} tests collected: median {result['median']:.3f}s, "
+        f"min {result['min']:.3f}s, max {result['max']:.3f}s over {args.runs} runs"
+    )
+
+    if args.imports:
+        print("\nSlowest top-level imports:")
+        for microseconds, module in slowest_imports(args.pytest_args, args.imports):
+            print(f"{microseconds / 1000:>10.1f} ms  {module}")
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(HISTORY), exist_ok=True)
+        with open(HISTORY, "a") as file:
+            file.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import json
+import logging as logger
+
+import urllib3
+
+from src.contact_data import API_FIELDS, ContactRecord
+
+
+class ApiError(Exception):
+    def __init__(self, method: str, path: str, status: int, data):
+        super().__init__(f"{method} {path} returned {status}: {data}")
+        self.method = method
+        self.path = path
+        self.status = status
+        self.data = data
+
+
+class ContactListApi:
+    def __init__(
+        self,
+        base_url: str,
+        pool: urllib3.PoolManager | None = None,
+        timeout: float = 10,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool = pool or urllib3.PoolManager(maxsize=10, retries=False)
+        self.timeout = timeout
+        self.token: str | None = None
+        self.transport = self.send
+
+    def send(self, method: str, path: str, body: dict | None = None):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        response = self.pool.request(
+            method,
+            self.base_url + path,
+            body=json.dumps(body) if body is not None else None,
+            headers=headers,
+            timeout=self.timeout,
+        )
+
+        try:
+            data = json.loads(response.data) if response.data else None
+        except ValueError:
+            data = response.data.decode(errors="replace")
+
+        return response.status, data
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: dict | None = None,
+        expected: tuple[int, ...] = (200, 201),
+    ):
+        status, data = self.transport(method, path, body)
+
+        if status not in expected:
+            raise ApiError(method, path, status, data)
+
+        return data
+
+    def login(self, email: str, password: str) -> str:
+        logger.debug("API login as %s.", email)
+
+        data = self.request(
+            "POST", "/users/login", {"email": email, "password": password}
+        )
+        self.token = data["token"]
+        return self.token
+
+    def logout(self):
+        self.request("POST", "/users/logout")
+        self.token = None
+
+    def add_user(self, first_name: str, last_name: str, email: str, password: str):
+        data = self.request(
+            "POST",
+            "/users",
+            {
+                "firstName": first_name,
+                "lastName": last_name,
+                "email": email,
+                "password": password,
+            },
+        )
+        self.token = data["token"]
+        return data["user"]
+
+    def delete_me(self):
+        self.request("DELETE", "/users/me")
+        self.token = None
+
+    def get_contacts(self) -> list[ContactRecord]:
+        return [
+            ContactRecord.from_api(data) for data in self.request("GET", "/contacts")
+        ]
+
+    def add_contact(self, contact: ContactRecord) -> ContactRecord:
+        return ContactRecord.from_api(
+            self.request("POST", "/contacts", contact.to_api())
+        )
+
+    def get_contact(self, contact_id: str) -> ContactRecord:
+        return ContactRecord.from_api(self.request("GET", f"/contacts/{contact_id}"))
+
+    def update_contact(self, contact_id: str, changes: dict[str, str]) -> ContactRecord:
+        body = {API_FIELDS[field]: str(value) for field, value in changes.items()}
+        return ContactRecord.from_api(
+            self.request("PATCH", f"/contacts/{contact_id}", body)
+        )
+
+    def delete_contact(self, contact_id: str):
+        return self.request("DELETE", f"/contacts/{contact_id}")
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import logging as logger
+import os
+import shutil
+import tempfile
+from functools import cache
+from typing import TYPE_CHECKING
+
+from src.contact_data import RUN_ID
+from src.host_config import get_base_url, load_env
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+BROWSER_NAMES = ("firefox", "chrome")
+
+CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "its-ui-test"
+)
+BINARIES_CACHE = os.path.join(CACHE_DIR, "binaries.json")
+
+BINARIES = {
+    "firefox": (
+        ("FIREFOX_PATH", ("firefox",)),
+        ("GECKODRIVER_PATH", ("geckodriver",)),
+    ),
+    "chrome": (
+        ("GOOGLE_CHROME_PATH", ("google-chrome", "chromium", "chromium-browser")),
+        ("CHROMEDRIVER_PATH", ("chromedriver",)),
+    ),
+}
+
+FIREFOX_PREFERENCES = {
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.startup.page": 0,
+    "browser.aboutwelcome.enabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.reportingpolicy.firstRun": False,
+    "app.update.auto": False,
+    "browser.cache.disk.enable": True,
+}
+
+CHROME_ARGUMENTS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-component-update",
+)
+
+HUB_CLIENT_CAPABILITY = "its:client"
+
+WARM_UP_PAGES = ("login", "addUser", "contactList", "addContact")
+
+
+@cache
+def resolve_binaries(browser_name: str) -> tuple[str | None, str | None]:
+    load_env()
+
+    cached = {}
+    try:
+        with open(BINARIES_CACHE) as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        pass
+
+    paths = []
+    for variable, commands in BINARIES[browser_name]:
+        path = os.getenv(variable) or cached.get(variable)
+        if not path or not os.path.exists(path):
+            path = next(filter(None, map(shutil.which, commands)), None)
+        paths.append(path)
+        if path:
+            cached[variable] = path
+        else:
+            cached.pop(variable, None)
+
+    # Parallel workers resolve at the same time, so never leave the cache
+    # half-written.
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    descriptor, staging = tempfile.mkstemp(dir=CACHE_DIR, suffix=".json")
+    with os.fdopen(descriptor, "w") as file:
+        json.dump(cached, file, indent=2)
+    os.replace(staging, BINARIES_CACHE)
+
+    return paths[0], paths[1]
+
+
+def template_profile_path(browser_name: str) -> str:
+    return os.path.join(CACHE_DIR, "profiles", browser_name)
+
+
+def _launch(
+    browser_name: str,
+    profile: str | None,
+    bidi: bool = False,
+    hub_url: str | None = None,
+) -> webdriver.Firefox | webdriver.Chrome | webdriver.Remote | None:
+    # The hub launches its own browsers, the local binaries do not matter.
+    browser_path = driver_path = None
+    if not hub_url:
+        browser_path, driver_path = resolve_binaries(browser_name)
+        if not (browser_path and driver_path):
+            return None
+
+    from selenium import webdriver
+
+    if browser_name == "firefox":
+        logger.info("Prepare browser firefox.")
+
+        from selenium.webdriver.firefox.options import Options
+        from selenium.webdriver.firefox.service import Service
+
+        options = Options()
+        if browser_path:
+            options.binary_location = browser_path
+        options.enable_bidi = bidi
+        if profile:
+            options.add_argument("-profile")
+            options.add_argument(profile)
+    else:
+        logger.info("Prepare browser chrome.")
+
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        options = Options()
+        if browser_path:
+            options.binary_location = browser_path
+        options.enable_bidi = bidi
+        for argument in CHROME_ARGUMENTS:
+            options.add_argument(argument)
+        if profile:
+            options.add_argument(f"--user-data-dir={profile}")
+
+    if hub_url:
+        options.set_capability(HUB_CLIENT_CAPABILITY, RUN_ID)
+        return webdriver.Remote(command_executor=hub_url, options=options)
+
+    service = Service(executable_path=driver_path)
+    if browser_name == "firefox":
+        return webdriver.Firefox(service=service, options=options)
+    return webdriver.Chrome(service=service, options=options)
+
+
+def build_template_profile(browser_name: str) -> str | None:
+    template = template_profile_path(browser_name)
+    if os.path.isdir(template):
+        return template
+
+    logger.info("Build %s template profile.", browser_name)
+
+    os.makedirs(os.path.dirname(template), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f"{browser_name}-", dir=os.path.dirname(template))
+
+    if browser_name == "firefox":
+        with open(os.path.join(staging, "user.js"), "w") as file:
+            for name, value in FIREFOX_PREFERENCES.items():
+                file.write(f"user_pref({json.dumps(name)}, {json.dumps(value)});\n")
+
+    browser = _launch(browser_name, staging)
+    if browser is None:
+        shutil.rmtree(staging, ignore_errors=True)
+        return None
+
+    try:
+        for page in WARM_UP_PAGES:
+            browser.get(get_base_url() + page)
+    finally:
+        browser.quit()
+
+    try:
+        os.rename(staging, template)
+    except OSError:
+        # Another process finished its template first.
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return template
+
+
+def copy_profile(template: str) -> str:
+    session_profile = tempfile.mkdtemp(prefix="its-ui-test-profile-")
+    shutil.copytree(
+        template,
+        session_profile,
+        dirs_exist_ok=True,
+        ignore=shutil.ignore_patterns("lock", ".parentlock", "Singleton*"),
+    )
+    return session_profile
+
+
+def create_browser(
+    browser_name: str,
+    warm_profile: bool = True,
+    bidi: bool = False,
+    hub_url: str | None = None,
+) -> webdriver.Firefox | webdriver.Chrome | webdriver.Remote | None:
+    if browser_name not in BROWSER_NAMES:
+        raise ValueError(
+            f"Unknown browser {browser_name!r}, expected one of {BROWSER_NAMES}."
+        )
+
+    if hub_url:
+        # The hub may hand the browser to the next run, so it cannot live in
+        # a profile this process deletes on quit.
+        return _launch(browser_name, None, bidi, hub_url)
+
+    template = build_template_profile(browser_name) if warm_profile else None
+    if not template:
+        return _launch(browser_name, None, bidi)
+
+    session_profile = copy_profile(template)
+    browser = _launch(browser_name, session_profile, bidi)
+    if browser is None:
+        shutil.rmtree(session_profile, ignore_errors=True)
+        return None
+
+    quit_browser = browser.quit
+
+    def quit_and_remove_profile():
+        try:
+            quit_browser()
+        finally:
+            shutil.rmtree(session_profile, ignore_errors=True)
+
+    browser.quit = quit_and_remove_profile
+    return browser
@@ -0,0 +1,688 @@
+import argparse
+import json
+import logging as logger
+import os
+import re
+import socket
+import subprocess
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import urllib3
+
+from src.browser_factory import BROWSER_NAMES, HUB_CLIENT_CAPABILITY, resolve_binaries
+from src.load_generator import percentile
+
+DEFAULT_PORT = 4444
+SESSION_PATH = re.compile(r"^/session/(?P<id>[^/]+)(?P<rest>/.*)?$")
+BROWSER_ALIASES = {"firefox": "firefox", "chrome": "chrome", "chromium": "chrome"}
+OPTIONS_CAPABILITIES = {"firefox": "moz:firefoxOptions", "chrome": "goog:chromeOptions"}
+
+
+class Driver:
+    def __init__(
+        self,
+        browser: str,
+        process: subprocess.Popen | None,
+        url: str,
+        binary: str | None = None,
+    ):
+        self.browser = browser
+        self.process = process
+        self.url = url
+        self.binary = binary
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+@dataclass
+class Slot:
+    browser: str
+    driver: Driver | None = None
+    session_id: str | None = None
+    capabilities: dict | None = None
+    requested: dict = field(default_factory=dict)
+    client: str | None = None
+    uses: int = 0
+    busy_since: float | None = None
+    last_seen: float | None = None
+
+
+@dataclass
+class Ticket:
+    client: str
+    browser: str
+    requested: dict = field(default_factory=dict)
+    enqueued: float = field(default_factory=time.monotonic)
+    slot: Slot | None = None
+
+
+class FairQueue:
+    # Round robin over clients, FIFO within a client, so one run with many
+    # workers does not starve the others.
+    def __init__(self):
+        self.clients: OrderedDict[str, deque[Ticket]] = OrderedDict()
+
+    def __len__(self):
+        return sum(len(tickets) for tickets in self.clients.values())
+
+    def push(self, ticket: Ticket):
+        self.clients.setdefault(ticket.client, deque()).append(ticket)
+
+    def remove(self, ticket: Ticket):
+        tickets = self.clients.get(ticket.client)
+        if tickets and ticket in tickets:
+            tickets.remove(ticket)
+            if not tickets:
+                del self.clients[ticket.client]
+
+    def pop(self, can_start: Callable[[Ticket], bool]) -> Ticket | None:
+        for client in list(self.clients):
+            tickets = self.clients[client]
+            ticket = next((ticket for ticket in tickets if can_start(ticket)), None)
+            if ticket is None:
+                continue
+            tickets.remove(ticket)
+            del self.clients[client]
+            if tickets:
+                # Served clients go to the back of the line.
+                self.clients[client] = tickets
+            return ticket
+        return None
+
+    def waiting(self) -> dict[str, int]:
+        return {client: len(tickets) for client, tickets in self.clients.items()}
+
+
+class HubState:
+    def __init__(
+        self,
+        capacity: dict[str, int],
+        max_sessions: int,
+        max_reuse: int = 0,
+        max_rss_mb: float = 0,
+    ):
+        self.capacity = capacity
+        self.max_sessions = max_sessions
+        self.max_reuse = max_reuse
+        self.max_rss_mb = max_rss_mb
+        self.queue = FairQueue()
+        self.slots: list[Slot] = []
+        self.sessions: dict[str, Slot] = {}
+        self.started = time.monotonic()
+        self.busy_seconds = 0.0
+        self.queue_waits: list[float] = []
+        self.counters = {
+            "launched": 0,
+            "reused": 0,
+            "closed": 0,
+            "timeouts": 0,
+            "expired": 0,
+        }
+        self._condition = threading.Condition()
+
+    def _idle(
+        self, browser: str | None = None, requested: dict | None = None
+    ) -> list[Slot]:
+        return [
+            slot
+            for slot in self.slots
+            if slot.busy_since is None
+            and slot.session_id
+            and browser in (None, slot.browser)
+            and requested in (None, slot.requested)
+        ]
+
+    def _at_capacity(self, browser: str) -> bool:
+        return len([slot for slot in self.slots if slot.browser == browser]) >= (
+            self.capacity.get(browser, 0)
+        )
+
+    def _can_start(self, ticket: Ticket) -> bool:
+        if self._idle(ticket.browser, ticket.requested):
+            return True
+        # A parked browser with other capabilities can make room.
+        if self._at_capacity(ticket.browser):
+            return bool(self._idle(ticket.browser))
+        return len(self.slots) < self.max_sessions or bool(self._idle())
+
+    def _dispatch(self, evicted: list[Slot]):
+        while True:
+            ticket = self.queue.pop(self._can_start)
+            if ticket is None:
+                return
+
+            idle = self._idle(ticket.browser, ticket.requested)
+            if idle:
+                slot = idle[0]
+                self.counters["reused"] += 1
+            else:
+                # Make room by closing a parked browser that does not fit.
+                if self._at_capacity(ticket.browser):
+                    victim = self._idle(ticket.browser)[0]
+                else:
+                    victim = (
+                        self._idle()[0]
+                        if len(self.slots) >= self.max_sessions
+                        else None
+                    )
+                if victim:
+                    self._forget(victim)
+                    evicted.append(victim)
+                slot = Slot(ticket.browser, requested=ticket.requested)
+                self.slots.append(slot)
+                self.counters["launched"] += 1
+
+            slot.client = ticket.client
+            slot.busy_since = slot.last_seen = time.monotonic()
+            slot.uses += 1
+            ticket.slot = slot
+            self.queue_waits.append(slot.busy_since - ticket.enqueued)
+            self._condition.notify_all()
+
+    def _forget(self, slot: Slot):
+        if slot in self.slots:
+            self.slots.remove(slot)
+        if slot.session_id:
+            self.sessions.pop(slot.session_id, None)
+
+    def acquire(
+        self,
+        client: str,
+        browser: str,
+        timeout: float,
+        requested: dict | None = None,
+    ) -> tuple[Slot, list]:
+        if not self.capacity.get(browser):
+            raise ValueError(f"The hub has no {browser} capacity.")
+
+        ticket = Ticket(client, browser, requested or {})
+        evicted: list[Slot] = []
+        with self._condition:
+            self.queue.push(ticket)
+            self._dispatch(evicted)
+            if not self._condition.wait_for(lambda: ticket.slot, timeout):
+                self.queue.remove(ticket)
+                self.counters["timeouts"] += 1
+                raise TimeoutError(
+                    f"No {browser} session became free in {timeout:.0f}s."
+                )
+        return ticket.slot, evicted
+
+    def register(self, slot: Slot, driver: Driver, session_id: str, capabilities):
+        with self._condition:
+            slot.driver = driver
+            slot.session_id = session_id
+            slot.capabilities = capabilities
+            slot.last_seen = time.monotonic()
+            self.sessions[session_id] = slot
+
+    def session(self, session_id: str) -> Slot | None:
+        with self._condition:
+            slot = self.sessions.get(session_id)
+            if slot:
+                slot.last_seen = time.monotonic()
+            return slot
+
+    def reap(self, idle_timeout: float) -> list[Slot]:
+        # A client that died without DELETE would keep its slot forever.
+        evicted: list[Slot] = []
+        with self._condition:
+            now = time.monotonic()
+            for slot in list(self.slots):
+                if slot.busy_since is None or now - slot.last_seen <= idle_timeout:
+                    continue
+                self.busy_seconds += now - slot.busy_since
+                self.counters["expired"] += 1
+                self._forget(slot)
+                evicted.append(slot)
+
+            if evicted:
+                self._dispatch(evicted)
+        return evicted
+
+    def reusable(self, slot: Slot, rss_mb: float | None = None) -> bool:
+        if not self.max_reuse or slot.uses >= self.max_reuse:
+            return False
+        return not (self.max_rss_mb and rss_mb and rss_mb > self.max_rss_mb)
+
+    def release(self, slot: Slot, keep: bool) -> list[Slot]:
+        evicted: list[Slot] = []
+        with self._condition:
+            if slot.busy_since is not None:
+                self.busy_seconds += time.monotonic() - slot.busy_since
+            slot.busy_since = None
+            slot.client = None
+
+            if not keep:
+                self.counters["closed"] += 1
+                self._forget(slot)
+                evicted.append(slot)
+
+            self._dispatch(evicted)
+        return evicted
+
+    def metrics(self) -> dict:
+        with self._condition:
+            now = time.monotonic()
+            busy = self.busy_seconds + sum(
+                now - slot.busy_since for slot in self.slots if slot.busy_since
+            )
+            uptime = now - self.started
+            waits = sorted(self.queue_waits)
+
+            return {
+                "uptime": round(uptime, 1),
+                "capacity": self.capacity,
+                "max_sessions": self.max_sessions,
+                "busy": {
+                    browser: sum(
+                        1
+                        for slot in self.slots
+                        if slot.browser == browser and slot.busy_since
+                    )
+                    for browser in self.capacity
+                },
+                "idle": len(self._idle()),
+                "queued": self.queue.waiting(),
+                "clients": sorted({slot.client for slot in self.slots if slot.client}),
+                "utilisation": (
+                    round(busy / (self.max_sessions * uptime), 3) if uptime else 0.0
+                ),
+                "queue_wait_p50": round(percentile(waits, 50), 3),
+                "queue_wait_p95": round(percentile(waits, 95), 3),
+                **self.counters,
+            }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def launch_driver(browser: str, pool: urllib3.PoolManager) -> Driver:
+    browser_path, driver_path = resolve_binaries(browser)
+    if not driver_path:
+        raise RuntimeError(f"No driver for {browser}, set it in .env.")
+
+    port = free_port()
+    process = subprocess.Popen(
+        [driver_path, f"--port={port}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    driver = Driver(browser, process, f"http://127.0.0.1:{port}", browser_path)
+
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            if pool.request("GET", driver.url + "/status", timeout=1).status == 200:
+                return driver
+        except urllib3.exceptions.HTTPError:
+            pass
+        if process.poll() is not None:
+            break
+        time.sleep(0.05)
+
+    driver.stop()
+    raise RuntimeError(f"{browser} driver did not start on port {port}.")
+
+
+def requested_browser(capabilities: dict) -> tuple[str, str]:
+    always = capabilities.get("alwaysMatch", {})
+    first = (capabilities.get("firstMatch") or [{}])[0]
+    browser = always.get("browserName") or first.get("browserName") or ""
+    client = always.get(HUB_CLIENT_CAPABILITY) or first.get(HUB_CLIENT_CAPABILITY)
+    return BROWSER_ALIASES.get(browser.lower(), browser.lower()), client or "anonymous"
+
+
+def without_client(capabilities: dict) -> dict:
+    return {
+        "alwaysMatch": {
+            key: value
+            for key, value in capabilities.get("alwaysMatch", {}).items()
+            if key != HUB_CLIENT_CAPABILITY
+        },
+        "firstMatch": [
+            {key: value for key, value in match.items() if key != HUB_CLIENT_CAPABILITY}
+            for match in capabilities.get("firstMatch") or [{}]
+        ],
+    }
+
+
+def with_binary(capabilities: dict, browser: str, binary: str | None) -> dict:
+    # Remote clients do not know the browser paths from the hub's .env.
+    key = OPTIONS_CAPABILITIES.get(browser)
+    if not binary or not key:
+        return capabilities
+
+    first_match = capabilities.get("firstMatch") or [{}]
+    if any(key in match for match in first_match):
+        first_match = [
+            {**match, key: {"binary": binary, **match.get(key, {})}}
+            for match in first_match
+        ]
+        return {**capabilities, "firstMatch": first_match}
+
+    always = capabilities.get("alwaysMatch", {})
+    return {
+        **capabilities,
+        "alwaysMatch": {**always, key: {"binary": binary, **always.get(key, {})}},
+    }
+
+
+class BrowserHub:
+    def __init__(
+        self,
+        state: HubState,
+        launcher: Callable[[str], Driver] | None = None,
+        queue_timeout: float = 300,
+        rss_sampler: Callable[[Driver], float | None] | None = None,
+        session_timeout: float = 600,
+    ):
+        self.state = state
+        self.pool = urllib3.PoolManager(maxsize=32, retries=False)
+        self.launcher = launcher or (lambda browser: launch_driver(browser, self.pool))
+        self.queue_timeout = queue_timeout
+        self.rss_sampler = rss_sampler
+        self.session_timeout = session_timeout
+
+    def forward(self, driver: Driver, method: str, path: str, body: bytes | None):
+        response = self.pool.request(
+            method,
+            driver.url + path,
+            body=body,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+            timeout=urllib3.Timeout(connect=10, read=300),
+        )
+        return response.status, response.data
+
+    def new_session(self, body: bytes) -> tuple[int, dict]:
+        payload = json.loads(body or b"{}")
+        capabilities = payload.get("capabilities", {})
+        browser, client = requested_browser(capabilities)
+        requested = without_client(capabilities)
+
+        try:
+            slot, evicted = self.state.acquire(
+                client, browser, self.queue_timeout, requested
+            )
+        except (TimeoutError, ValueError) as error:
+            return 500, error_body("session not created", str(error))
+        self.stop(evicted)
+
+        if slot.session_id:
+            logger.info("Reuse %s session %s for %s.", browser, slot.session_id, client)
+            return 200, {
+                "value": {
+                    "sessionId": slot.session_id,
+                    "capabilities": slot.capabilities,
+                }
+            }
+
+        driver = None
+        try:
+            driver = self.launcher(browser)
+            status, data = self.forward(
+                driver,
+                "POST",
+                "/session",
+                json.dumps(
+                    {"capabilities": with_binary(requested, browser, driver.binary)}
+                ).encode(),
+            )
+            value = json.loads(data)["value"]
+            if status != 200:
+                driver.stop()
+                self.stop(self.state.release(slot, keep=False))
+                return status, {"value": value}
+        except Exception as error:
+            if driver:
+                driver.stop()
+            self.stop(self.state.release(slot, keep=False))
+            return 500, error_body("session not created", str(error))
+
+        self.state.register(slot, driver, value["sessionId"], value["capabilities"])
+        logger.info(
+            "Started %s session %s for %s.", browser, value["sessionId"], client
+        )
+        return 200, {"value": value}
+
+    def end_session(self, slot: Slot) -> tuple[int, dict]:
+        rss_mb = self.rss_sampler(slot.driver) if self.rss_sampler else None
+        keep = self.state.reusable(slot, rss_mb)
+
+        if keep:
+            try:
+                self.reset(slot)
+            except Exception as error:
+                logger.warning("Could not reset session %s: %r", slot.session_id, error)
+                keep = False
+
+        self.stop(self.state.release(slot, keep))
+        return 200, {"value": None}
+
+    def reset(self, slot: Slot):
+        prefix = f"/session/{slot.session_id}"
+        status, data = self.forward(
+            slot.driver, "GET", prefix + "/window/handles", None
+        )
+        handles = json.loads(data)["value"]
+        for handle in handles[1:]:
+            self.forward(
+                slot.driver,
+                "POST",
+                prefix + "/window",
+                json.dumps({"handle": handle}).encode(),
+            )
+            self.forward(slot.driver, "DELETE", prefix + "/window", None)
+        self.forward(
+            slot.driver,
+            "POST",
+            prefix + "/window",
+            json.dumps({"handle": handles[0]}).encode(),
+        )
+        self.forward(slot.driver, "DELETE", prefix + "/cookie", None)
+        self.forward(
+            slot.driver,
+            "POST",
+            prefix + "/url",
+            json.dumps({"url": "about:blank"}).encode(),
+        )
+
+    def stop(self, slots: list[Slot]):
+        for slot in slots:
+            if slot.driver is None:
+                continue
+            try:
+                self.forward(slot.driver, "DELETE", f"/session/{slot.session_id}", None)
+            except urllib3.exceptions.HTTPError:
+                pass
+            slot.driver.stop()
+
+    def reap(self) -> int:
+        expired = self.state.reap(self.session_timeout)
+        for slot in expired:
+            logger.warning(
+                "Close session %s of %s, idle for over %.0f s.",
+                slot.session_id,
+                slot.client,
+                self.session_timeout,
+            )
+        self.stop(expired)
+        return len(expired)
+
+    def reap_forever(self, interval: float = 10):
+        while True:
+            time.sleep(interval)
+            try:
+                self.reap()
+            except Exception as error:
+                logger.warning("Could not reap idle sessions: %r", error)
+
+    def shutdown(self):
+        self.stop(list(self.state.slots))
+
+
+def error_body(error: str, message: str) -> dict:
+    return {"value": {"error": error, "message": message, "stacktrace": ""}}
+
+
+def make_handler(hub: BrowserHub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logger.debug("hub: " + format, *args)
+
+        def _respond(self, status: int, payload: dict | bytes):
+            data = (
+                payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+            )
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _handle(self, method: str):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+            path = self.path.removeprefix("/wd/hub")
+
+            if method == "GET" and path == "/status":
+                return self._respond(
+                    200,
+                    {
+                        "value": {
+                            "ready": True,
+                            "message": "its-ui-test browser hub",
+                            "metrics": hub.state.metrics(),
+                        }
+                    },
+                )
+            if method == "GET" and path == "/metrics":
+                return self._respond(200, hub.state.metrics())
+            if method == "POST" and path == "/session":
+                return self._respond(*hub.new_session(body))
+
+            match = SESSION_PATH.match(path)
+            slot = hub.state.session(match["id"]) if match else None
+            if slot is None:
+                return self._respond(
+                    404, error_body("invalid session id", f"Unknown session {path}")
+                )
+            if method == "DELETE" and not match["rest"]:
+                return self._respond(*hub.end_session(slot))
+
+            try:
+                self._respond(*hub.forward(slot.driver, method, path, body))
+            except urllib3.exceptions.HTTPError as error:
+                self._respond(500, error_body("unknown error", str(error)))
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_DELETE(self):
+            self._handle("DELETE")
+
+    return Handler
+
+
+def parse_capacity(value: str) -> dict[str, int]:
+    capacity = {}
+    for item in value.split(","):
+        browser, _, count = item.partition("=")
+        browser = BROWSER_ALIASES.get(browser.strip(), browser.strip())
+        if browser not in BROWSER_NAMES or not count.strip().isdigit():
+            raise ValueError(f"Expected browser=count, got {item!r}.")
+        capacity[browser] = int(count)
+    return capacity
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Share a capped pool of local browsers between pytest runs."
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--capacity",
+        default="firefox=2,chrome=2",
+        help="Sessions per browser, e.g. firefox=3,chrome=1",
+    )
+    parser.add_argument(
+        "--max_sessions",
+        type=int,
+        default=max((os.cpu_count() or 2) // 2, 1),
+        help="Browsers alive at the same time, over all browser kinds",
+    )
+    parser.add_argument(
+        "--max_reuse",
+        type=int,
+        default=0,
+        help="Hand a browser to this many sessions before restarting it",
+    )
+    parser.add_argument(
+        "--max_rss_mb", type=float, default=0, help="Never reuse a browser above this"
+    )
+    parser.add_argument("--queue_timeout", type=float, default=300)
+    parser.add_argument(
+        "--session_timeout",
+        type=float,
+        default=600,
+        help="Close a session that sent no command for this many seconds",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        capacity = parse_capacity(args.capacity)
+    except ValueError as error:
+        parser.error(str(error))
+
+    logger.basicConfig(
+        level=logger.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    rss_sampler = None
+    if args.max_rss_mb:
+        from src.soak import MB, sample_tree
+
+        def rss_sampler(driver: Driver) -> float | None:
+            return sample_tree(driver.process.pid).rss / MB if driver.process else None
+
+    hub = BrowserHub(
+        HubState(capacity, args.max_sessions, args.max_reuse, args.max_rss_mb),
+        queue_timeout=args.queue_timeout,
+        rss_sampler=rss_sampler,
+        session_timeout=args.session_timeout,
+    )
+    threading.Thread(target=hub.reap_forever, daemon=True).start()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(hub))
+    server.daemon_threads = True
+
+    print(f"Browser hub on http://127.0.0.1:{args.port}, metrics at /metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        hub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
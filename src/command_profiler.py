@@ -0,0 +1,173 @@
+import functools
+import inspect
+import itertools
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from src import events
+
+ELEMENT_COMMANDS = {
+    "findElement",
+    "findElements",
+    "findChildElement",
+    "findChildElements",
+    "clickElement",
+    "clearElement",
+    "sendKeysToElement",
+    "getElementText",
+    "getElementAttribute",
+    "getElementProperty",
+    "getElementTagName",
+    "isElementDisplayed",
+    "isElementEnabled",
+    "isElementSelected",
+}
+
+
+# The page method running now and the number of its call.
+current_call: ContextVar[tuple[str, int] | None] = ContextVar(
+    "current_call", default=None
+)
+_calls = itertools.count(1)
+
+
+def _profiled(method, base_module: str):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # BasePage helpers count toward the page method that called them.
+        if method.__module__ == base_module and current_call.get():
+            return method(self, *args, **kwargs)
+
+        token = current_call.set(
+            (f"{type(self).__name__}.{method.__name__}", next(_calls))
+        )
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            current_call.reset(token)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def instrument_pages():
+    from src.pages.base_page import BasePage
+
+    classes = [BasePage]
+    for page_class in classes:
+        classes.extend(page_class.__subclasses__())
+        for name, value in list(vars(page_class).items()):
+            if (
+                inspect.isfunction(value)
+                and not name.startswith("__")
+                and not getattr(value, "__profiled__", False)
+            ):
+                setattr(page_class, name, _profiled(value, BasePage.__module__))
+
+
+@dataclass
+class CommandRecord:
+    test: str | None
+    page_method: str | None
+    call: int | None
+    command: str
+    duration: float
+
+
+@dataclass
+class PageMethodStats:
+    name: str
+    calls: int = 0
+    commands: int = 0
+    element_commands: int = 0
+    duration: float = 0.0
+
+    @property
+    def batchable(self) -> int:
+        return max(self.element_commands - self.calls, 0)
+
+    @property
+    def saving(self) -> float:
+        return self.batchable * self.duration / self.commands if self.commands else 0.0
+
+
+class CommandProfiler:
+    def __init__(self):
+        self.records: list[CommandRecord] = []
+
+    def attach(self, browser):
+        # Page classes defined after the last attach are wrapped too.
+        instrument_pages()
+        execute = browser.execute
+
+        def profiled_execute(driver_command: str, params: dict | None = None):
+            page_method, call = current_call.get() or (None, None)
+            started = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.records.append(
+                    CommandRecord(
+                        test=events.current_test.get(),
+                        page_method=page_method,
+                        call=call,
+                        command=driver_command,
+                        duration=time.perf_counter() - started,
+                    )
+                )
+
+        browser.execute = profiled_execute
+        return browser
+
+    def per_test(self) -> dict[str, tuple[int, float]]:
+        tests: dict[str, list] = defaultdict(lambda: [0, 0.0])
+        for record in self.records:
+            tests[record.test or "<session>"][0] += 1
+            tests[record.test or "<session>"][1] += record.duration
+        return {test: (count, duration) for test, (count, duration) in tests.items()}
+
+    def per_page_method(self) -> list[PageMethodStats]:
+        stats: dict[str, PageMethodStats] = {}
+        seen_calls = set()
+
+        for record in self.records:
+            name = record.page_method or "<outside page objects>"
+            method = stats.setdefault(name, PageMethodStats(name))
+
+            if (name, record.call) not in seen_calls:
+                seen_calls.add((name, record.call))
+                method.calls += 1
+
+            method.commands += 1
+            method.duration += record.duration
+            if record.command in ELEMENT_COMMANDS:
+                method.element_commands += 1
+
+        return sorted(stats.values(), key=lambda method: method.saving, reverse=True)
+
+    def report(self, limit: int = 15, tests: int = 5) -> list[str]:
+        lines = [
+            f"{len(self.records)} WebDriver commands, "
+            f"{sum(record.duration for record in self.records):.1f}s in total",
+            f"{'page method':<52}{'calls':>7}{'cmds':>7}{'element':>9}"
+            f"{'batchable':>11}{'saving s':>10}",
+        ]
+
+        for method in self.per_page_method()[:limit]:
+            lines.append(
+                f"{method.name:<52}{method.calls:>7}{method.commands:>7}"
+                f"{method.element_commands:>9}{method.batchable:>11}"
+                f"{method.saving:>10.2f}"
+            )
+
+        busiest = sorted(
+            self.per_test().items(), key=lambda item: item[1][0], reverse=True
+        )
+        if busiest:
+            lines.append(f"{'test':<75}{'cmds':>7}{'time s':>9}")
+        for test, (count, duration) in busiest[:tests]:
+            lines.append(f"{test:<75}{count:>7}{duration:>9.2f}")
+
+        return lines
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import uuid
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+ContactField = Literal[
+    "first_name",
+    "last_name",
+    "date_of_birth",
+    "email",
+    "phone",
+    "street_address_1",
+    "street_address_2",
+    "city",
+    "state",
+    "postal_code",
+    "country",
+]
+
+CONTACT_FIELDS: tuple[str, ...] = ContactField.__args__
+
+RUN_TAG_PREFIX = "its-ui-test run "
+RUN_ID = os.getenv("ITS_RUN_ID") or uuid.uuid4().hex[:8]
+
+API_FIELDS = dict(
+    zip(
+        CONTACT_FIELDS,
+        (
+            "firstName",
+            "lastName",
+            "birthdate",
+            "email",
+            "phone",
+            "street1",
+            "street2",
+            "city",
+            "stateProvince",
+            "postalCode",
+            "country",
+        ),
+    )
+)
+
+
+class ContactRecord:
+    __slots__ = ("id",) + CONTACT_FIELDS
+
+    def __init__(
+        self,
+        first_name: str = "",
+        last_name: str = "",
+        date_of_birth: str = "",
+        email: str = "",
+        phone: str = "",
+        street_address_1: str = "",
+        street_address_2: str = "",
+        city: str = "",
+        state: str = "",
+        postal_code: str = "",
+        country: str = "",
+        id: str | None = None,
+    ):
+        self.id = id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.date_of_birth = date_of_birth
+        self.email = email
+        self.phone = phone
+        self.street_address_1 = street_address_1
+        self.street_address_2 = street_address_2
+        self.city = city
+        self.state = state
+        self.postal_code = postal_code
+        self.country = country
+
+    @classmethod
+    def from_api(cls, data: dict) -> ContactRecord:
+        return cls(
+            id=data.get("_id"),
+            **{
+                field: data.get(api_field) or ""
+                for field, api_field in API_FIELDS.items()
+            },
+        )
+
+    def to_api(self) -> dict:
+        return {
+            api_field: str(getattr(self, field))
+            for field, api_field in API_FIELDS.items()
+        }
+
+    @property
+    def full_name(self) -> str:
+        return " ".join([self.first_name, self.last_name])
+
+    def astuple(self) -> tuple:
+        return tuple(getattr(self, field) for field in CONTACT_FIELDS)
+
+    def items(self):
+        return zip(CONTACT_FIELDS, self.astuple())
+
+    def replace(self, **changes) -> ContactRecord:
+        return ContactRecord(**{**dict(self.items()), "id": self.id, **changes})
+
+    def diff(self, other: ContactRecord) -> dict[str, tuple[str, str]]:
+        return {
+            field: (mine, theirs)
+            for field, mine, theirs in zip(
+                CONTACT_FIELDS, self.astuple(), other.astuple()
+            )
+            if mine != theirs
+        }
+
+    @property
+    def run_id(self) -> str | None:
+        if self.street_address_2.startswith(RUN_TAG_PREFIX):
+            return self.street_address_2.removeprefix(RUN_TAG_PREFIX)
+        return None
+
+    def __eq__(self, other):
+        if not isinstance(other, ContactRecord):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={value!r}" for field, value in self.items())
+        return f"ContactRecord({fields})"
+
+
+def run_tag(run_id: str = RUN_ID) -> str:
+    return RUN_TAG_PREFIX + run_id
+
+
+def fake_contact_info(fake: Faker | None = None) -> ContactRecord:
+    if fake is None:
+        from faker import Faker
+
+        fake = Faker()
+
+    return ContactRecord(
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        date_of_birth=fake.date_of_birth(minimum_age=6, maximum_age=110).strftime(
+            "%Y-%m-%d"
+        ),
+        email=fake.email(),
+        phone=fake.basic_phone_number(),
+        street_address_1=fake.street_name(),
+        street_address_2=run_tag(),
+        city=fake.city(),
+        state=fake.state(),
+        postal_code=fake.postalcode(),
+        country=fake.country()[:40],
+    )
@@ -0,0 +1,145 @@
+import argparse
+import logging as logger
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import urllib3
+
+from src.api_client import ApiError, ContactListApi
+from src.contact_data import RUN_ID, ContactRecord
+from src.host_config import HOSTS, get_environment
+
+DEFAULT_TTL = timedelta(hours=24)
+
+
+@dataclass
+class GcReport:
+    scanned: int = 0
+    orphans: int = 0
+    deleted: int = 0
+    failed: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        line = (
+            f"Scanned {self.scanned} contacts, {self.orphans} orphaned, "
+            f"reclaimed {self.deleted} in {self.elapsed:.1f}s"
+        )
+        if self.failed:
+            line += f", {len(self.failed)} failed"
+        return line
+
+
+def created_at(contact_id: str) -> datetime:
+    # MongoDB object ids start with their creation time in seconds.
+    return datetime.fromtimestamp(int(contact_id[:8], 16), tz=timezone.utc)
+
+
+def is_same_run(run_id: str, current_run: str | None) -> bool:
+    # Runner jobs tag contacts with "<run id>-<section>-<number>".
+    return current_run is not None and (
+        run_id == current_run or run_id.startswith(f"{current_run}-")
+    )
+
+
+def find_orphans(
+    contacts: list[ContactRecord],
+    ttl: timedelta = DEFAULT_TTL,
+    now: datetime | None = None,
+    current_run: str | None = RUN_ID,
+) -> list[ContactRecord]:
+    deadline = (now or datetime.now(timezone.utc)) - ttl
+
+    return [
+        contact
+        for contact in contacts
+        if contact.run_id
+        and not is_same_run(contact.run_id, current_run)
+        and contact.id
+        and created_at(contact.id) <= deadline
+    ]
+
+
+def collect(
+    api: ContactListApi,
+    ttl: timedelta = DEFAULT_TTL,
+    workers: int = 8,
+    dry_run: bool = False,
+) -> GcReport:
+    started = time.perf_counter()
+    report = GcReport()
+
+    contacts = api.get_contacts()
+    orphans = find_orphans(contacts, ttl)
+    report.scanned = len(contacts)
+    report.orphans = len(orphans)
+
+    def delete(contact: ContactRecord) -> str | None:
+        try:
+            api.delete_contact(contact.id)
+        except ApiError as error:
+            if error.status == 404:
+                # Another worker or run already removed it.
+                return None
+            logger.warning("Could not delete contact %s: %s", contact.id, error)
+            return contact.id
+        return None
+
+    if orphans and not dry_run:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            report.failed = [
+                failed for failed in executor.map(delete, orphans) if failed
+            ]
+        report.deleted = len(orphans) - len(report.failed)
+
+    report.elapsed = time.perf_counter() - started
+    logger.info(report.summary())
+    return report
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Delete contacts left behind by earlier test runs."
+    )
+    parser.add_argument("--env", default=None, help=f"One of {list(HOSTS)}")
+    parser.add_argument(
+        "--ttl-hours",
+        type=float,
+        default=DEFAULT_TTL.total_seconds() / 3600,
+        help="Only delete contacts older than this",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        environment = get_environment(args.env)
+    except (KeyError, ValueError) as error:
+        parser.error(str(error))
+
+    if not (environment.email and environment.password):
+        parser.error(f"Credentials for environment {environment.name!r} are not set.")
+
+    api = ContactListApi(
+        environment.base_url,
+        pool=urllib3.PoolManager(maxsize=max(args.workers, 1), retries=False),
+        timeout=30,
+    )
+    api.login(environment.email, environment.password)
+
+    report = collect(
+        api,
+        ttl=timedelta(hours=args.ttl_hours),
+        workers=args.workers,
+        dry_run=args.dry_run,
+    )
+    print(report.summary() + (" (dry run)" if args.dry_run else ""))
+
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
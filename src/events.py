@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+current_test: ContextVar[str | None] = ContextVar("current_test", default=None)
+
+WEBDRIVER_LOGGER = "selenium.webdriver.remote.remote_connection"
+
+
+class WebDriverCommandFilter(logging.Filter):
+    # Selenium logs command parameters and whole response bodies at DEBUG,
+    # which include typed passwords and screenshots. Keep only the method,
+    # path, status and duration.
+    def __init__(self):
+        super().__init__()
+        self._started = threading.local()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.msg == "%s %s %s" and len(record.args) == 3:
+            method, url, _ = record.args
+            self._started.value = time.perf_counter()
+            record.msg, record.args = "%s %s", (method, urlsplit(url).path)
+            return True
+
+        if record.msg.startswith("Remote response:") and record.args:
+            started = getattr(self._started, "value", None)
+            duration = (time.perf_counter() - started) * 1000 if started else 0.0
+            record.msg, record.args = "status %s in %.1f ms", (
+                record.args[0],
+                duration,
+            )
+            return True
+
+        return False
+
+
+class EventHandler(logging.Handler):
+    def __init__(
+        self,
+        path: str,
+        capacity: int = 100_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+    ):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer: deque = deque(maxlen=capacity)
+        self.dropped = 0
+        self.written = 0
+        self.levels: Counter = Counter()
+        self.tests: Counter = Counter()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w")
+        self._wake = threading.Event()
+        self._stopped = False
+        self._writer = threading.Thread(
+            target=self._run, name="event-writer", daemon=True
+        )
+        self._writer.start()
+
+    def emit(self, record: logging.LogRecord):
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+
+        self.buffer.append((record, current_test.get()))
+
+        if len(self.buffer) >= self.batch_size:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        lines = []
+
+        while self.buffer:
+            try:
+                record, test = self.buffer.popleft()
+            except IndexError:
+                break
+
+            self.levels[record.levelname] += 1
+            if test:
+                self.tests[test] += 1
+
+            lines.append(
+                json.dumps(
+                    {
+                        "ts": record.created,
+                        "level": record.levelname,
+                        "logger": record.name,
+                        "test": test,
+                        "thread": record.threadName,
+                        "message": record.getMessage(),
+                    },
+                    default=str,
+                )
+            )
+
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            self.written += len(lines)
+
+    def close(self):
+        if not self._stopped:
+            self._stopped = True
+            self._wake.set()
+            self._writer.join()
+            self._file.close()
+        super().close()
+
+    def summary(self) -> list[str]:
+        levels = ", ".join(f"{level} {count}" for level, count in self.levels.items())
+        lines = [f"{self.written} events written to {self.path} ({levels or 'none'})"]
+
+        if self.dropped:
+            lines.append(f"{self.dropped} events dropped, the ring buffer was full")
+
+        for test, count in self.tests.most_common(3):
+            lines.append(f"{count:>8} events  {test}")
+
+        return lines
+
+
+def install(path: str, webdriver_commands: bool = False, **options) -> EventHandler:
+    handler = EventHandler(path, **options)
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    if root.level > logging.INFO:
+        root.setLevel(logging.INFO)
+
+    if webdriver_commands:
+        webdriver_logger = logging.getLogger(WEBDRIVER_LOGGER)
+        webdriver_logger.setLevel(logging.DEBUG)
+        webdriver_logger.propagate = False
+        webdriver_logger.addFilter(WebDriverCommandFilter())
+        webdriver_logger.addHandler(handler)
+
+    return handler
+
+
+def uninstall(handler: EventHandler):
+    logging.getLogger().removeHandler(handler)
+
+    webdriver_logger = logging.getLogger(WEBDRIVER_LOGGER)
+    if handler in webdriver_logger.handlers:
+        webdriver_logger.removeHandler(handler)
+        webdriver_logger.filters = [
+            log_filter
+            for log_filter in webdriver_logger.filters
+            if not isinstance(log_filter, WebDriverCommandFilter)
+        ]
+        webdriver_logger.setLevel(logging.NOTSET)
+        webdriver_logger.propagate = True
+    handler.close()
@@ -0,0 +1,604 @@
+import argparse
+import json
+import logging as logger
+import random
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from functools import cache
+from typing import Callable
+
+import urllib3
+
+from src.api_client import ContactListApi
+from src.contact_data import API_FIELDS, ContactRecord, fake_contact_info
+from src.host_config import HOSTS, get_credentials, get_env_name
+
+FORMS = ("contact", "register")
+
+UNICODE_SAMPLES = (
+    "Zoë",
+    "Łukasz",
+    "张伟",
+    "محمد",
+    "é",
+    "😀",
+    "👩‍👩‍👧",
+    "​",
+    "‮txt",
+    "\x00",
+    "\t",
+    "\n",
+)
+INJECTION_SAMPLES = (
+    "<script>alert(1)</script>",
+    "Robert'); DROP TABLE contacts;--",
+    '{"$gt": ""}',
+    "${7*7}",
+    "%s%n",
+)
+DATE_SAMPLES = (
+    "1990-01-01",
+    "1990-1-1",
+    "01/02/1990",
+    "1990/01/02",
+    "19900101",
+    "1990-02-30",
+    "1990-13-01",
+    "0000-01-01",
+    "9999-12-31",
+    "2999-01-01",
+    "1990-01-01T00:00:00Z",
+    "yesterday",
+)
+EMAIL_SAMPLES = (
+    "a@b.co",
+    "A@EXAMPLE.COM",
+    "a@b",
+    "@b.com",
+    "a@@b.com",
+    "a b@c.com",
+    "a@b..com",
+    "a.@b.com",
+    "ü@exämple.com",
+    "a+tag@b.com",
+    "x" * 64 + "@b.com",
+    "x" * 65 + "@b.com",
+)
+PHONE_SAMPLES = (
+    "8005551234",
+    "+1 (800) 555-1234",
+    "800-555-1234",
+    "123",
+    "abc",
+    "+",
+    "١٢٣٤٥٦٧٨٩٠",
+)
+POSTAL_SAMPLES = ("12345", "12345-6789", "SW1A 1AA", "K1A 0B1", "ABC", "-1")
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    kind: str = "text"
+    max_length: int | None = None
+    min_length: int = 0
+    required: bool = False
+
+
+CONTACT_SPECS = {
+    "first_name": FieldSpec("name", 20, required=True),
+    "last_name": FieldSpec("name", 20, required=True),
+    "date_of_birth": FieldSpec("date"),
+    "email": FieldSpec("email"),
+    "phone": FieldSpec("phone", 15),
+    "street_address_1": FieldSpec("text", 40),
+    "street_address_2": FieldSpec("text", 40),
+    "city": FieldSpec("text", 40),
+    "state": FieldSpec("text", 20),
+    "postal_code": FieldSpec("postal", 10),
+    "country": FieldSpec("text", 40),
+}
+REGISTER_SPECS = {
+    "first_name": FieldSpec("name", 20, required=True),
+    "last_name": FieldSpec("name", 20, required=True),
+    "email": FieldSpec("email", required=True),
+    "password": FieldSpec("password", 100, min_length=7, required=True),
+}
+REGISTER_API_FIELDS = {
+    "first_name": "firstName",
+    "last_name": "lastName",
+    "email": "email",
+    "password": "password",
+}
+
+
+def _is_date(value: str) -> bool:
+    if not re.fullmatch(r"[0-9]{4}-[0-9]{2}-[0-9]{2}", value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+# What the API accepts for each kind of field, the lengths are checked apart.
+KIND_RULES: dict[str, Callable[[str], bool]] = {
+    "date": _is_date,
+    "email": lambda value: bool(re.fullmatch(r"[^@\s]+@[^@\s.]+(\.[^@\s.]+)+", value)),
+    # Digits with the usual separators, like "(773)985-5394" or "+1 800 5551234".
+    "phone": lambda value: bool(re.fullmatch(r"\+?[0-9 ()-]*[0-9][0-9 ()-]*", value)),
+    "postal": lambda value: bool(re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9 -]*", value)),
+}
+
+
+def js_length(value: str) -> int:
+    # The API validates lengths in UTF-16 code units, like JavaScript.
+    return len(value.encode("utf-16-le")) // 2
+
+
+def edge_values(spec: FieldSpec, rng: random.Random) -> list[str]:
+    values = ["", " ", "a", "  padded  ", *UNICODE_SAMPLES, *INJECTION_SAMPLES]
+
+    for length in {spec.min_length - 1, spec.min_length, spec.max_length}:
+        if length and length > 0:
+            values.append("a" * length)
+    if spec.max_length:
+        values += [
+            "a" * (spec.max_length + 1),
+            "😀" * (spec.max_length // 2 + 1),
+            "é" * spec.max_length,
+        ]
+    values.append("a" * rng.choice((255, 256, 1000, 10_000)))
+    values.append(
+        "".join(chr(rng.randint(0x20, 0x2FFF)) for _ in range(rng.randint(1, 30)))
+    )
+
+    values += {
+        "date": DATE_SAMPLES,
+        "email": EMAIL_SAMPLES,
+        "phone": PHONE_SAMPLES + ("1" * 15, "1" * 16),
+        "postal": POSTAL_SAMPLES,
+    }.get(spec.kind, ())
+    return values
+
+
+def expected_rejection(specs: dict[str, FieldSpec], case: dict[str, str]) -> str | None:
+    for name, value in case.items():
+        spec = specs[name]
+        if spec.required and not value:
+            return f"{name} is required"
+        if value and spec.max_length and js_length(value) > spec.max_length:
+            return f"{name} is longer than {spec.max_length}"
+        if value and js_length(value) < spec.min_length:
+            return f"{name} is shorter than {spec.min_length}"
+        if value and spec.kind in KIND_RULES and not KIND_RULES[spec.kind](value):
+            return f"{name} is not a valid {spec.kind}"
+    return None
+
+
+@dataclass
+class Outcome:
+    status: int
+    stored: dict[str, str] | None = None
+    message: str = ""
+
+    @property
+    def accepted(self) -> bool:
+        return 200 <= self.status < 300
+
+
+def classify(
+    specs: dict[str, FieldSpec], case: dict[str, str], outcome: Outcome
+) -> str | None:
+    if outcome.status == 0 or outcome.status >= 500:
+        return "server_error"
+
+    rejection = expected_rejection(specs, case)
+    if outcome.accepted and rejection:
+        return f"accepted_invalid: {rejection}"
+    if 400 <= outcome.status < 500 and not rejection:
+        return "rejected_valid"
+
+    if outcome.accepted and outcome.stored is not None:
+        for name, value in case.items():
+            if outcome.stored.get(name, value) != value:
+                return f"not_stored_as_sent: {name}"
+
+    return None
+
+
+class FormTarget:
+    def __init__(
+        self,
+        name: str,
+        specs: dict[str, FieldSpec],
+        submit: Callable[[ContactListApi, dict[str, str]], Outcome],
+        base: Callable[[random.Random], dict[str, str]],
+    ):
+        self.name = name
+        self.specs = specs
+        self.submit = submit
+        self.base = base
+
+    def generate(self, rng: random.Random) -> tuple[dict[str, str], dict[str, str]]:
+        base = self.base(rng)
+        case = dict(base)
+        for name in rng.sample(list(self.specs), rng.randint(1, 3)):
+            case[name] = rng.choice(edge_values(self.specs[name], rng))
+        return base, case
+
+
+def _send(api: ContactListApi, method: str, path: str, body: dict | None = None):
+    try:
+        return api.transport(method, path, body)
+    except urllib3.exceptions.HTTPError as error:
+        return 0, str(error)
+
+
+def submit_contact(api: ContactListApi, case: dict[str, str]) -> Outcome:
+    status, data = _send(
+        api,
+        "POST",
+        "/contacts",
+        {API_FIELDS[name]: value for name, value in case.items()},
+    )
+    if not 200 <= status < 300:
+        return Outcome(status, message=str(data)[:200])
+
+    stored = ContactRecord.from_api(data)
+    _send(api, "DELETE", f"/contacts/{stored.id}")
+    return Outcome(status, dict(stored.items()))
+
+
+def submit_registration(api: ContactListApi, case: dict[str, str]) -> Outcome:
+    status, data = _send(
+        api,
+        "POST",
+        "/users",
+        {REGISTER_API_FIELDS[name]: value for name, value in case.items()},
+    )
+    if not 200 <= status < 300:
+        return Outcome(status, message=str(data)[:200])
+
+    api.token = data["token"]
+    _send(api, "DELETE", "/users/me")
+    api.token = None
+    return Outcome(
+        status,
+        {
+            name: data["user"].get(api_field, case[name])
+            for name, api_field in REGISTER_API_FIELDS.items()
+            if name != "password"
+        },
+    )
+
+
+@cache
+def _faker():
+    from faker import Faker
+
+    return Faker()
+
+
+def contact_base(rng: random.Random) -> dict[str, str]:
+    fake = _faker()
+    fake.seed_instance(rng.getrandbits(32))
+    return dict(fake_contact_info(fake).items())
+
+
+def registration_base(rng: random.Random) -> dict[str, str]:
+    return {
+        "first_name": "Fuzz",
+        "last_name": "Case",
+        "email": f"its-ui-fuzz-{rng.getrandbits(48):012x}@example.com",
+        "password": "Passw0rd!",
+    }
+
+
+TARGETS = {
+    "contact": FormTarget("contact", CONTACT_SPECS, submit_contact, contact_base),
+    "register": FormTarget(
+        "register", REGISTER_SPECS, submit_registration, registration_base
+    ),
+}
+
+
+def _simpler(value: str):
+    yield ""
+    yield "a" * len(value)
+    for size in (len(value) // 2, len(value) // 4, 1):
+        if size < 1:
+            continue
+        for start in range(0, len(value), size):
+            yield value[:start] + value[start + size :]
+    for index, char in enumerate(value):
+        if char != "a":
+            yield value[:index] + "a" + value[index + 1 :]
+
+
+def shrink(
+    case: dict[str, str],
+    base: dict[str, str],
+    signature: str,
+    check: Callable[[dict[str, str]], str | None],
+    budget: int = 200,
+) -> tuple[dict[str, str], int]:
+    attempts = 0
+
+    def still_fails(candidate: dict[str, str]) -> bool:
+        nonlocal attempts
+        attempts += 1
+        return check(candidate) == signature
+
+    # First drop whole mutations, then make the remaining values smaller.
+    for name in list(case):
+        if attempts >= budget:
+            break
+        if case[name] != base[name] and still_fails({**case, name: base[name]}):
+            case = {**case, name: base[name]}
+
+    improved = True
+    while improved and attempts < budget:
+        improved = False
+        for name in case:
+            if case[name] == base[name]:
+                continue
+            for value in _simpler(case[name]):
+                if attempts >= budget:
+                    break
+                if len(value) <= len(case[name]) and value != case[name]:
+                    if still_fails({**case, name: value}):
+                        case = {**case, name: value}
+                        improved = True
+                        break
+
+    return case, attempts
+
+
+@dataclass
+class FuzzFailure:
+    signature: str
+    case: dict[str, str]
+    minimal: dict[str, str]
+    base: dict[str, str]
+    api_accepted: bool
+    ui_confirmed: bool | None = None
+
+    @property
+    def changes(self) -> dict[str, str]:
+        return {
+            name: value
+            for name, value in self.minimal.items()
+            if value != self.base[name]
+        }
+
+
+@dataclass
+class FuzzReport:
+    form: str
+    cases: int = 0
+    elapsed: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    failures: list[FuzzFailure] = field(default_factory=list)
+    shrink_attempts: int = 0
+
+    @property
+    def cases_per_second(self) -> float:
+        return self.cases / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> list[str]:
+        lines = [
+            f"{self.cases} {self.form} cases in {self.elapsed:.1f}s "
+            f"({self.cases_per_second:.0f}/s), statuses "
+            + ", ".join(
+                f"{status}: {count}" for status, count in sorted(self.statuses.items())
+            )
+            + f", {len(self.failures)} distinct failures, "
+            f"{self.shrink_attempts} shrink attempts"
+        ]
+        for failure in self.failures:
+            confirmed = {None: "", True: ", confirmed in UI", False: ", not in UI"}
+            lines.append(
+                f"   {failure.signature}{confirmed[failure.ui_confirmed]}: "
+                f"{json.dumps(failure.changes, ensure_ascii=False)}"
+            )
+        return lines
+
+
+def fuzz(
+    target: FormTarget,
+    api_factory: Callable[[], ContactListApi],
+    cases: int = 1000,
+    workers: int = 16,
+    seed: int | None = None,
+    shrink_budget: int = 200,
+) -> FuzzReport:
+    rng = random.Random(seed)
+    report = FuzzReport(target.name)
+    started = time.perf_counter()
+    generated = [target.generate(rng) for _ in range(cases)]
+
+    def run(pair: tuple[dict[str, str], dict[str, str]]):
+        base, case = pair
+        return base, case, target.submit(api_factory(), case)
+
+    found: dict[str, tuple[dict[str, str], dict[str, str], Outcome]] = {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        for base, case, outcome in executor.map(run, generated):
+            report.cases += 1
+            report.statuses[outcome.status] += 1
+            signature = classify(target.specs, case, outcome)
+            if signature and signature not in found:
+                found[signature] = (base, case, outcome)
+
+    def check(candidate: dict[str, str]) -> str | None:
+        outcome = target.submit(api_factory(), candidate)
+        return classify(target.specs, candidate, outcome)
+
+    # Shrinking replays one case at a time, so only the first case of each
+    # distinct failure is shrunk.
+    for signature, (base, case, outcome) in found.items():
+        minimal, attempts = shrink(case, base, signature, check, shrink_budget)
+        report.shrink_attempts += attempts
+        report.failures.append(
+            FuzzFailure(signature, case, minimal, base, outcome.accepted)
+        )
+
+    report.elapsed = time.perf_counter() - started
+    logger.info(report.summary()[0])
+    return report
+
+
+def _ui_outcome(page, locators, accepted_url: str) -> bool | None:
+    from selenium.common import TimeoutException
+
+    def settled(driver):
+        if driver.current_url == accepted_url:
+            return "accepted"
+        errors = driver.find_elements(*locators.ERROR_NOTIFICATION)
+        if errors and errors[0].text:
+            return "rejected"
+        return False
+
+    try:
+        return page.wait_until(settled, name="fuzz case settled") == "accepted"
+    except TimeoutException:
+        return None
+
+
+def replay_in_ui(
+    form: str, failure: FuzzFailure, browser, base_url: str, api: ContactListApi
+) -> bool:
+    from src.locators import AddNewContactPageLocators, RegisterPageLocators
+    from src.pages.add_new_contact_page import AddNewContactPage
+    from src.pages.login_page import LoginPage
+    from src.pages.register_page import RegisterPage
+
+    case = failure.minimal
+    browser.delete_all_cookies()
+
+    if form == "register":
+        page = RegisterPage(browser=browser, url=base_url + "addUser")
+        page.open()
+        page.register_new_user(**case)
+        accepted = _ui_outcome(page, RegisterPageLocators, base_url + "contactList")
+
+        if accepted:
+            user = ContactListApi(base_url, pool=api.pool)
+            user.login(case["email"], case["password"])
+            user.delete_me()
+    else:
+        email, password = get_credentials()
+        page = LoginPage(browser=browser, url=base_url + "login")
+        page.open()
+        page.login(email=email, password=password)
+        page.wait_for_url(base_url + "contactList")
+
+        page = AddNewContactPage(browser=browser, url=base_url + "addContact")
+        page.open()
+        page.add_new_contact(ContactRecord(**case))
+        accepted = _ui_outcome(
+            page, AddNewContactPageLocators, base_url + "contactList"
+        )
+
+        if accepted:
+            for contact in api.get_contacts():
+                if (contact.first_name, contact.last_name) == (
+                    case["first_name"],
+                    case["last_name"],
+                ):
+                    api.delete_contact(contact.id)
+
+    # A form that never settles did not accept the input either.
+    failure.ui_confirmed = bool(accepted) == failure.api_accepted
+    return failure.ui_confirmed
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Fuzz the contact and registration forms through the API, "
+        "shrink failing inputs and replay them in the UI."
+    )
+    parser.add_argument("--form", default="contact", choices=FORMS)
+    parser.add_argument("--env", default=get_env_name(), choices=HOSTS)
+    parser.add_argument(
+        "--base-url", default=None, help="Overrides the host of --env, e.g. a stand-in"
+    )
+    parser.add_argument("--cases", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--shrink-budget", type=int, default=200)
+    parser.add_argument(
+        "--replay-ui", action="store_true", help="Confirm minimal cases in a browser"
+    )
+    parser.add_argument("--browser_name", default="firefox")
+    parser.add_argument("--json", default=None, help="Write failures to this file")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url or HOSTS[args.env]
+    if not base_url:
+        parser.error(f"Host for environment {args.env!r} is not configured.")
+    base_url = base_url.rstrip("/") + "/"
+
+    pool = urllib3.PoolManager(maxsize=max(args.workers, 1), retries=False)
+    session = ContactListApi(base_url, pool=pool)
+    if args.form == "contact":
+        email, password = get_credentials(args.env)
+        if not (email and password):
+            parser.error("MY_EMAIL and MY_PASSWORD should be set in .env.")
+        session.login(email, password)
+
+    def api_factory() -> ContactListApi:
+        if args.form == "contact":
+            # One logged in session shared by every worker.
+            return session
+        return ContactListApi(base_url, pool=pool)
+
+    logger.basicConfig(
+        level=logger.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    report = fuzz(
+        TARGETS[args.form],
+        api_factory,
+        cases=args.cases,
+        workers=args.workers,
+        seed=args.seed,
+        shrink_budget=args.shrink_budget,
+    )
+
+    if args.replay_ui and report.failures:
+        from src.browser_factory import create_browser
+
+        browser = create_browser(args.browser_name)
+        if browser is None:
+            parser.error(f"Browser {args.browser_name} is not configured in .env.")
+        try:
+            for failure in report.failures:
+                try:
+                    replay_in_ui(args.form, failure, browser, base_url, session)
+                except Exception as error:
+                    logger.warning("Could not replay %s: %r", failure.signature, error)
+        finally:
+            browser.quit()
+
+    print("\n".join(report.summary()))
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(
+                [failure.__dict__ for failure in report.failures],
+                file,
+                indent=1,
+                ensure_ascii=False,
+            )
+
+    sys.exit(1 if report.failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,62 @@
 import os
+from dataclasses import dataclass
+from functools import cache
 
-from dotenv import load_dotenv
-
-load_dotenv()
 HOSTS = {
     "test": "https://thinking-tester-contact-list.herokuapp.com/",
     "dev": "",
     "prod": "",
 }
 
-__env = os.getenv("ENV", "test")
-base_url: str = HOSTS[__env]
+
+@cache
+def load_env():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@dataclass(frozen=True)
+class Environment:
+    name: str
+    base_url: str
+    email: str | None
+    password: str | None
+
+
+def get_env_name() -> str:
+    load_env()
+    return os.getenv("ENV", "test")
+
+
+def get_base_url() -> str:
+    return HOSTS[get_env_name()]
+
+
+def get_credentials(env_name: str | None = None) -> tuple[str | None, str | None]:
+    load_env()
+    suffix = (env_name or get_env_name()).upper()
+
+    return (
+        os.getenv(f"MY_EMAIL_{suffix}", os.getenv("MY_EMAIL")),
+        os.getenv(f"MY_PASSWORD_{suffix}", os.getenv("MY_PASSWORD")),
+    )
+
+
+def get_environment(env_name: str | None = None) -> Environment:
+    env_name = env_name or get_env_name()
+
+    if env_name not in HOSTS:
+        raise KeyError(
+            f"Unknown environment {env_name!r}, expected one of {list(HOSTS)}."
+        )
+    if not HOSTS[env_name]:
+        raise ValueError(f"Host for environment {env_name!r} is not configured.")
+
+    return Environment(env_name, HOSTS[env_name], *get_credentials(env_name))
+
+
+def __getattr__(name: str):
+    if name == "base_url":
+        return get_base_url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
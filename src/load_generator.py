@@ -0,0 +1,354 @@
+import argparse
+import logging as logger
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, NamedTuple
+
+import urllib3
+
+from src.api_client import ContactListApi
+from src.browser_factory import create_browser
+from src.contact_data import fake_contact_info
+from src.host_config import HOSTS, get_credentials, get_env_name
+from src.pages.add_new_contact_page import AddNewContactPage
+from src.pages.contact_details_page import ContactDetailsPage
+from src.pages.contact_list_page import ContactListPage
+from src.pages.login_page import LoginPage
+
+
+@dataclass
+class LoadConfig:
+    base_url: str
+    email: str
+    password: str
+    users: int = 10
+    browsers: int = 0
+    browser_name: str = "firefox"
+    ramp_up: float = 10
+    duration: float = 60
+    think_time: tuple[float, float] = (1, 3)
+
+
+class Journey(NamedTuple):
+    name: str
+    weight: int
+    run: Callable
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    index = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+class JourneyStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    def percentiles(self, *qs: float) -> list[float]:
+        ordered = sorted(self.latencies)
+        return [percentile(ordered, q) for q in qs]
+
+
+class LoadStats:
+    def __init__(self):
+        self.journeys: dict[str, JourneyStats] = {}
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+        self.crashes: list[str] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration: float, error: bool = False):
+        with self._lock:
+            stats = self.journeys.setdefault(name, JourneyStats(name))
+            stats.latencies.append(duration)
+            if error:
+                stats.errors += 1
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def report(self) -> str:
+        header = (
+            f"{'journey':<28}{'count':>8}{'errors':>8}{'err %':>8}{'rps':>8}"
+            f"{'p50 ms':>9}{'p90 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        elapsed = self.elapsed or 1
+
+        for name in sorted(self.journeys):
+            stats = self.journeys[name]
+            p50, p90, p95, p99 = stats.percentiles(50, 90, 95, 99)
+            lines.append(
+                f"{name:<28}{stats.count:>8}{stats.errors:>8}"
+                f"{stats.error_rate * 100:>8.1f}{stats.count / elapsed:>8.2f}"
+                f"{p50 * 1000:>9.0f}{p90 * 1000:>9.0f}"
+                f"{p95 * 1000:>9.0f}{p99 * 1000:>9.0f}"
+            )
+
+        if self.crashes:
+            lines.append(f"{len(self.crashes)} virtual users crashed:")
+            lines += [f"   {crash}" for crash in self.crashes]
+
+        return "\n".join(lines)
+
+
+def api_contact_list(api: ContactListApi):
+    api.get_contacts()
+
+
+def api_add_contact(api: ContactListApi):
+    contact = api.add_contact(fake_contact_info())
+    api.delete_contact(contact.id)
+
+
+def api_contact_details(api: ContactListApi):
+    contact = api.add_contact(fake_contact_info())
+    api.get_contact(contact.id)
+    api.delete_contact(contact.id)
+
+
+def api_edit_contact(api: ContactListApi):
+    contact = api.add_contact(fake_contact_info())
+    api.update_contact(contact.id, {"phone": fake_contact_info().phone})
+    api.get_contact(contact.id)
+    api.delete_contact(contact.id)
+
+
+API_JOURNEYS = (
+    Journey("api:contact_list", 5, api_contact_list),
+    Journey("api:add_contact", 2, api_add_contact),
+    Journey("api:contact_details", 2, api_contact_details),
+    Journey("api:edit_contact", 1, api_edit_contact),
+)
+
+
+def ui_login(browser, config: LoadConfig):
+    page = LoginPage(browser=browser, url=config.base_url + "login")
+    page.open()
+    page.login(email=config.email, password=config.password)
+
+    page.wait_for_url(config.base_url + "contactList")
+
+
+def ui_contact_list(browser, config: LoadConfig):
+    page = ContactListPage(browser=browser, url=config.base_url + "contactList")
+    page.open()
+    page.should_be_contact_list_table()
+
+
+def ui_add_contact(browser, config: LoadConfig):
+    contact = fake_contact_info()
+
+    page = AddNewContactPage(browser=browser, url=config.base_url + "addContact")
+    page.open()
+    page.add_new_contact(contact)
+
+    page.wait_for_url(config.base_url + "contactList")
+
+    contact_list_page = ContactListPage(browser=browser, url=browser.current_url)
+    contact_list_page.go_to_contact_details_by_full_name(
+        first_name=contact.first_name, last_name=contact.last_name
+    )
+
+    contact_list_page.wait_for_url(config.base_url + "contactDetails")
+
+    contact_details_page = ContactDetailsPage(browser=browser, url=browser.current_url)
+    contact_details_page.delete_contact()
+
+    contact_details_page.wait_for_url(config.base_url + "contactList")
+
+
+UI_JOURNEYS = (
+    Journey("ui:contact_list", 3, ui_contact_list),
+    Journey("ui:add_contact", 1, ui_add_contact),
+)
+
+
+def _timed(stats: LoadStats, name: str, func: Callable, *args) -> bool:
+    started = time.perf_counter()
+    try:
+        func(*args)
+    except Exception as error:
+        stats.record(name, time.perf_counter() - started, error=True)
+        logger.warning("Journey %s failed: %r", name, error)
+        return False
+
+    stats.record(name, time.perf_counter() - started)
+    return True
+
+
+def _think(config: LoadConfig, rng: random.Random, stop: threading.Event):
+    stop.wait(rng.uniform(*config.think_time))
+
+
+def api_user(
+    config: LoadConfig,
+    stats: LoadStats,
+    stop: threading.Event,
+    pool: urllib3.PoolManager,
+    seed: int,
+):
+    rng = random.Random(seed)
+    api = ContactListApi(config.base_url, pool=pool)
+    weights = [journey.weight for journey in API_JOURNEYS]
+
+    if not _timed(stats, "api:login", api.login, config.email, config.password):
+        return
+
+    while not stop.is_set():
+        journey = rng.choices(API_JOURNEYS, weights=weights)[0]
+        _timed(stats, journey.name, journey.run, api)
+        _think(config, rng, stop)
+
+
+def browser_user(
+    config: LoadConfig, stats: LoadStats, stop: threading.Event, seed: int
+):
+    rng = random.Random(seed)
+    weights = [journey.weight for journey in UI_JOURNEYS]
+
+    browser = create_browser(config.browser_name)
+    if browser is None:
+        raise RuntimeError(f"Browser {config.browser_name} is not configured in .env.")
+
+    try:
+        if not _timed(stats, "ui:login", ui_login, browser, config):
+            return
+
+        while not stop.is_set():
+            journey = rng.choices(UI_JOURNEYS, weights=weights)[0]
+            _timed(stats, journey.name, journey.run, browser, config)
+            _think(config, rng, stop)
+    finally:
+        browser.quit()
+
+
+def run_load(config: LoadConfig, seed: int | None = None) -> LoadStats:
+    stats = LoadStats()
+    stop = threading.Event()
+    rng = random.Random(seed)
+    pool = urllib3.PoolManager(maxsize=max(config.users, 1), retries=False)
+    workers = config.users + config.browsers
+
+    def start_later(delay: float, func: Callable, *args):
+        if not stop.wait(delay):
+            func(*args)
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        for number in range(config.users):
+            delay = config.ramp_up * number / max(config.users, 1)
+            future = executor.submit(
+                start_later,
+                delay,
+                api_user,
+                config,
+                stats,
+                stop,
+                pool,
+                rng.getrandbits(32),
+            )
+            futures.append(future)
+
+        for number in range(config.browsers):
+            delay = config.ramp_up * number / max(config.browsers, 1)
+            future = executor.submit(
+                start_later,
+                delay,
+                browser_user,
+                config,
+                stats,
+                stop,
+                rng.getrandbits(32),
+            )
+            futures.append(future)
+
+        stop.wait(config.ramp_up + config.duration)
+        stop.set()
+
+    stats.finished = time.perf_counter()
+
+    # Journey errors are counted by _timed, these are users that stopped early.
+    for future in futures:
+        error = future.exception()
+        if error:
+            logger.warning("Virtual user crashed: %r", error)
+            stats.crashes.append(repr(error))
+
+    return stats
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Replay contact list user journeys as a load test."
+    )
+    parser.add_argument("--env", default=get_env_name(), choices=HOSTS)
+    parser.add_argument("--users", type=int, default=10, help="API virtual users")
+    parser.add_argument("--browsers", type=int, default=0, help="Real browser users")
+    parser.add_argument("--browser_name", default="firefox")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Seconds")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds")
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        nargs=2,
+        default=(1, 3),
+        metavar=("MIN", "MAX"),
+        help="Seconds between journeys",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    base_url = HOSTS[args.env]
+    if not base_url:
+        parser.error(f"Host for environment {args.env!r} is not configured.")
+
+    email, password = get_credentials(args.env)
+    if not (email and password):
+        parser.error(
+            f"MY_EMAIL_{args.env.upper()} and MY_PASSWORD_{args.env.upper()} "
+            "(or MY_EMAIL and MY_PASSWORD) should be set in .env."
+        )
+
+    logger.basicConfig(
+        level=logger.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    config = LoadConfig(
+        base_url=base_url,
+        email=email,
+        password=password,
+        users=args.users,
+        browsers=args.browsers,
+        browser_name=args.browser_name,
+        ramp_up=args.ramp_up,
+        duration=args.duration,
+        think_time=tuple(args.think_time),
+    )
+    stats = run_load(config, seed=args.seed)
+
+    print(stats.report())
+    if stats.crashes:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
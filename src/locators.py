@@ -1,23 +1,47 @@
 from dataclasses import dataclass
 
-from selenium.webdriver.common.by import By
+from src.host_config import get_base_url
+from src.performance import PageBudget
 
-from src.host_config import base_url
+
+class By:
+    # Same strategies as selenium.webdriver.common.by.By. Importing that module
+    # initialises the whole selenium.webdriver package, which declaring
+    # locators does not need.
+    ID = "id"
+    XPATH = "xpath"
+    LINK_TEXT = "link text"
+    PARTIAL_LINK_TEXT = "partial link text"
+    NAME = "name"
+    TAG_NAME = "tag name"
+    CLASS_NAME = "class name"
+    CSS_SELECTOR = "css selector"
+
+
+class PageUrl:
+    def __init__(self, path: str):
+        self.path = path
+
+    def __get__(self, instance, owner) -> str:
+        return get_base_url() + self.path
 
 
 @dataclass
 class LoginPageLocators:
-    LOGIN_PAGE_URL: str = base_url + "login"
+    LOGIN_PAGE_URL = PageUrl("login")
+    PERFORMANCE_BUDGET = PageBudget()
     LOGIN_FORM = (By.TAG_NAME, "form")
     SIGN_UP_BUTTON = (By.CSS_SELECTOR, "#signup")
     REGISTER_EMAIL = (By.CSS_SELECTOR, "#email")
     REGISTER_PASSWORD = (By.CSS_SELECTOR, "#password")
     LOGIN_BUTTON = (By.CSS_SELECTOR, "#submit")
+    VISUAL_IGNORE = ()
 
 
 @dataclass
 class RegisterPageLocators:
-    REGISTER_PAGE_URL: str = base_url + "addUser"
+    REGISTER_PAGE_URL = PageUrl("addUser")
+    PERFORMANCE_BUDGET = PageBudget()
     REGISTER_FORM = (By.CSS_SELECTOR, "#add-user")
     REGISTER_FIRST_NAME = (By.CSS_SELECTOR, "#firstName")
     REGISTER_LAST_NAME = (By.CSS_SELECTOR, "#lastName")
@@ -26,21 +50,26 @@ class RegisterPageLocators:
     REGISTER_BUTTON = (By.CSS_SELECTOR, "#submit")
     ERROR_NOTIFICATION = (By.CSS_SELECTOR, "#error")
     CANCEL_BUTTON = (By.CSS_SELECTOR, "#cancel")
+    VISUAL_IGNORE = ()
 
 
 @dataclass
 class ContactListPageLocators:
-    CONTACT_LIST_PAGE_URL: str = base_url + "contactList"
+    CONTACT_LIST_PAGE_URL = PageUrl("contactList")
+    PERFORMANCE_BUDGET = PageBudget(load=6000, lcp=5000)
     ADD_NEW_CONTACT_BUTTON = (By.CSS_SELECTOR, "#add-contact")
     CONTACT_LIST_TABLE = (By.CSS_SELECTOR, ".contactTable")
     LOGOUT_BUTTON = (By.CSS_SELECTOR, "#logout")
     FULL_NAME_CONTACTS = (By.XPATH, "//table[@id='myTable']/tr/td[2]")
+    CONTACT_ROWS = (By.CSS_SELECTOR, "#myTable tr")
     FIRST_CONTACT = (By.XPATH, "//table[@id='myTable']/tr[1]/td[2]")
+    VISUAL_IGNORE = (CONTACT_ROWS,)
 
 
 @dataclass
 class AddNewContactPageLocators:
-    ADD_NEW_CONTACT_PAGE_URL: str = base_url + "addContact"
+    ADD_NEW_CONTACT_PAGE_URL = PageUrl("addContact")
+    PERFORMANCE_BUDGET = PageBudget()
     ADD_NEW_CONTACT_FORM = (By.CSS_SELECTOR, "#add-contact")
     LOGOUT_BUTTON = (By.CSS_SELECTOR, "#logout")
     CANCEL_BUTTON = (By.CSS_SELECTOR, "#cancel")
@@ -50,16 +79,20 @@ class AddNewContactPageLocators:
     EMAIL = (By.CSS_SELECTOR, "#email")
     PHONE = (By.CSS_SELECTOR, "#phone")
     STREET_ADDRESS_1 = (By.CSS_SELECTOR, "#street1")
+    STREET_ADDRESS_2 = (By.CSS_SELECTOR, "#street2")
     CITY = (By.CSS_SELECTOR, "#city")
     STATE = (By.CSS_SELECTOR, "#stateProvince")
     POSTAL_CODE = (By.CSS_SELECTOR, "#postalCode")
     COUNTRY = (By.CSS_SELECTOR, "#country")
     SUBMIT_BUTTON = (By.CSS_SELECTOR, "#submit")
+    ERROR_NOTIFICATION = (By.CSS_SELECTOR, "#error")
+    VISUAL_IGNORE = ()
 
 
 @dataclass
 class ContactDetailsPageLocators:
-    CONTACT_DETAILS_PAGE_URL: str = base_url + "contactDetails"
+    CONTACT_DETAILS_PAGE_URL = PageUrl("contactDetails")
+    PERFORMANCE_BUDGET = PageBudget()
     CONTACT_DETAILS_FORM = (By.CSS_SELECTOR, "#contactDetails")
     LOGOUT_BUTTON = (By.CSS_SELECTOR, "#logout")
     RETURN_BUTTON = (By.CSS_SELECTOR, "#return")
@@ -76,11 +109,25 @@ class ContactDetailsPageLocators:
     STATE = (By.CSS_SELECTOR, "#stateProvince")
     POSTAL_CODE = (By.CSS_SELECTOR, "#postalCode")
     COUNTRY = (By.CSS_SELECTOR, "#country")
+    VISUAL_IGNORE = (
+        FIRST_NAME,
+        LAST_NAME,
+        DATE_OF_BIRTH,
+        EMAIL,
+        PHONE,
+        STREET_ADDRESS_1,
+        STREET_ADDRESS_2,
+        CITY,
+        STATE,
+        POSTAL_CODE,
+        COUNTRY,
+    )
 
 
 @dataclass
 class EditContactPageLocators:
-    EDIT_CONTACT_PAGE_URL: str = base_url + "editContact"
+    EDIT_CONTACT_PAGE_URL = PageUrl("editContact")
+    PERFORMANCE_BUDGET = PageBudget()
     EDIT_CONTACT_FORM = (By.CSS_SELECTOR, "#edit-contact")
     LOGOUT_BUTTON = (By.CSS_SELECTOR, "#logout")
     CANCEL_BUTTON = (By.CSS_SELECTOR, "#cancel")
@@ -96,3 +143,16 @@ class EditContactPageLocators:
     POSTAL_CODE = (By.CSS_SELECTOR, "#postalCode")
     COUNTRY = (By.CSS_SELECTOR, "#country")
     SUBMIT_BUTTON = (By.CSS_SELECTOR, "#submit")
+    VISUAL_IGNORE = (
+        FIRST_NAME,
+        LAST_NAME,
+        DATE_OF_BIRTH,
+        EMAIL,
+        PHONE,
+        STREET_ADDRESS_1,
+        STREET_ADDRESS_2,
+        CITY,
+        STATE,
+        POSTAL_CODE,
+        COUNTRY,
+    )
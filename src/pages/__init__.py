@@ -0,0 +1,18 @@
+from importlib import import_module
+
+PAGES = {
+    "LoginPage": "src.pages.login_page",
+    "RegisterPage": "src.pages.register_page",
+    "ContactListPage": "src.pages.contact_list_page",
+    "AddNewContactPage": "src.pages.add_new_contact_page",
+    "ContactDetailsPage": "src.pages.contact_details_page",
+    "EditContactPage": "src.pages.edit_contact_page",
+}
+
+
+def __getattr__(name: str):
+    if name in PAGES:
+        page = getattr(import_module(PAGES[name]), name)
+        globals()[name] = page
+        return page
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,58 @@
 import logging as logger
+import time
+from dataclasses import dataclass, field
+from itertools import cycle
+from typing import Iterable
 
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
-
-from src.locators import AddNewContactPageLocators
+from src.contact_data import CONTACT_FIELDS, ContactRecord
+from src.locators import AddNewContactPageLocators, ContactListPageLocators
 from src.pages.base_page import BasePage
 
+FIELD_LOCATORS = {
+    field: getattr(AddNewContactPageLocators, field.upper()) for field in CONTACT_FIELDS
+}
+
+SUBMITTED_KEY = "its-ui-test-submitted"
+
+FILL_AND_SUBMIT_SCRIPT = f"""
+const [values, submit] = arguments;
+for (const [selector, value] of values) {{
+    const field = document.querySelector(selector);
+    field.value = value;
+    field.dispatchEvent(new Event("input", {{ bubbles: true }}));
+    field.dispatchEvent(new Event("change", {{ bubbles: true }}));
+}}
+sessionStorage.setItem("{SUBMITTED_KEY}", performance.timeOrigin + performance.now());
+document.querySelector(submit).click();
+"""
+
+# Milliseconds from the click to the contact list response, both taken by the
+# tab itself, so the time the test spends in other tabs does not count.
+SUBMIT_LATENCY_SCRIPT = f"""
+const submitted = Number(sessionStorage.getItem("{SUBMITTED_KEY}"));
+sessionStorage.removeItem("{SUBMITTED_KEY}");
+const [navigation] = performance.getEntriesByType("navigation");
+if (!submitted || !navigation || performance.timeOrigin < submitted) {{
+    return null;
+}}
+return performance.timeOrigin + navigation.responseEnd - submitted;
+"""
+
+
+@dataclass
+class BulkAddResult:
+    latencies: list[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def contacts_per_minute(self) -> float:
+        return len(self.latencies) / self.elapsed * 60 if self.elapsed else 0.0
+
 
 class AddNewContactPage(BasePage):
+    performance_budget = AddNewContactPageLocators.PERFORMANCE_BUDGET
+    visual_ignore = AddNewContactPageLocators.VISUAL_IGNORE
+
     def should_be_add_new_contact_page(self):
         self.should_be_contact_list_url()
         self.should_be_add_new_contact_form()
@@ -30,80 +75,98 @@ class AddNewContactPage(BasePage):
     def logout(self):
         logger.info("Logout.")
 
-        logout_button = self.browser.find_element(
-            *AddNewContactPageLocators.LOGOUT_BUTTON
-        )
+        logout_button = self.find(*AddNewContactPageLocators.LOGOUT_BUTTON)
         logout_button.click()
 
     def cancel_from_add_new_contact_page(self):
         logger.info("Cancel from add new contact page")
 
-        WebDriverWait(self.browser, 10).until(
+        from selenium.webdriver.support import expected_conditions as EC
+
+        self.wait_until(
             EC.visibility_of_element_located(AddNewContactPageLocators.CANCEL_BUTTON)
         )
 
-        cancel_button = self.browser.find_element(
-            *AddNewContactPageLocators.CANCEL_BUTTON
-        )
+        cancel_button = self.find(*AddNewContactPageLocators.CANCEL_BUTTON)
 
         cancel_button.click()
 
-    def add_new_contact(
-        self,
-        first_name,
-        last_name,
-        date_of_birth,
-        email,
-        phone,
-        street_address_1,
-        city,
-        state,
-        postal_code,
-        country,
-    ):
+    def add_new_contact(self, contact: ContactRecord):
         logger.info(
-            f"Add new contact, with first name: {first_name}, last name: {last_name}"
-        )
-
-        first_name_form = self.browser.find_element(
-            *AddNewContactPageLocators.FIRST_NAME
-        )
-        first_name_form.send_keys(first_name)
-
-        last_name_form = self.browser.find_element(*AddNewContactPageLocators.LAST_NAME)
-        last_name_form.send_keys(last_name)
-
-        date_of_birth_form = self.browser.find_element(
-            *AddNewContactPageLocators.DATE_OF_BIRTH
-        )
-        date_of_birth_form.send_keys(date_of_birth)
-
-        email_form = self.browser.find_element(*AddNewContactPageLocators.EMAIL)
-        email_form.send_keys(email)
-
-        phone_form = self.browser.find_element(*AddNewContactPageLocators.PHONE)
-        phone_form.send_keys(str(phone))
-
-        street_address_1_form = self.browser.find_element(
-            *AddNewContactPageLocators.STREET_ADDRESS_1
+            "Add new contact, with first name: %s, last name: %s",
+            contact.first_name,
+            contact.last_name,
         )
-        street_address_1_form.send_keys(street_address_1)
 
-        city_form = self.browser.find_element(*AddNewContactPageLocators.CITY)
-        city_form.send_keys(city)
-
-        state_form = self.browser.find_element(*AddNewContactPageLocators.STATE)
-        state_form.send_keys(state)
-
-        postal_code_form = self.browser.find_element(
-            *AddNewContactPageLocators.POSTAL_CODE
+        for field, value in contact.items():
+            if value:
+                field_form = self.find(*FIELD_LOCATORS[field])
+                field_form.send_keys(str(value))
+
+        submit_button = self.find(*AddNewContactPageLocators.SUBMIT_BUTTON)
+        with self.expect_response("POST", "/contacts"):
+            submit_button.click()
+
+    def add_new_contacts(
+        self, contacts: Iterable[ContactRecord], tabs: int = 3
+    ) -> BulkAddResult:
+        logger.info("Bulk add new contacts in %d tabs.", tabs)
+
+        result = BulkAddResult()
+        started = time.perf_counter()
+        contact_list_url = ContactListPageLocators.CONTACT_LIST_PAGE_URL
+        add_new_contact_url = AddNewContactPageLocators.ADD_NEW_CONTACT_PAGE_URL
+        submit = AddNewContactPageLocators.SUBMIT_BUTTON[1]
+
+        main_window = self.browser.current_window_handle
+        handles = [main_window]
+        for _ in range(tabs - 1):
+            self.browser.switch_to.new_window("tab")
+            handles.append(self.browser.current_window_handle)
+
+        submitted: dict[str, float] = {}
+
+        def wait_for_submitted(handle: str):
+            self.browser.switch_to.window(handle)
+            self.wait_for_url(contact_list_url)
+            observed = time.perf_counter() - submitted.pop(handle)
+            # Without a navigation entry fall back to the time seen from here,
+            # which also counts the work in the other tabs.
+            latency = self.browser.execute_script(SUBMIT_LATENCY_SCRIPT)
+            result.latencies.append(observed if latency is None else latency / 1000)
+
+        try:
+            for contact, handle in zip(contacts, cycle(handles)):
+                if handle in submitted:
+                    wait_for_submitted(handle)
+                else:
+                    self.browser.switch_to.window(handle)
+
+                self.browser.get(add_new_contact_url)
+                self.browser.execute_script(
+                    FILL_AND_SUBMIT_SCRIPT,
+                    [
+                        [FIELD_LOCATORS[name][1], str(value)]
+                        for name, value in contact.items()
+                        if value
+                    ],
+                    submit,
+                )
+                submitted[handle] = time.perf_counter()
+
+            for handle in list(submitted):
+                wait_for_submitted(handle)
+        finally:
+            for handle in handles[1:]:
+                self.browser.switch_to.window(handle)
+                self.browser.close()
+            self.browser.switch_to.window(main_window)
+
+        result.elapsed = time.perf_counter() - started
+        logger.info(
+            "Added %d contacts, %.1f contacts per minute.",
+            len(result.latencies),
+            result.contacts_per_minute,
         )
-        postal_code_form.send_keys(str(postal_code))
 
-        country_form = self.browser.find_element(*AddNewContactPageLocators.COUNTRY)
-        country_form.send_keys(country)
-
-        submit_button = self.browser.find_element(
-            *AddNewContactPageLocators.SUBMIT_BUTTON
-        )
-        submit_button.click()
+        return result
@@ -1,30 +1,226 @@
-from selenium import webdriver
-from selenium.common import NoSuchElementException
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from src.performance import PageBudget, PerformanceRecorder
+from src.static_dom import StaticBrowser
+from src.waits import POLL_FREQUENCY, WaitHistory, condition_name
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+    from src.visual import VisualChecker
+
+BATCH_SCRIPT = """
+const steps = arguments[0];
+
+function find(how, what) {
+    switch (how) {
+        case "css selector":
+            return document.querySelector(what);
+        case "id":
+            return document.getElementById(what);
+        case "name":
+            return document.getElementsByName(what)[0];
+        case "tag name":
+            return document.getElementsByTagName(what)[0];
+        case "class name":
+            return document.getElementsByClassName(what)[0];
+        case "xpath":
+            return document.evaluate(
+                what, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+    }
+    throw new Error("Unsupported locator strategy in batch: " + how);
+}
+
+return steps.map(([action, how, what, value]) => {
+    const element = find(how, what);
+    if (action === "present") return element !== null;
+    if (element === null) throw new Error("No element for " + how + " " + what);
+    switch (action) {
+        case "click":
+            element.click();
+            return null;
+        case "set_value":
+            element.value = value;
+            element.dispatchEvent(new Event("input", { bubbles: true }));
+            element.dispatchEvent(new Event("change", { bubbles: true }));
+            return null;
+        case "text":
+            return element.innerText;
+        case "value":
+            return element.value;
+    }
+    throw new Error("Unsupported batch action: " + action);
+});
+"""
 
 
 class BasePage:
+    performance_recorder: PerformanceRecorder | None = None
+    performance_budget = PageBudget()
+    wait_history = WaitHistory()
+    visual_checker: VisualChecker | None = None
+    visual_ignore: tuple[tuple[str, str], ...] = ()
+
     def __init__(
-        self, browser: webdriver.Firefox | webdriver.Chrome, url: str, timeout: int = 5
+        self,
+        browser: webdriver.Firefox | webdriver.Chrome | StaticBrowser,
+        url: str,
     ):
         self.browser = browser
         self.url = url
-        self.browser.implicitly_wait(timeout)
+        self.is_static = isinstance(browser, StaticBrowser)
+
+    def find(self, how, what):
+        from selenium.webdriver.support import expected_conditions as EC
+
+        return self.wait_until(
+            EC.presence_of_element_located((how, what)), name=f"find {what}"
+        )
+
+    def is_element_present(self, how, what, timeout: float | None = None):
+        if timeout == 0 or self.is_static:
+            return bool(self.browser.find_elements(how, what))
 
-    def is_element_present(self, how, what):
+        from selenium.common import TimeoutException
+        from selenium.webdriver.support import expected_conditions as EC
+
+        key = self._wait_key(f"find {what}")
         try:
-            self.browser.find_element(how, what)
-        except NoSuchElementException:
+            self._wait(
+                EC.presence_of_element_located((how, what)),
+                timeout or self.wait_history.budget(key),
+                key,
+            )
+        except TimeoutException:
             return False
         return True
 
-    def get_visible_element(self, how, what, timeout: int = 5):
-        return (
-            WebDriverWait(self.browser, timeout)
-            .until(EC.visibility_of_element_located((how, what)))
-            .text
+    def is_not_element_present(self, how, what):
+        return not self.is_element_present(how, what, timeout=0)
+
+    def get_visible_element(self, how, what, timeout: float | None = None):
+        from selenium.webdriver.support import expected_conditions as EC
+
+        return self.wait_until(
+            EC.visibility_of_element_located((how, what)),
+            timeout,
+            name=f"visible {what}",
+        ).text
+
+    def wait_until(
+        self, condition, timeout: float | None = None, name: str | None = None
+    ):
+        from selenium.common import TimeoutException
+
+        key = self._wait_key(name or condition_name(condition))
+        timeout = timeout or self.wait_history.budget(key)
+        try:
+            return self._wait(condition, timeout, key)
+        except TimeoutException:
+            self.wait_history.record_timeout(key, timeout)
+            raise
+
+    def _wait_key(self, name: str) -> str:
+        return f"{type(self).__name__}:{name}"
+
+    def _wait(self, condition, timeout: float, key: str):
+        from selenium.webdriver.support.wait import WebDriverWait
+
+        started = time.perf_counter()
+        result = WebDriverWait(
+            self.browser, timeout, poll_frequency=POLL_FREQUENCY
+        ).until(condition)
+        self.wait_history.record(key, time.perf_counter() - started)
+
+        return result
+
+    def wait_for_url(self, url: str, timeout: float | None = None):
+        from selenium.webdriver.support import expected_conditions as EC
+
+        self.wait_until(EC.url_to_be(url), timeout)
+
+    def wait_for_url_change(self, url: str, timeout: float | None = None):
+        from selenium.webdriver.support import expected_conditions as EC
+
+        self.wait_until(EC.url_changes(url), timeout)
+
+    @contextmanager
+    def expect_response(self, method: str, path: str, timeout: float | None = None):
+        telemetry = getattr(self.browser, "telemetry", None)
+        if telemetry is None:
+            yield
+            return
+
+        mark = telemetry.mark()
+        yield
+
+        from selenium.common import TimeoutException
+
+        key = self._wait_key(f"response {method} {path}")
+        timeout = timeout or self.wait_history.budget(key)
+        started = time.perf_counter()
+        try:
+            telemetry.wait_for_response(method, path, timeout, since=mark)
+        except TimeoutError as error:
+            self.wait_history.record_timeout(key, timeout)
+            raise TimeoutException(str(error)) from error
+        self.wait_history.record(key, time.perf_counter() - started)
+
+    def should_have_no_js_errors(self):
+        telemetry = getattr(self.browser, "telemetry", None)
+        if telemetry is None:
+            return
+
+        errors = telemetry.js_errors
+        assert not errors, f"{len(errors)} JS errors: " + "; ".join(
+            error.text for error in errors
         )
 
+    def run_batch(self, steps: list[tuple]) -> list:
+        batch = []
+        for action, (how, what), *value in steps:
+            batch.append([action, how, what, value[0] if value else None])
+
+        return self.browser.execute_script(BATCH_SCRIPT, batch)
+
     def open(self):
         self.browser.get(self.url)
+
+        if self.performance_recorder and not self.is_static:
+            self.should_be_within_performance_budget()
+
+    def should_be_within_performance_budget(self):
+        page = type(self).__name__
+        metrics = self.performance_recorder.collect(self.browser, page)
+        violations = metrics.over_budget(self.performance_budget)
+
+        assert (
+            not violations
+        ), f"{page} is over its performance budget: {', '.join(violations)}."
+
+    def should_look_like_baseline(self, state: str | None = None):
+        if not self.visual_checker or self.is_static:
+            return
+
+        state = state or urlsplit(self.browser.current_url).path.strip("/") or "root"
+        size = self.browser.get_window_size()
+        name = f"{self.browser.name}/{size['width']}x{size['height']}/{state}"
+
+        png, rects, scale = self.visual_checker.capture(
+            self.browser, self.visual_ignore
+        )
+        result = self.visual_checker.compare(name, png, rects, scale)
+
+        assert (
+            result.status != "missing"
+        ), f"{name} has no baseline, record it with --visual update."
+        assert not result.failed, (
+            f"{name} differs from its baseline: {result.changed_ratio:.2%} pixels "
+            f"changed in {len(result.regions)} regions."
+        )
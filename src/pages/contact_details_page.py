@@ -1,12 +1,19 @@
 import logging as logger
-import time
-from typing import Literal
 
+from src.contact_data import CONTACT_FIELDS, ContactField, ContactRecord
 from src.locators import ContactDetailsPageLocators
 from src.pages.base_page import BasePage
 
+FIELD_LOCATORS = {
+    field: getattr(ContactDetailsPageLocators, field.upper())
+    for field in CONTACT_FIELDS
+}
+
 
 class ContactDetailsPage(BasePage):
+    performance_budget = ContactDetailsPageLocators.PERFORMANCE_BUDGET
+    visual_ignore = ContactDetailsPageLocators.VISUAL_IGNORE
+
     def should_be_contact_details_page(self):
         self.should_be_contact_details_page_url()
         self.should_be_contact_details_form()
@@ -29,25 +36,19 @@ class ContactDetailsPage(BasePage):
     def logout(self):
         logger.info("Logout.")
 
-        logout_button = self.browser.find_element(
-            *ContactDetailsPageLocators.LOGOUT_BUTTON
-        )
+        logout_button = self.find(*ContactDetailsPageLocators.LOGOUT_BUTTON)
         logout_button.click()
 
     def return_to_contact_list(self):
         logger.info("Return to contact list.")
 
-        return_button = self.browser.find_element(
-            *ContactDetailsPageLocators.RETURN_BUTTON
-        )
+        return_button = self.find(*ContactDetailsPageLocators.RETURN_BUTTON)
         return_button.click()
 
     def delete_contact(self):
         logger.info("Deleting contact.")
 
-        delete_button = self.browser.find_element(
-            *ContactDetailsPageLocators.DELETE_BUTTON
-        )
+        delete_button = self.find(*ContactDetailsPageLocators.DELETE_BUTTON)
         delete_button.click()
 
         alert = self.browser.switch_to.alert
@@ -56,44 +57,29 @@ class ContactDetailsPage(BasePage):
     def go_to_edit_contact_page(self):
         logger.info("Go to edit contact page.")
 
-        edit_contact_button = self.browser.find_element(
-            *ContactDetailsPageLocators.EDIT_CONTACT_BUTTON
-        )
+        edit_contact_button = self.find(*ContactDetailsPageLocators.EDIT_CONTACT_BUTTON)
         edit_contact_button.click()
 
-    def get_info(
-        self,
-        what: Literal[
-            "first_name",
-            "last_name",
-            "date_of_birth",
-            "email",
-            "phone",
-            "street_address_1",
-            "street_address_2",
-            "city",
-            "state",
-            "postal_code",
-            "country",
-        ],
-    ):
+    def wait_for_contact(self):
+        first_name = self.find(*FIELD_LOCATORS["first_name"])
+        self.wait_until(lambda driver: first_name.text, name="contact loaded")
+
+    def get_info(self, what: ContactField):
         logger.info("Get info from field.")
 
-        locators_dict = {
-            "first_name": ContactDetailsPageLocators.FIRST_NAME,
-            "last_name": ContactDetailsPageLocators.LAST_NAME,
-            "date_of_birth": ContactDetailsPageLocators.DATE_OF_BIRTH,
-            "email": ContactDetailsPageLocators.EMAIL,
-            "phone": ContactDetailsPageLocators.PHONE,
-            "street_address_1": ContactDetailsPageLocators.STREET_ADDRESS_1,
-            "street_address_2": ContactDetailsPageLocators.STREET_ADDRESS_2,
-            "city": ContactDetailsPageLocators.CITY,
-            "state": ContactDetailsPageLocators.STATE,
-            "postal_code": ContactDetailsPageLocators.POSTAL_CODE,
-            "country": ContactDetailsPageLocators.COUNTRY,
-        }
-
-        time.sleep(3)
-        field_text = self.get_visible_element(*locators_dict[what])
+        self.wait_for_contact()
+        field_text = self.get_visible_element(*FIELD_LOCATORS[what])
 
         return field_text
+
+    def get_contact(self) -> ContactRecord:
+        logger.info("Get contact info from all fields.")
+
+        self.wait_for_contact()
+        texts = self.browser.execute_script(
+            "return arguments[0].map("
+            "(selector) => document.querySelector(selector).innerText.trim())",
+            [locator[1] for locator in FIELD_LOCATORS.values()],
+        )
+
+        return ContactRecord(**dict(zip(FIELD_LOCATORS, texts)))
@@ -1,12 +1,52 @@
 import logging as logger
+from typing import Iterator, NamedTuple
 
-from selenium.webdriver.common.by import By
-
-from src.locators import ContactListPageLocators
+from src.locators import By, ContactListPageLocators
 from src.pages.base_page import BasePage
 
+READ_ROWS_SCRIPT = """
+const [selector, start, count, waitMs] = arguments;
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + waitMs;
+
+// The list is rendered right after the contacts request, so a finished
+// request with no rows means the list is empty rather than still loading.
+function loaded() {
+    return performance.getEntriesByType("resource").some(
+        (entry) => entry.name.split("?")[0].endsWith("/contacts")
+            && entry.responseEnd > 0
+            && performance.now() - entry.responseEnd > 200
+    );
+}
+
+function read() {
+    const rows = Array.from(document.querySelectorAll(selector)).filter(
+        (row) => row.querySelector("td")
+    );
+    if (rows.length <= start && !(start === 0 && loaded()) && Date.now() < deadline) {
+        setTimeout(read, 50);
+        return;
+    }
+    const chunk = rows.slice(start, start + count);
+    if (chunk.length) chunk[chunk.length - 1].scrollIntoView({ block: "end" });
+    done(chunk.map((row) => Array.from(row.cells, (cell) => cell.textContent.trim())));
+}
+
+read();
+"""
+
+
+class ContactRow(NamedTuple):
+    id: str
+    full_name: str
+    cells: tuple[str, ...]
+
 
 class ContactListPage(BasePage):
+    performance_budget = ContactListPageLocators.PERFORMANCE_BUDGET
+    visual_ignore = ContactListPageLocators.VISUAL_IGNORE
+    round_trips = 0
+
     def should_be_contact_list_page(self):
         self.should_be_contact_list_url()
         self.should_be_add_new_contact_button()
@@ -36,15 +76,13 @@ class ContactListPage(BasePage):
     def logout(self):
         logger.info("Logout.")
 
-        logout_button = self.browser.find_element(
-            *ContactListPageLocators.LOGOUT_BUTTON
-        )
+        logout_button = self.find(*ContactListPageLocators.LOGOUT_BUTTON)
         logout_button.click()
 
     def go_to_add_new_contact(self):
         logger.info("Go to add new contact page.")
 
-        add_new_contact_button = self.browser.find_element(
+        add_new_contact_button = self.find(
             *ContactListPageLocators.ADD_NEW_CONTACT_BUTTON
         )
         add_new_contact_button.click()
@@ -53,41 +91,87 @@ class ContactListPage(BasePage):
         logger.info("Find contact by full name.")
 
         full_name = " ".join([first_name, last_name])
-        rows = self.browser.find_elements(*ContactListPageLocators.FULL_NAME_CONTACTS)
-
-        list_of_all_full_names = [row.text for row in rows]
 
-        assert (
-            full_name in list_of_all_full_names
+        assert any(
+            row.full_name == full_name for row in self.iter_contact_rows()
         ), f"{first_name} {last_name} not in the contact list."
 
-    def contact_is_not_present_in_contact_list(self, first_name: str, last_name: str):
+    def contact_is_not_present_in_contact_list(
+        self, first_name: str, last_name: str, timeout: float | None = None
+    ):
+        from selenium.common import TimeoutException
+
         full_name = " ".join([first_name, last_name])
 
-        rows = self.browser.find_elements(*ContactListPageLocators.FULL_NAME_CONTACTS)
+        def row_is_gone(browser) -> bool:
+            return not any(
+                row.full_name == full_name for row in self.iter_contact_rows()
+            )
 
-        list_of_all_full_names = [row.text for row in rows]
+        # Only a row that is still shown is waited for, an empty list passes.
+        try:
+            self.wait_until(row_is_gone, timeout, name="contact row is gone")
+        except TimeoutException:
+            raise AssertionError(
+                f"{first_name} {last_name} in the contact list."
+            ) from None
+
+    def iter_contact_rows(
+        self,
+        chunk_size: int = 100,
+        timeout: float = 5,
+        lazy_wait: float = 0,
+        next_page: tuple[str, str] | None = None,
+    ) -> Iterator[ContactRow]:
+        self.round_trips = 0
+        start = 0
+        wait = timeout
+
+        while True:
+            chunk = self.browser.execute_async_script(
+                READ_ROWS_SCRIPT,
+                ContactListPageLocators.CONTACT_ROWS[1],
+                start,
+                chunk_size,
+                wait * 1000,
+            )
+            self.round_trips += 1
 
-        assert (
-            full_name not in list_of_all_full_names
-        ), f"{first_name} {last_name} in the contact list."
+            for cells in chunk:
+                yield ContactRow(
+                    id=cells[0], full_name=cells[1], cells=tuple(cells[2:])
+                )
+
+            start += len(chunk)
+            wait = lazy_wait
+
+            if len(chunk) == chunk_size or (chunk and lazy_wait):
+                continue
+
+            if next_page and self.is_element_present(*next_page, timeout=0):
+                logger.info("Go to next page of contact list.")
+                self.find(*next_page).click()
+                start = 0
+                wait = timeout
+                continue
+
+            logger.info(
+                "Read %d contact rows in %d round trips.", start, self.round_trips
+            )
+            return
 
     def go_to_contact_details_by_full_name(self, first_name: str, last_name: str):
         logger.info("Go to contact details by full name.")
 
         full_name = " ".join([first_name, last_name])
-        contact = self.browser.find_element(
-            By.XPATH, f"//table//td[contains(text(), '{full_name}')]"
-        )
+        contact = self.find(By.XPATH, f"//table//td[contains(text(), '{full_name}')]")
         contact.click()
 
     def get_first_contact(self):
         logger.info("Get first contact from list.")
 
         if self.is_element_present(*ContactListPageLocators.FIRST_CONTACT):
-            first_contact = self.browser.find_element(
-                *ContactListPageLocators.FIRST_CONTACT
-            )
+            first_contact = self.find(*ContactListPageLocators.FIRST_CONTACT)
             return first_contact
 
         logger.info("No contacts.")
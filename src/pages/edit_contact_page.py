@@ -1,15 +1,19 @@
 import logging as logger
-import time
-from typing import Literal
 
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.wait import WebDriverWait
-
-from src.locators import EditContactPageLocators
+from src.contact_data import CONTACT_FIELDS, ContactField, ContactRecord
+from src.locators import ContactDetailsPageLocators, EditContactPageLocators
 from src.pages.base_page import BasePage
+from src.pages.contact_details_page import ContactDetailsPage
+
+FIELD_LOCATORS = {
+    field: getattr(EditContactPageLocators, field.upper()) for field in CONTACT_FIELDS
+}
 
 
 class EditContactPage(BasePage):
+    performance_budget = EditContactPageLocators.PERFORMANCE_BUDGET
+    visual_ignore = EditContactPageLocators.VISUAL_IGNORE
+
     def should_be_edit_contact_page(self):
         self.should_be_edit_contact_page_url()
         self.should_be_edit_contact_form()
@@ -31,64 +35,79 @@ class EditContactPage(BasePage):
     def logout(self):
         logger.info("Logout from edit contact page.")
 
-        logout_button = self.browser.find_element(
-            *EditContactPageLocators.LOGOUT_BUTTON
-        )
+        logout_button = self.find(*EditContactPageLocators.LOGOUT_BUTTON)
         logout_button.click()
 
     def return_to_contact_details(self):
         logger.info("Return to contact details from edit contact page.")
 
-        cancel_button = self.browser.find_element(
-            *EditContactPageLocators.CANCEL_BUTTON
-        )
+        cancel_button = self.find(*EditContactPageLocators.CANCEL_BUTTON)
         cancel_button.click()
 
+    def wait_for_contact(self):
+        first_name_field = self.find(*FIELD_LOCATORS["first_name"])
+        self.wait_until(
+            lambda driver: first_name_field.get_attribute("value"),
+            name="contact loaded",
+        )
+
+    def read_form(self) -> ContactRecord:
+        values = self.run_batch(
+            [("value", FIELD_LOCATORS[field]) for field in CONTACT_FIELDS]
+        )
+        return ContactRecord(**dict(zip(CONTACT_FIELDS, values)))
+
+    def edit_fields(
+        self, changes: dict[ContactField, str] | ContactRecord
+    ) -> dict[str, tuple[str, str]]:
+        if isinstance(changes, ContactRecord):
+            # Empty fields of a record are not set; pass a dict to clear a field.
+            changes = {field: value for field, value in changes.items() if value}
+
+        unknown = set(changes) - set(CONTACT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown contact fields: {', '.join(sorted(unknown))}")
+
+        logger.info("Edit contact fields %s.", ", ".join(changes))
+
+        self.wait_for_contact()
+        before = self.read_form()
+
+        # One script call fills the changed fields and submits, one read gets
+        # them back.
+        self.run_batch(
+            [
+                ("set_value", FIELD_LOCATORS[field], str(value))
+                for field, value in changes.items()
+                if getattr(before, field) != str(value)
+            ]
+            + [("click", EditContactPageLocators.SUBMIT_BUTTON)]
+        )
+        self.wait_for_url(ContactDetailsPageLocators.CONTACT_DETAILS_PAGE_URL)
+
+        after = ContactDetailsPage(self.browser, self.browser.current_url).get_contact()
+        return before.diff(after)
+
     def edit_contact(
         self,
-        what: Literal[
-            "first_name",
-            "last_name",
-            "date_of_birth",
-            "email",
-            "phone",
-            "street_address_1",
-            "street_address_2",
-            "city",
-            "state",
-            "postal_code",
-            "country",
-        ],
+        what: ContactField,
         data: str,
     ):
-        logger.info(f"Edit {what} contact with {data}.")
-
-        locators_dict = {
-            "first_name": EditContactPageLocators.FIRST_NAME,
-            "last_name": EditContactPageLocators.LAST_NAME,
-            "date_of_birth": EditContactPageLocators.DATE_OF_BIRTH,
-            "email": EditContactPageLocators.EMAIL,
-            "phone": EditContactPageLocators.PHONE,
-            "street_address_1": EditContactPageLocators.STREET_ADDRESS_1,
-            "street_address_2": EditContactPageLocators.STREET_ADDRESS_2,
-            "city": EditContactPageLocators.CITY,
-            "state": EditContactPageLocators.STATE,
-            "postal_code": EditContactPageLocators.POSTAL_CODE,
-            "country": EditContactPageLocators.COUNTRY,
-        }
-
-        edit_field = self.browser.find_element(*locators_dict[what])
-
-        time.sleep(1)
+        logger.info("Edit %s contact with %s.", what, data)
+
+        from selenium.webdriver.common.keys import Keys
+
+        self.wait_for_contact()
+
+        edit_field = self.find(*FIELD_LOCATORS[what])
         edit_field.send_keys(Keys.CONTROL + "a")
         edit_field.send_keys(Keys.DELETE)
-        WebDriverWait(self.browser, 2).until(
-            lambda driver: edit_field.get_attribute("value") == ""
+        self.wait_until(
+            lambda driver: edit_field.get_attribute("value") == "",
+            name="field cleared",
         )
 
         edit_field.send_keys(data)
 
-        submit_button = self.browser.find_element(
-            *EditContactPageLocators.SUBMIT_BUTTON
-        )
+        submit_button = self.find(*EditContactPageLocators.SUBMIT_BUTTON)
         submit_button.click()
@@ -4,6 +4,9 @@ from src.pages.base_page import BasePage
 
 
 class LoginPage(BasePage):
+    performance_budget = LoginPageLocators.PERFORMANCE_BUDGET
+    visual_ignore = LoginPageLocators.VISUAL_IGNORE
+
     def should_be_login_page(self):
         self.should_be_login_url()
         self.should_be_login_form()
@@ -29,16 +32,16 @@ class LoginPage(BasePage):
 
     def go_to_register_page(self):
         logger.info("Go to register page")
-        link = self.browser.find_element(*LoginPageLocators.SIGN_UP_BUTTON)
+        link = self.find(*LoginPageLocators.SIGN_UP_BUTTON)
         link.click()
 
     def login(self, email: str, password: str):
         logger.info("Starting login")
-        email_form = self.browser.find_element(*LoginPageLocators.REGISTER_EMAIL)
+        email_form = self.find(*LoginPageLocators.REGISTER_EMAIL)
         email_form.send_keys(email)
 
-        password_form = self.browser.find_element(*LoginPageLocators.REGISTER_PASSWORD)
+        password_form = self.find(*LoginPageLocators.REGISTER_PASSWORD)
         password_form.send_keys(password)
 
-        login_button = self.browser.find_element(*LoginPageLocators.LOGIN_BUTTON)
+        login_button = self.find(*LoginPageLocators.LOGIN_BUTTON)
         login_button.click()
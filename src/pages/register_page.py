@@ -5,6 +5,9 @@ from src.pages.base_page import BasePage
 
 
 class RegisterPage(BasePage):
+    performance_budget = RegisterPageLocators.PERFORMANCE_BUDGET
+    visual_ignore = RegisterPageLocators.VISUAL_IGNORE
+
     def should_be_register_page(self):
         self.should_be_register_url()
         self.should_be_register_form()
@@ -26,27 +29,19 @@ class RegisterPage(BasePage):
     ):
         logger.info("Starting register new user.")
 
-        first_name_form = self.browser.find_element(
-            *RegisterPageLocators.REGISTER_FIRST_NAME
-        )
+        first_name_form = self.find(*RegisterPageLocators.REGISTER_FIRST_NAME)
         first_name_form.send_keys(first_name)
 
-        last_name_form = self.browser.find_element(
-            *RegisterPageLocators.REGISTER_LAST_NAME
-        )
+        last_name_form = self.find(*RegisterPageLocators.REGISTER_LAST_NAME)
         last_name_form.send_keys(last_name)
 
-        email_form = self.browser.find_element(*RegisterPageLocators.REGISTER_EMAIL)
+        email_form = self.find(*RegisterPageLocators.REGISTER_EMAIL)
         email_form.send_keys(email)
 
-        password_form = self.browser.find_element(
-            *RegisterPageLocators.REGISTER_PASSWORD
-        )
+        password_form = self.find(*RegisterPageLocators.REGISTER_PASSWORD)
         password_form.send_keys(password)
 
-        register_button = self.browser.find_element(
-            *RegisterPageLocators.REGISTER_BUTTON
-        )
+        register_button = self.find(*RegisterPageLocators.REGISTER_BUTTON)
         register_button.click()
 
     def should_be_validation_error(self):
@@ -58,5 +53,5 @@ class RegisterPage(BasePage):
     def cancel_from_register_page(self):
         logger.info("Cancel from register page")
 
-        cancel_button = self.browser.find_element(*RegisterPageLocators.CANCEL_BUTTON)
+        cancel_button = self.find(*RegisterPageLocators.CANCEL_BUTTON)
         cancel_button.click()
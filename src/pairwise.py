@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+
+from src.contact_data import CONTACT_FIELDS, ContactRecord, fake_contact_info
+from src.fuzzing import CONTACT_SPECS
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+Generator = Callable[["Faker"], str]
+
+# Every step up multiplies the cases, 3-way contact cases are already ~180.
+MAX_STRENGTH = 3
+
+
+def _up_to(spec_field: str, value: Callable[[Faker], str]) -> Generator:
+    length = CONTACT_SPECS[spec_field].max_length
+
+    def generate(fake: Faker) -> str:
+        text = value(fake)[: length - 1].rstrip()
+        return text + fake.lexify("?" * (length - len(text)))
+
+    return generate
+
+
+def _unicode(*samples: str) -> Generator:
+    return lambda fake: fake.random_element(samples)
+
+
+def _text_classes(name: str, typical: Generator) -> dict[str, Generator]:
+    return {
+        "typical": typical,
+        "empty": lambda fake: "",
+        "max_length": _up_to(name, typical),
+        "unicode": _unicode("Zürich", "Łódź", "São Paulo", "Ærøskøbing"),
+    }
+
+
+def _name_classes(name: str, typical: Generator) -> dict[str, Generator]:
+    return {
+        "typical": typical,
+        "single_letter": lambda fake: fake.random_uppercase_letter(),
+        "max_length": _up_to(name, typical),
+        "unicode": _unicode("Zoë", "Łukasz", "Søren", "José"),
+        "hyphenated": lambda fake: f"{typical(fake)}-{typical(fake)}"[:20],
+    }
+
+
+# Valid equivalence classes of every contact field. The second street line
+# keeps the run tag, the garbage collector relies on it.
+CONTACT_CLASSES: dict[str, dict[str, Generator]] = {
+    "first_name": _name_classes("first_name", lambda fake: fake.first_name()),
+    "last_name": _name_classes("last_name", lambda fake: fake.last_name()),
+    "date_of_birth": {
+        "typical": lambda fake: fake.date_of_birth(maximum_age=80).isoformat(),
+        "empty": lambda fake: "",
+        "leap_day": lambda fake: "2000-02-29",
+        "oldest": lambda fake: "1900-01-01",
+    },
+    "email": {
+        "typical": lambda fake: fake.email(),
+        "empty": lambda fake: "",
+        "plus_tag": lambda fake: fake.email().replace("@", "+its@"),
+        "upper_case": lambda fake: fake.email().upper(),
+    },
+    "phone": {
+        "typical": lambda fake: fake.msisdn()[:10],
+        "empty": lambda fake: "",
+        "max_length": lambda fake: fake.numerify("#" * 15),
+    },
+    "street_address_1": _text_classes(
+        "street_address_1", lambda fake: fake.street_address()
+    ),
+    "city": _text_classes("city", lambda fake: fake.city()),
+    "state": _text_classes("state", lambda fake: fake.state()),
+    "postal_code": {
+        "typical": lambda fake: fake.numerify("#####"),
+        "empty": lambda fake: "",
+        "zip_plus_4": lambda fake: fake.numerify("#####-####"),
+        "alphanumeric": lambda fake: fake.bothify("??# #??").upper(),
+    },
+    "country": _text_classes("country", lambda fake: fake.country()[:40]),
+}
+
+
+@dataclass
+class CoveringArray:
+    parameters: dict[str, tuple[str, ...]]
+    strength: int
+    rows: list[dict[str, str]] = field(default_factory=list)
+
+    @property
+    def full_product(self) -> int:
+        return math.prod(len(values) for values in self.parameters.values())
+
+    @property
+    def tuples(self) -> int:
+        return sum(
+            math.prod(len(self.parameters[name]) for name in names)
+            for names in itertools.combinations(self.parameters, self.strength)
+        )
+
+    def missing(self) -> set[tuple[tuple[str, str], ...]]:
+        required = _all_tuples(self.parameters, self.strength)
+        for row in self.rows:
+            required -= set(_row_tuples(row, self.strength))
+        return required
+
+    def summary(self) -> str:
+        classes = sum(len(values) for values in self.parameters.values())
+        return (
+            f"{len(self.rows)} cases cover all {self.tuples} {self.strength}-way "
+            f"combinations of {classes} classes in {len(self.parameters)} fields, "
+            f"the full product has {self.full_product:,} cases "
+            f"({self.full_product / max(len(self.rows), 1):,.0f}x more)"
+        )
+
+
+def _all_tuples(
+    parameters: dict[str, tuple[str, ...]], strength: int
+) -> set[tuple[tuple[str, str], ...]]:
+    return {
+        tuple(zip(names, values))
+        for names in itertools.combinations(parameters, strength)
+        for values in itertools.product(*(parameters[name] for name in names))
+    }
+
+
+def _row_tuples(row: dict[str, str], strength: int):
+    # Rows keep the parameter order, so the tuples match _all_tuples.
+    for names in itertools.combinations(row, strength):
+        yield tuple((name, row[name]) for name in names)
+
+
+def covering_array(
+    parameters: dict[str, tuple[str, ...]],
+    strength: int = 2,
+    seed: int = 0,
+    candidates: int = 20,
+) -> CoveringArray:
+    highest = min(len(parameters), MAX_STRENGTH)
+    if not 1 <= strength <= highest:
+        raise ValueError(f"Strength should be between 1 and {highest}.")
+
+    rng = random.Random(seed)
+    names = list(parameters)
+    # A dict keeps the insertion order, so the result does not depend on hashing.
+    uncovered = dict.fromkeys(
+        sorted(_all_tuples(parameters, strength), key=lambda item: str(item))
+    )
+    result = CoveringArray(dict(parameters), strength)
+
+    def gain(row: dict[str, str], name: str, value: str) -> int:
+        assigned = [other for other in names if other in row]
+        count = 0
+        for others in itertools.combinations(assigned, strength - 1):
+            members = sorted(
+                [*((other, row[other]) for other in others), (name, value)],
+                key=lambda member: names.index(member[0]),
+            )
+            count += tuple(members) in uncovered
+        return count
+
+    def candidate() -> dict[str, str]:
+        row = dict(next(iter(uncovered)))
+        rest = [name for name in names if name not in row]
+        rng.shuffle(rest)
+        for name in rest:
+            gains = {value: gain(row, name, value) for value in parameters[name]}
+            best = max(gains.values())
+            row[name] = rng.choice(
+                [value for value, score in gains.items() if score == best]
+            )
+        return {name: row[name] for name in names}
+
+    # Greedy like AETG: of several candidate rows keep the one that covers the
+    # most combinations which no earlier row covers.
+    while uncovered:
+        best, covered = {}, []
+        for _ in range(candidates):
+            row = candidate()
+            new = [item for item in _row_tuples(row, strength) if item in uncovered]
+            if len(new) > len(covered):
+                best, covered = row, new
+
+        for item in covered:
+            del uncovered[item]
+        result.rows.append(best)
+
+    return result
+
+
+def contact_cases(strength: int = 2, seed: int = 0) -> CoveringArray:
+    return covering_array(
+        {name: tuple(classes) for name, classes in CONTACT_CLASSES.items()},
+        strength,
+        seed,
+    )
+
+
+def contact_record(classes: dict[str, str], fake: Faker | None = None) -> ContactRecord:
+    if fake is None:
+        from faker import Faker
+
+        fake = Faker()
+
+    record = fake_contact_info(fake)
+    return record.replace(
+        **{name: CONTACT_CLASSES[name][value](fake) for name, value in classes.items()}
+    )
+
+
+def case_id(classes: dict[str, str]) -> str:
+    unusual = [
+        f"{name}={value}" for name, value in classes.items() if value != "typical"
+    ]
+    return ",".join(unusual) or "typical"
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Print the contact cases that cover every n-wise class combination."
+    )
+    parser.add_argument(
+        "--strength", type=int, default=2, choices=range(1, MAX_STRENGTH + 1)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--records", action="store_true", help="Print sample records")
+    args = parser.parse_args(argv)
+
+    cases = contact_cases(args.strength, args.seed)
+    width = max(len(name) for name in CONTACT_FIELDS)
+    for number, classes in enumerate(cases.rows, 1):
+        print(f"case {number}: {case_id(classes)}")
+        if args.records:
+            for name, value in contact_record(classes).items():
+                print(f"   {name:<{width}} {value!r}")
+    print(cases.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import statistics
+from dataclasses import asdict, dataclass, fields
+
+COLLECT_METRICS_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + 10000;
+
+function build(lcp) {
+    const nav = performance.getEntriesByType("navigation")[0] || {};
+    const fcp = performance
+        .getEntriesByType("paint")
+        .find((entry) => entry.name === "first-contentful-paint");
+    const resources = performance.getEntriesByType("resource");
+    return {
+        url: location.href,
+        ttfb: nav.responseStart ?? null,
+        dom_content_loaded: nav.domContentLoadedEventEnd ?? null,
+        load: nav.loadEventEnd ?? null,
+        fcp: fcp ? fcp.startTime : null,
+        lcp: lcp,
+        resource_count: resources.length,
+        transfer_size: resources.reduce(
+            (total, entry) => total + (entry.transferSize || 0),
+            nav.transferSize || 0
+        ),
+    };
+}
+
+function collect() {
+    const nav = performance.getEntriesByType("navigation")[0];
+    if ((!nav || !nav.loadEventEnd) && Date.now() < deadline) {
+        setTimeout(collect, 50);
+        return;
+    }
+    let lcp = null;
+    try {
+        const observer = new PerformanceObserver((list) => {
+            const entries = list.getEntries();
+            if (entries.length) lcp = entries[entries.length - 1].startTime;
+        });
+        observer.observe({ type: "largest-contentful-paint", buffered: true });
+        setTimeout(() => {
+            observer.disconnect();
+            done(build(lcp));
+        }, 0);
+    } catch (error) {
+        done(build(null));
+    }
+}
+
+collect();
+"""
+
+
+@dataclass(frozen=True)
+class PageBudget:
+    ttfb: float | None = 1500
+    dom_content_loaded: float | None = 3000
+    load: float | None = 5000
+    fcp: float | None = 3000
+    lcp: float | None = 4000
+    resource_count: int | None = 50
+    transfer_size: int | None = 2_000_000
+
+
+@dataclass
+class PageMetrics:
+    page: str
+    url: str
+    ttfb: float | None
+    dom_content_loaded: float | None
+    load: float | None
+    fcp: float | None
+    lcp: float | None
+    resource_count: int
+    transfer_size: int
+
+    def over_budget(self, budget: PageBudget) -> list[str]:
+        violations = []
+
+        for field in fields(budget):
+            limit = getattr(budget, field.name)
+            value = getattr(self, field.name)
+            if limit is not None and value is not None and value > limit:
+                violations.append(f"{field.name} {value:.0f} > {limit}")
+
+        return violations
+
+
+METRIC_NAMES = [field.name for field in fields(PageBudget)]
+
+
+class PerformanceRecorder:
+    def __init__(self):
+        self.metrics: dict[str, list[PageMetrics]] = {}
+
+    def collect(self, browser, page: str) -> PageMetrics:
+        data = browser.execute_async_script(COLLECT_METRICS_SCRIPT)
+        metrics = PageMetrics(page=page, **data)
+        self.metrics.setdefault(page, []).append(metrics)
+        return metrics
+
+    def summary(self) -> dict[str, dict[str, float | None]]:
+        summary = {}
+
+        for page, samples in sorted(self.metrics.items()):
+            summary[page] = {"samples": len(samples)}
+            for name in METRIC_NAMES:
+                values = [
+                    getattr(sample, name)
+                    for sample in samples
+                    if getattr(sample, name) is not None
+                ]
+                summary[page][name] = statistics.median(values) if values else None
+
+        return summary
+
+    def dump(self, path: str):
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "summary": self.summary(),
+                    "samples": {
+                        page: [asdict(sample) for sample in samples]
+                        for page, samples in self.metrics.items()
+                    },
+                },
+                file,
+                indent=2,
+            )
@@ -0,0 +1,322 @@
+import argparse
+import html
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_DB = os.path.join(ROOT, "tests", "reports", "history.sqlite")
+DASHBOARD = os.path.join(ROOT, "tests", "reports", "dashboard.html")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    revision TEXT,
+    environment TEXT,
+    browser TEXT,
+    duration REAL,
+    passed INTEGER,
+    failed INTEGER,
+    skipped INTEGER
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    test TEXT NOT NULL,
+    step TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fixtures (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    test TEXT NOT NULL,
+    fixture TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS steps_test ON steps (test, step);
+CREATE INDEX IF NOT EXISTS fixtures_fixture ON fixtures (fixture, phase);
+"""
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def connect(path: str = HISTORY_DB) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class HistoryRecorder:
+    def __init__(self, path: str, environment: str | None, browser: str | None):
+        self.path = path
+        self.environment = environment
+        self.browser = browser
+        self.started = datetime.now(timezone.utc)
+        self.steps: list[tuple[str, str, str, float]] = []
+        self.fixtures: list[tuple[str, str, str, float]] = []
+        self._teardowns: dict[int, float] = {}
+        self._clock = time.perf_counter()
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        started = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            self.fixtures.append(
+                (
+                    request.node.nodeid,
+                    fixturedef.argname,
+                    "setup",
+                    time.perf_counter() - started,
+                )
+            )
+            # Runs first on teardown, right before the fixture's own finalizer.
+            fixturedef.addfinalizer(
+                lambda: self._teardowns.__setitem__(id(fixturedef), time.perf_counter())
+            )
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        started = self._teardowns.pop(id(fixturedef), None)
+        if started is not None:
+            self.fixtures.append(
+                (
+                    request.node.nodeid,
+                    fixturedef.argname,
+                    "teardown",
+                    time.perf_counter() - started,
+                )
+            )
+
+    def pytest_runtest_logreport(self, report):
+        self.steps.append((report.nodeid, report.when, report.outcome, report.duration))
+
+    def save(self) -> int:
+        outcomes = [outcome for _, step, outcome, _ in self.steps if step == "call"]
+
+        with connect(self.path) as connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (started, revision, environment, browser, duration, "
+                "passed, failed, skipped) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.started.isoformat(timespec="seconds"),
+                    git_revision(),
+                    self.environment,
+                    self.browser,
+                    time.perf_counter() - self._clock,
+                    outcomes.count("passed"),
+                    sum(1 for _, _, outcome, _ in self.steps if outcome == "failed"),
+                    sum(1 for _, _, outcome, _ in self.steps if outcome == "skipped"),
+                ),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO steps VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *step) for step in self.steps],
+            )
+            connection.executemany(
+                "INSERT INTO fixtures VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *fixture) for fixture in self.fixtures],
+            )
+        connection.close()
+
+        return run_id
+
+
+@dataclass
+class Trend:
+    name: str
+    runs: int
+    first: float
+    last: float
+    slope: float
+    series: list[float]
+
+    @property
+    def growth(self) -> float:
+        return self.last / self.first if self.first else float("inf")
+
+    @property
+    def regressed(self) -> bool:
+        return self.growth >= 1.3 and self.last - self.first >= 1.0
+
+
+def slope(values: list[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+
+    mean_x = (len(values) - 1) / 2
+    mean_y = statistics.fmean(values)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    denominator = sum((x - mean_x) ** 2 for x in range(len(values)))
+    return numerator / denominator
+
+
+def trends(series: dict[str, list[float]], window: int = 5) -> list[Trend]:
+    found = []
+
+    for name, values in series.items():
+        if len(values) < 2:
+            continue
+        head = values[: min(window, len(values) // 2 or 1)]
+        tail = values[-min(window, len(values) // 2 or 1) :]
+        found.append(
+            Trend(
+                name=name,
+                runs=len(values),
+                first=statistics.median(head),
+                last=statistics.median(tail),
+                slope=slope(values),
+                series=values,
+            )
+        )
+
+    return sorted(found, key=lambda trend: trend.slope, reverse=True)
+
+
+def load_series(
+    connection: sqlite3.Connection,
+    last: int = 30,
+    environment: str | None = None,
+    browser: str | None = None,
+) -> tuple[dict[str, list[float]], dict[str, list[float]]]:
+    filters = []
+    params: list = []
+    for column, value in (("environment", environment), ("browser", browser)):
+        if value:
+            filters.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+    run_ids = [
+        row[0]
+        for row in connection.execute(
+            f"SELECT id FROM runs {where} ORDER BY id DESC LIMIT ?", [*params, last]
+        )
+    ][::-1]
+    if not run_ids:
+        return {}, {}
+
+    marks = ", ".join("?" * len(run_ids))
+    tests: dict[str, list[float]] = {}
+    for test, duration in connection.execute(
+        f"SELECT test, SUM(duration) FROM steps WHERE run_id IN ({marks}) "
+        "GROUP BY run_id, test ORDER BY run_id",
+        run_ids,
+    ):
+        tests.setdefault(test, []).append(duration)
+
+    fixtures: dict[str, list[float]] = {}
+    for fixture, duration in connection.execute(
+        "SELECT fixture || ' (' || phase || ')', AVG(duration) FROM fixtures "
+        f"WHERE run_id IN ({marks}) GROUP BY run_id, fixture, phase ORDER BY run_id",
+        run_ids,
+    ):
+        fixtures.setdefault(fixture, []).append(duration)
+
+    return tests, fixtures
+
+
+def sparkline(values: list[float], width: int = 160, height: int = 28) -> str:
+    top = max(values) or 1.0
+    step = width / max(len(values) - 1, 1)
+    points = " ".join(
+        f"{index * step:.1f},{height - value / top * (height - 2) - 1:.1f}"
+        for index, value in enumerate(values)
+    )
+    return (
+        f'<svg width="{width}" height="{height}"><polyline points="{points}" '
+        'fill="none" stroke="#c0392b" stroke-width="1.5"/></svg>'
+    )
+
+
+def table(title: str, found: list[Trend], limit: int) -> str:
+    rows = "".join(
+        f"<tr class=\"{'regressed' if trend.regressed else ''}\">"
+        f"<td>{html.escape(trend.name)}</td><td>{trend.runs}</td>"
+        f"<td>{trend.first:.2f}</td><td>{trend.last:.2f}</td>"
+        f"<td>{trend.growth:.2f}x</td><td>{trend.slope:+.3f}</td>"
+        f"<td>{sparkline(trend.series)}</td></tr>"
+        for trend in found[:limit]
+    )
+    return (
+        f"<h2>{html.escape(title)}</h2><table><tr><th>name</th><th>runs</th>"
+        "<th>first s</th><th>last s</th><th>growth</th><th>s per run</th>"
+        f"<th>trend</th></tr>{rows}</table>"
+    )
+
+
+def render_dashboard(
+    tests: list[Trend], fixtures: list[Trend], path: str, limit: int = 25
+) -> str:
+    with open(path, "w") as file:
+        file.write(
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            "<title>Suite performance trends</title><style>"
+            "body{font-family:sans-serif}td,th{padding:2px 8px;text-align:left}"
+            ".regressed{background:#fdecea}</style></head><body>"
+            f"<h1>Suite performance trends</h1>"
+            f"<p>Generated {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC</p>"
+            + table("Slowest-growing tests", tests, limit)
+            + table("Slowest-growing fixtures", fixtures, limit)
+            + "</body></html>"
+        )
+    return path
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Show duration trends and regressions from the run history."
+    )
+    parser.add_argument("--db", default=HISTORY_DB)
+    parser.add_argument("--last", type=int, default=30, help="Runs to analyse")
+    parser.add_argument("--env", default=None)
+    parser.add_argument("--browser_name", default=None)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--html", default=DASHBOARD)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist, run the suite first.")
+
+    connection = connect(args.db)
+    test_series, fixture_series = load_series(
+        connection, args.last, args.env, args.browser_name
+    )
+    connection.close()
+
+    test_trends = trends(test_series)
+    fixture_trends = trends(fixture_series)
+
+    for title, found in (("tests", test_trends), ("fixtures", fixture_trends)):
+        print(f"Slowest-growing {title}:")
+        for trend in found[: args.limit]:
+            flag = "  REGRESSED" if trend.regressed else ""
+            print(
+                f"   {trend.name:<70} {trend.first:>7.2f}s -> {trend.last:>7.2f}s "
+                f"({trend.slope:+.3f}s/run){flag}"
+            )
+
+    print(f"Dashboard: {render_dashboard(test_trends, fixture_trends, args.html)}")
+
+
+if __name__ == "__main__":
+    main()
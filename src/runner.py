@@ -0,0 +1,368 @@
+import argparse
+import glob
+import html
+import json
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from src.browser_factory import BROWSER_NAMES
+from src.contact_data import RUN_ID
+from src.host_config import HOSTS, get_environment
+from src.stream_report import merge
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(ROOT, "tests", "reports")
+
+
+@dataclass
+class Job:
+    section: str
+    number: int
+    paths: list[str]
+    pytest_args: list[str] = field(default_factory=list)
+    env: dict[str, str] = field(default_factory=dict)
+    reports_dir: str = REPORTS_DIR
+
+    @property
+    def name(self) -> str:
+        return f"{self.section}/{self.number}"
+
+    @property
+    def run_id(self) -> str:
+        # Every job tags its own contacts, so --rm in one job keeps the others.
+        return f"{RUN_ID}-{self.section}-{self.number}"
+
+    def report_path(self, extension: str) -> str:
+        return os.path.join(
+            self.reports_dir, self.section, f"worker-{self.number}.{extension}"
+        )
+
+
+@dataclass
+class JobResult:
+    job: Job
+    returncode: int
+    duration: float
+    tests: int = 0
+    failures: int = 0
+    errors: int = 0
+    skipped: int = 0
+
+
+def find_test_files(paths: list[str]) -> list[str]:
+    files = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                sorted(glob.glob(os.path.join(path, "**", "test_*.py"), recursive=True))
+            )
+        else:
+            files.append(path)
+
+    return files
+
+
+def shard(files: list[str], workers: int) -> list[list[str]]:
+    shards = [files[number::workers] for number in range(max(workers, 1))]
+    return [paths for paths in shards if paths]
+
+
+def read_junit(path: str) -> dict[str, int]:
+    counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+
+    if not os.path.exists(path):
+        return counts
+
+    root = ET.parse(path).getroot()
+    suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+    for suite in suites:
+        for name in counts:
+            counts[name] += int(suite.get(name, 0))
+
+    return counts
+
+
+def read_junit_cases(path: str) -> dict[str, tuple[str, float]]:
+    cases = {}
+
+    if not os.path.exists(path):
+        return cases
+
+    for case in ET.parse(path).getroot().iter("testcase"):
+        outcome = "passed"
+        for child in case:
+            if child.tag in ("failure", "error"):
+                outcome = "failed"
+            elif child.tag == "skipped":
+                outcome = "skipped"
+
+        name = f"{case.get('classname')}::{case.get('name')}"
+        cases[name] = (outcome, float(case.get("time", 0)))
+
+    return cases
+
+
+def run_job(job: Job) -> JobResult:
+    os.makedirs(os.path.dirname(job.report_path("log")), exist_ok=True)
+    # Reports of an earlier run must not pass for this one.
+    for extension in ("jsonl", "xml"):
+        if os.path.exists(job.report_path(extension)):
+            os.remove(job.report_path(extension))
+
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        *job.paths,
+        *job.pytest_args,
+        f"--junitxml={job.report_path('xml')}",
+        f"--stream_report={job.report_path('jsonl')}",
+        f"--events_file={job.report_path('events.jsonl')}",
+    ]
+
+    started = time.perf_counter()
+    with open(job.report_path("log"), "w") as log:
+        process = subprocess.run(
+            command,
+            cwd=ROOT,
+            env={**os.environ, **job.env, "ITS_RUN_ID": job.run_id},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+    duration = time.perf_counter() - started
+    if not os.path.exists(job.report_path("xml")):
+        # Pytest died before writing JUnit, see the log.
+        return JobResult(job, process.returncode or 1, duration, errors=1)
+
+    return JobResult(
+        job=job,
+        returncode=process.returncode,
+        duration=duration,
+        **read_junit(job.report_path("xml")),
+    )
+
+
+def run_jobs(jobs: list[Job]) -> list[JobResult]:
+    with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as executor:
+        return list(executor.map(run_job, jobs))
+
+
+def summarize(results: list[JobResult], elapsed: float) -> str:
+    lines = []
+    sections: dict[str, list[JobResult]] = {}
+    for result in results:
+        sections.setdefault(result.job.section, []).append(result)
+
+    for section, section_results in sections.items():
+        tests = sum(result.tests for result in section_results)
+        failed = sum(result.failures + result.errors for result in section_results)
+        skipped = sum(result.skipped for result in section_results)
+        duration = max(result.duration for result in section_results)
+
+        lines.append(
+            f"== {section}: {len(section_results)} workers, {duration:.1f}s =="
+        )
+        lines.append(
+            f"   passed {tests - failed - skipped}, failed {failed}, skipped {skipped}"
+        )
+        for result in section_results:
+            lines.append(
+                f"   {result.job.name:<16} exit {result.returncode} "
+                f"{result.duration:>7.1f}s  {result.job.report_path('jsonl')}"
+            )
+
+    lines.append(f"Total wall time: {elapsed:.1f}s")
+    return "\n".join(lines)
+
+
+def side_by_side(results: list[JobResult]) -> dict[str, dict[str, tuple]]:
+    sections = list(dict.fromkeys(result.job.section for result in results))
+    tests: dict[str, dict[str, tuple]] = {}
+
+    for result in results:
+        for name, case in read_junit_cases(result.job.report_path("xml")).items():
+            tests.setdefault(name, dict.fromkeys(sections))[result.job.section] = case
+
+    return tests
+
+
+def matrix_lines(results: list[JobResult]) -> list[str]:
+    sections = list(dict.fromkeys(result.job.section for result in results))
+    tests = side_by_side(results)
+    width = max((len(name) for name in tests), default=4) + 2
+
+    lines = [f"{'test':<{width}}" + "".join(f"{name:>18}" for name in sections)]
+    for name, cases in sorted(tests.items()):
+        cells = []
+        for section in sections:
+            outcome, duration = cases[section] or ("-", 0.0)
+            cells.append(f"{outcome[:6]:>10}{duration:>7.1f}s")
+        lines.append(f"{name:<{width}}" + "".join(cells))
+
+    return lines
+
+
+def write_matrix(results: list[JobResult], reports_dir: str) -> str:
+    sections = list(dict.fromkeys(result.job.section for result in results))
+    tests = side_by_side(results)
+
+    with open(os.path.join(reports_dir, "matrix.json"), "w") as file:
+        json.dump(tests, file, indent=1)
+
+    rows = []
+    for name, cases in sorted(tests.items()):
+        cells = "".join(
+            f'<td class="{(cases[section] or ("missing",))[0]}">'
+            + (
+                f"{cases[section][0]} {cases[section][1]:.1f}s"
+                if cases[section]
+                else "-"
+            )
+            + "</td>"
+            for section in sections
+        )
+        rows.append(f"<tr><td>{html.escape(name)}</td>{cells}</tr>")
+
+    path = os.path.join(reports_dir, "matrix.html")
+    with open(path, "w") as file:
+        file.write(
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Matrix</title>"
+            "<style>td{padding:2px 8px}.passed{color:green}.failed{color:red}"
+            ".skipped{color:gray}</style></head><body><table><tr><th>test</th>"
+            + "".join(f"<th>{html.escape(section)}</th>" for section in sections)
+            + "</tr>"
+            + "".join(rows)
+            + "</table></body></html>"
+        )
+
+    return path
+
+
+def browser_jobs(
+    browser_names: list[str],
+    pytest_args: list[str],
+    reports_dir: str = REPORTS_DIR,
+    env: dict[str, str] | None = None,
+) -> list[Job]:
+    return [
+        Job(
+            section=browser_name,
+            number=0,
+            paths=[],
+            pytest_args=[*pytest_args, f"--browser_name={browser_name}"],
+            env=dict(env or {}),
+            reports_dir=reports_dir,
+        )
+        for browser_name in browser_names
+    ]
+
+
+def merge_reports(results: list[JobResult], reports_dir: str) -> str:
+    paths = [
+        result.job.report_path("jsonl")
+        for result in results
+        if os.path.exists(result.job.report_path("jsonl"))
+    ]
+    return merge(paths, os.path.join(reports_dir, "report.html"))
+
+
+def run_matrix(jobs: list[Job], reports_dir: str) -> int:
+    started = time.perf_counter()
+    results = run_jobs(jobs)
+
+    print(summarize(results, time.perf_counter() - started))
+    print("\n".join(matrix_lines(results)))
+    print(f"Merged report: {write_matrix(results, reports_dir)}")
+    print(f"Test report: {merge_reports(results, reports_dir)}")
+
+    return max((result.returncode for result in results), default=0)
+
+
+def without_option(args: list[str], option: str) -> list[str]:
+    kept = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg == option:
+            skip = True
+        elif not arg.startswith(option + "="):
+            kept.append(arg)
+    return kept
+
+
+def split_names(value: str) -> list[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Run the suite against several environments at once. "
+        "Unknown arguments are passed to pytest."
+    )
+    parser.add_argument(
+        "--envs",
+        default="test",
+        help=f"Comma separated environments from {list(HOSTS)}",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Parallel pytest processes per env"
+    )
+    parser.add_argument(
+        "--browsers",
+        default=None,
+        help=f"Comma separated browsers from {list(BROWSER_NAMES)}. "
+        "Each environment runs once per browser",
+    )
+    parser.add_argument("--reports", default=REPORTS_DIR)
+    parser.add_argument("--paths", nargs="*", default=["tests"])
+    args, pytest_args = parser.parse_known_args(argv)
+
+    env_names = split_names(args.envs)
+    for env_name in env_names:
+        try:
+            get_environment(env_name)
+        except (KeyError, ValueError) as error:
+            parser.error(str(error))
+
+    browser_names = split_names(args.browsers) if args.browsers else [None]
+    for browser_name in browser_names:
+        if browser_name and browser_name not in BROWSER_NAMES:
+            parser.error(f"Unknown browser {browser_name!r}.")
+
+    files = find_test_files(args.paths)
+    jobs = [
+        Job(
+            section=f"{env_name}-{browser_name}" if browser_name else env_name,
+            number=number,
+            paths=paths,
+            pytest_args=pytest_args
+            + ([f"--browser_name={browser_name}"] if browser_name else []),
+            env={"ENV": env_name},
+            reports_dir=args.reports,
+        )
+        for env_name in env_names
+        for browser_name in browser_names
+        for number, paths in enumerate(shard(files, args.workers))
+    ]
+
+    if args.browsers:
+        sys.exit(run_matrix(jobs, args.reports))
+
+    started = time.perf_counter()
+    results = run_jobs(jobs)
+    print(summarize(results, time.perf_counter() - started))
+    print(f"Test report: {merge_reports(results, args.reports)}")
+
+    sys.exit(max((result.returncode for result in results), default=0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+import argparse
+import json
+import logging as logger
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+from src.host_config import HOSTS, get_credentials, get_env_name
+from src.load_generator import UI_JOURNEYS, Journey, LoadConfig, percentile, ui_login
+from src.run_history import slope
+
+PROC = "/proc"
+MB = 1024 * 1024
+
+
+@dataclass
+class TreeSample:
+    processes: int
+    rss: int
+    cpu_seconds: float
+    taken: float = field(default_factory=time.monotonic)
+
+    def cpu_percent(self, earlier: "TreeSample") -> float:
+        elapsed = self.taken - earlier.taken
+        if elapsed <= 0:
+            return 0.0
+        return (self.cpu_seconds - earlier.cpu_seconds) / elapsed * 100
+
+
+def _read_stat(proc: str, pid: int) -> tuple[int, float] | None:
+    try:
+        with open(os.path.join(proc, str(pid), "stat")) as file:
+            stat = file.read()
+    except OSError:
+        return None
+
+    # The command name may contain spaces, the fields start after its ")".
+    fields = stat[stat.rindex(")") + 2 :].split()
+    return int(fields[1]), (int(fields[11]) + int(fields[12])) / os.sysconf(
+        "SC_CLK_TCK"
+    )
+
+
+def process_tree(root: int, proc: str = PROC) -> list[int]:
+    children: dict[int, list[int]] = {}
+    for name in os.listdir(proc):
+        if name.isdigit():
+            stat = _read_stat(proc, int(name))
+            if stat:
+                children.setdefault(stat[0], []).append(int(name))
+
+    tree = [root]
+    for pid in tree:
+        tree.extend(children.get(pid, ()))
+    return tree
+
+
+def sample_tree(root: int, proc: str = PROC) -> TreeSample:
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    sample = TreeSample(0, 0, 0.0)
+
+    for pid in process_tree(root, proc):
+        stat = _read_stat(proc, pid)
+        try:
+            with open(os.path.join(proc, str(pid), "statm")) as file:
+                resident = int(file.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if stat:
+            sample.processes += 1
+            sample.rss += resident * page_size
+            sample.cpu_seconds += stat[1]
+
+    return sample
+
+
+def sample_browser(browser) -> TreeSample:
+    # The driver starts the browser, so its tree holds every browser process.
+    return sample_tree(browser.service.process.pid)
+
+
+@dataclass
+class SoakConfig:
+    duration: float = 3600
+    max_rss_mb: float = 2048
+    max_cpu_percent: float = 0
+    max_journeys: int = 0
+    runs: int = 0
+    retry_delay: float = 5
+    max_retry_delay: float = 300
+
+
+@dataclass
+class JourneyRun:
+    journey: str
+    session: int
+    started: float
+    duration: float
+    rss_before: int
+    rss_after: int
+    cpu_percent: float
+    error: bool = False
+
+    @property
+    def growth_mb(self) -> float:
+        return (self.rss_after - self.rss_before) / MB
+
+
+@dataclass
+class SoakReport:
+    runs: list[JourneyRun] = field(default_factory=list)
+    recycles: list[tuple[int, str]] = field(default_factory=list)
+    session_failures: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def journey_growth(self) -> dict[str, dict[str, float]]:
+        growth: dict[str, list[float]] = {}
+        for run in self.runs:
+            growth.setdefault(run.journey, []).append(run.growth_mb)
+
+        return {
+            journey: {
+                "runs": len(values),
+                "median_mb": statistics.median(values),
+                "p95_mb": percentile(sorted(values), 95),
+                "total_mb": sum(values),
+            }
+            for journey, values in sorted(growth.items())
+        }
+
+    def session_slopes(self) -> dict[int, float]:
+        series: dict[int, list[float]] = {}
+        for run in self.runs:
+            series.setdefault(run.session, []).append(run.rss_after / MB)
+        return {session: slope(values) for session, values in series.items()}
+
+    def summary(self) -> list[str]:
+        sessions = self.session_slopes()
+        peak = max((run.rss_after for run in self.runs), default=0) / MB
+        lines = [
+            f"{len(self.runs)} journeys in {self.elapsed / 3600:.2f}h on "
+            f"{len(sessions)} browser sessions, peak RSS {peak:.0f} MB, "
+            f"{len(self.recycles)} recycled, "
+            f"{len(self.session_failures)} failed to start",
+            f"{'journey':<28}{'runs':>6}{'errors':>8}{'median MB':>11}"
+            f"{'p95 MB':>9}{'total MB':>10}",
+        ]
+        errors: dict[str, int] = {}
+        for run in self.runs:
+            errors[run.journey] = errors.get(run.journey, 0) + run.error
+
+        for journey, growth in self.journey_growth().items():
+            lines.append(
+                f"{journey:<28}{growth['runs']:>6}{errors[journey]:>8}"
+                f"{growth['median_mb']:>11.1f}{growth['p95_mb']:>9.1f}"
+                f"{growth['total_mb']:>10.1f}"
+            )
+
+        for session, growth in sessions.items():
+            lines.append(f"   session {session}: {growth:+.2f} MB per journey")
+        for session, reason in self.recycles:
+            lines.append(f"   session {session} recycled: {reason}")
+        for failure in sorted(set(self.session_failures)):
+            count = self.session_failures.count(failure)
+            lines.append(f"   session start failed {count} times: {failure}")
+        return lines
+
+    def dump(self, path: str):
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "runs": [asdict(run) for run in self.runs],
+                    "recycles": self.recycles,
+                    "session_failures": self.session_failures,
+                    "journeys": self.journey_growth(),
+                    "sessions": self.session_slopes(),
+                },
+                file,
+                indent=1,
+            )
+
+
+def recycle_reason(
+    config: SoakConfig, journeys: int, sample: TreeSample, cpu_percent: float
+) -> str | None:
+    if config.max_rss_mb and sample.rss / MB > config.max_rss_mb:
+        return f"RSS {sample.rss / MB:.0f} MB over {config.max_rss_mb:.0f} MB"
+    if config.max_cpu_percent and cpu_percent > config.max_cpu_percent:
+        return f"CPU {cpu_percent:.0f}% over {config.max_cpu_percent:.0f}%"
+    if config.max_journeys and journeys >= config.max_journeys:
+        return f"reached {config.max_journeys} journeys"
+    return None
+
+
+def run_soak(
+    config: SoakConfig,
+    journeys: list[Journey],
+    start_session: Callable[[], object],
+    run_journey: Callable[[Journey, object], None],
+    sampler: Callable[[object], TreeSample] = sample_browser,
+) -> SoakReport:
+    report = SoakReport()
+    started = time.monotonic()
+    session = 0
+    browser = None
+    count = 0
+    retry_delay = config.retry_delay
+
+    try:
+        while time.monotonic() - started < config.duration and not (
+            config.runs and len(report.runs) >= config.runs
+        ):
+            if browser is None:
+                try:
+                    browser = start_session()
+                except Exception as exception:
+                    # A failed login must not end an hours-long soak and its
+                    # report, wait and try a new session.
+                    logger.warning("Could not start a browser session: %r", exception)
+                    report.session_failures.append(repr(exception))
+                    remaining = config.duration - (time.monotonic() - started)
+                    time.sleep(max(min(retry_delay, remaining), 0))
+                    retry_delay = min(retry_delay * 2, config.max_retry_delay)
+                    continue
+                session += 1
+                count = 0
+                retry_delay = config.retry_delay
+
+            journey = journeys[len(report.runs) % len(journeys)]
+            before = sampler(browser)
+            error = False
+            try:
+                run_journey(journey, browser)
+            except Exception as exception:
+                error = True
+                logger.warning("Journey %s failed: %r", journey.name, exception)
+            after = sampler(browser)
+            count += 1
+
+            cpu_percent = after.cpu_percent(before)
+            report.runs.append(
+                JourneyRun(
+                    journey=journey.name,
+                    session=session,
+                    started=before.taken - started,
+                    duration=after.taken - before.taken,
+                    rss_before=before.rss,
+                    rss_after=after.rss,
+                    cpu_percent=cpu_percent,
+                    error=error,
+                )
+            )
+
+            reason = recycle_reason(config, count, after, cpu_percent)
+            if reason:
+                logger.info("Recycle browser session %d: %s.", session, reason)
+                report.recycles.append((session, reason))
+                browser.quit()
+                browser = None
+    finally:
+        if browser is not None:
+            browser.quit()
+
+    report.elapsed = time.monotonic() - started
+    return report
+
+
+def main(argv: list[str] | None = None):
+    names = [journey.name for journey in UI_JOURNEYS]
+    parser = argparse.ArgumentParser(
+        description="Loop browser journeys for hours and watch browser memory."
+    )
+    parser.add_argument("--env", default=get_env_name(), choices=HOSTS)
+    parser.add_argument("--browser_name", default="firefox")
+    parser.add_argument(
+        "--journeys", default=",".join(names), help=f"Comma separated, of {names}"
+    )
+    parser.add_argument("--hours", type=float, default=1)
+    parser.add_argument(
+        "--max-rss-mb", type=float, default=2048, help="Recycle above this RSS"
+    )
+    parser.add_argument(
+        "--max-cpu",
+        type=float,
+        default=0,
+        help="Recycle when a journey keeps the browser above this CPU %%",
+    )
+    parser.add_argument(
+        "--max-journeys", type=int, default=0, help="Recycle after this many journeys"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=0, help="Stop after this many journeys"
+    )
+    parser.add_argument("--json", default=None, help="Write every sample to this file")
+    args = parser.parse_args(argv)
+
+    selected = {name.strip() for name in args.journeys.split(",")}
+    journeys = [journey for journey in UI_JOURNEYS if journey.name in selected]
+    if not journeys:
+        parser.error(f"No known journeys in {args.journeys!r}.")
+    if not os.path.isdir(PROC):
+        parser.error("Process sampling needs a /proc file system.")
+
+    base_url = HOSTS[args.env]
+    email, password = get_credentials(args.env)
+    if not (base_url and email and password):
+        parser.error(f"Environment {args.env!r} needs a host and credentials.")
+
+    logger.basicConfig(
+        level=logger.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    from src.browser_factory import create_browser
+
+    load_config = LoadConfig(
+        base_url=base_url,
+        email=email,
+        password=password,
+        browser_name=args.browser_name,
+    )
+
+    def start_session():
+        browser = create_browser(args.browser_name)
+        if browser is None:
+            parser.error(f"Browser {args.browser_name} is not configured in .env.")
+        try:
+            ui_login(browser, load_config)
+        except Exception:
+            browser.quit()
+            raise
+        return browser
+
+    report = run_soak(
+        SoakConfig(
+            duration=args.hours * 3600,
+            max_rss_mb=args.max_rss_mb,
+            max_cpu_percent=args.max_cpu,
+            max_journeys=args.max_journeys,
+            runs=args.runs,
+        ),
+        journeys,
+        start_session,
+        lambda journey, browser: journey.run(browser, load_config),
+    )
+
+    print("\n".join(report.summary()))
+    if args.json:
+        report.dump(args.json)
+
+
+if __name__ == "__main__":
+    main()
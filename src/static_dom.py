@@ -0,0 +1,287 @@
+import re
+from html.parser import HTMLParser
+
+import urllib3
+
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+
+CSS_COMPOUND = re.compile(
+    r"(?P<tag>^[a-zA-Z][\w-]*|^\*)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\.(?P<class>[\w-]+)"
+    r"|\[(?P<attr>[\w-]+)(?:=(?P<quote>['\"]?)(?P<value>.*?)(?P=quote))?\]"
+)
+XPATH_STEP = re.compile(r"(?P<tag>[a-zA-Z][\w-]*|\*)(?P<predicates>(?:\[[^\]]*\])*)$")
+XPATH_PREDICATES = (
+    (re.compile(r"^(\d+)$"), "position"),
+    (re.compile(r"^@([\w-]+)\s*=\s*['\"](.*)['\"]$"), "attribute"),
+    (re.compile(r"^@([\w-]+)$"), "has_attribute"),
+    (re.compile(r"^contains\(\s*text\(\)\s*,\s*['\"](.*)['\"]\s*\)$"), "contains_text"),
+    (re.compile(r"^text\(\)\s*=\s*['\"](.*)['\"]$"), "text"),
+    (
+        re.compile(r"^contains\(\s*@([\w-]+)\s*,\s*['\"](.*)['\"]\s*\)$"),
+        "contains_attribute",
+    ),
+)
+
+
+class UnsupportedLocator(ValueError):
+    pass
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent", "texts")
+
+    def __init__(self, tag: str, attrs: dict[str, str], parent: "Node | None" = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: list[Node] = []
+        self.parent = parent
+        self.texts: list[str] = []
+
+    def iter(self):
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    @property
+    def own_text(self) -> str:
+        return "".join(self.texts)
+
+    @property
+    def text(self) -> str:
+        return self.own_text + "".join(child.text for child in self.children)
+
+    @property
+    def classes(self) -> list[str]:
+        return self.attrs.get("class", "").split()
+
+    def __repr__(self):
+        return f"<{self.tag} {self.attrs}>"
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].texts.append(data)
+
+
+def parse(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _compound_matcher(compound: str):
+    checks = []
+    position = 0
+
+    for match in CSS_COMPOUND.finditer(compound):
+        if match.start() != position:
+            break
+        position = match.end()
+
+        if match["tag"] and match["tag"] != "*":
+            checks.append(lambda node, tag=match["tag"].lower(): node.tag == tag)
+        elif match["id"]:
+            checks.append(lambda node, id=match["id"]: node.attrs.get("id") == id)
+        elif match["class"]:
+            checks.append(lambda node, name=match["class"]: name in node.classes)
+        elif match["attr"] and match["value"] is None:
+            checks.append(lambda node, attr=match["attr"]: attr in node.attrs)
+        elif match["attr"]:
+            checks.append(
+                lambda node, attr=match["attr"], value=match["value"]: (
+                    node.attrs.get(attr) == value
+                )
+            )
+
+    if position != len(compound) or not compound:
+        raise UnsupportedLocator(f"Unsupported CSS selector part {compound!r}.")
+
+    return lambda node: all(check(node) for check in checks)
+
+
+def _select_css(root: Node, selector: str) -> list[Node]:
+    found = []
+
+    for group in selector.split(","):
+        tokens = re.sub(r"\s*>\s*", " > ", group.strip()).split()
+        parts = []
+        combinator = " "
+        for token in tokens:
+            if token == ">":
+                combinator = ">"
+                continue
+            parts.append((combinator, _compound_matcher(token)))
+            combinator = " "
+
+        if not parts:
+            raise UnsupportedLocator(f"Empty CSS selector {selector!r}.")
+
+        found.extend(node for node in root.iter() if _matches(node, parts))
+
+    return list(dict.fromkeys(found))
+
+
+def _matches(node: Node, parts: list) -> bool:
+    combinator, matcher = parts[-1]
+    if not matcher(node):
+        return False
+    if len(parts) == 1:
+        return True
+
+    ancestor = node.parent
+    while ancestor is not None and ancestor.tag != "#document":
+        if _matches(ancestor, parts[:-1]):
+            return True
+        if combinator == ">":
+            return False
+        ancestor = ancestor.parent
+    return False
+
+
+def _xpath_predicate(predicate: str):
+    for pattern, kind in XPATH_PREDICATES:
+        match = pattern.match(predicate.strip())
+        if not match:
+            continue
+        if kind == "position":
+            return kind, int(match[1])
+        if kind == "attribute":
+            return kind, lambda node, a=match[1], v=match[2]: node.attrs.get(a) == v
+        if kind == "has_attribute":
+            return kind, lambda node, a=match[1]: a in node.attrs
+        if kind == "contains_text":
+            return kind, lambda node, v=match[1]: v in node.own_text
+        if kind == "text":
+            return kind, lambda node, v=match[1]: node.own_text.strip() == v
+        return kind, lambda node, a=match[1], v=match[2]: v in node.attrs.get(a, "")
+
+    raise UnsupportedLocator(f"Unsupported XPath predicate [{predicate}].")
+
+
+def _select_xpath(root: Node, xpath: str) -> list[Node]:
+    if not xpath.startswith("/"):
+        raise UnsupportedLocator(f"Only absolute XPath is supported, got {xpath!r}.")
+
+    context = [root]
+    for axis, step in re.findall(r"(//?)([^/]+)", xpath):
+        match = XPATH_STEP.match(step)
+        if not match:
+            raise UnsupportedLocator(f"Unsupported XPath step {step!r}.")
+
+        tag = match["tag"].lower()
+        predicates = [
+            _xpath_predicate(predicate)
+            for predicate in re.findall(r"\[([^\]]*)\]", match["predicates"])
+        ]
+
+        parents = context
+        if axis == "//":
+            parents = list(
+                dict.fromkeys(
+                    node for parent in context for node in [parent, *parent.iter()]
+                )
+            )
+
+        selected = []
+        for parent in parents:
+            nodes = [child for child in parent.children if tag in ("*", child.tag)]
+            for kind, check in predicates:
+                if kind == "position":
+                    nodes = nodes[check - 1 : check] if check > 0 else []
+                else:
+                    nodes = [node for node in nodes if check(node)]
+            selected.extend(nodes)
+
+        context = list(dict.fromkeys(selected))
+
+    return context
+
+
+def select(root: Node, how: str, what: str) -> list[Node]:
+    if how == "css selector":
+        return _select_css(root, what)
+    if how == "xpath":
+        return _select_xpath(root, what)
+    if how == "id":
+        return [node for node in root.iter() if node.attrs.get("id") == what]
+    if how == "name":
+        return [node for node in root.iter() if node.attrs.get("name") == what]
+    if how == "tag name":
+        return [node for node in root.iter() if node.tag == what.lower()]
+    if how == "class name":
+        return [node for node in root.iter() if what in node.classes]
+
+    raise UnsupportedLocator(f"Locator strategy {how!r} needs a real browser.")
+
+
+class StaticBrowser:
+    def __init__(self, pool: urllib3.PoolManager | None = None, timeout: float = 10):
+        self.pool = pool or urllib3.PoolManager(maxsize=10)
+        self.timeout = timeout
+        self.current_url: str | None = None
+        self.documents: dict[str, Node] = {}
+
+    def get(self, url: str):
+        if url not in self.documents:
+            response = self.pool.request("GET", url, timeout=self.timeout)
+            if response.status >= 400:
+                raise urllib3.exceptions.HTTPError(
+                    f"GET {url} returned {response.status}."
+                )
+            self.documents[url] = parse(response.data.decode(errors="replace"))
+        self.current_url = url
+
+    def find_elements(self, how: str, what: str) -> list[Node]:
+        if self.current_url is None:
+            raise RuntimeError("Open a page with get() before looking for elements.")
+        return select(self.documents[self.current_url], how, what)
+
+    def find_element(self, how: str, what: str) -> Node:
+        from selenium.common import NoSuchElementException
+
+        nodes = self.find_elements(how, what)
+        if not nodes:
+            raise NoSuchElementException(f"No element for {how} {what}.")
+        return nodes[0]
+
+    def quit(self):
+        self.documents.clear()
@@ -0,0 +1,209 @@
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+MAX_TEXT = 64 * 1024
+
+STYLE = (
+    "body{font-family:sans-serif}td{padding:2px 8px;vertical-align:top}"
+    ".passed{color:green}.failed{color:red}.skipped{color:gray}"
+    "pre{white-space:pre-wrap;max-height:30em;overflow:auto;background:#f6f6f6}"
+)
+
+
+def clip(text: str) -> str:
+    if len(text) <= MAX_TEXT:
+        return text
+    return text[:MAX_TEXT] + f"\n... {len(text) - MAX_TEXT} more characters"
+
+
+class ReportWriter:
+    def __init__(self, path: str, shard: str | None = None, **metadata):
+        self.path = path
+        self.shard = shard or os.path.join(
+            os.path.basename(os.path.dirname(os.path.abspath(path))),
+            os.path.splitext(os.path.basename(path))[0],
+        )
+        self.assets_dir = os.path.splitext(path)[0] + ".assets"
+        self.counts: Counter = Counter()
+        self._started = time.perf_counter()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a")
+        self._write(
+            type="session",
+            started=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **metadata,
+        )
+
+    def _write(self, **record):
+        record["shard"] = self.shard
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+
+    def attach(self, test: str, name: str, data: bytes, extension: str):
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.assets_dir, f"{digest}.{extension}")
+        if not os.path.exists(path):
+            os.makedirs(self.assets_dir, exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(data)
+
+        self._write(
+            type="asset",
+            test=test,
+            name=name,
+            path=os.path.relpath(path, os.path.dirname(self.path) or "."),
+        )
+
+    def stage(self, name: str, duration: float, **details):
+        self._write(type="stage", name=name, duration=round(duration, 3), **details)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call" and report.passed:
+            return
+
+        self.counts[report.outcome] += 1
+        self._write(
+            type="result",
+            test=report.nodeid,
+            when=report.when,
+            outcome=report.outcome,
+            duration=round(report.duration, 4),
+            longrepr=clip(str(report.longrepr)) if report.longrepr else None,
+            log=clip(report.caplog) if report.caplog else None,
+            stdout=clip(report.capstdout) if report.capstdout else None,
+        )
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.close()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._write(
+            type="summary",
+            counts=dict(self.counts),
+            duration=round(time.perf_counter() - self._started, 3),
+        )
+        self._file.close()
+
+
+def read_records(paths: list[str]):
+    for path in paths:
+        with open(path) as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("path"):
+                        # Asset paths are relative to the shard file.
+                        record["path"] = os.path.join(
+                            os.path.dirname(path), record["path"]
+                        )
+                    yield record
+
+
+def summarize_shards(paths: list[str]) -> tuple[Counter, dict[str, float]]:
+    counts: Counter = Counter()
+    durations: dict[str, float] = {}
+
+    # Results are counted one by one, so a shard that crashed before its
+    # summary record still shows up.
+    for record in read_records(paths):
+        if record["type"] == "result":
+            counts[record["outcome"]] += 1
+        elif record["type"] == "summary":
+            durations[record["shard"]] = (
+                durations.get(record["shard"], 0.0) + record["duration"]
+            )
+
+    return counts, durations
+
+
+def result_row(record: dict) -> str:
+    details = ""
+    for title in ("longrepr", "log", "stdout"):
+        if record.get(title):
+            details += (
+                f"<details><summary>{title}</summary>"
+                f"<pre>{html.escape(record[title])}</pre></details>"
+            )
+
+    return (
+        f"<tr class=\"{record['outcome']}\"><td>{html.escape(record['test'])}</td>"
+        f"<td>{record['when']}</td><td>{record['outcome']}</td>"
+        f"<td>{record['duration']:.2f}s</td><td>{html.escape(record['shard'])}</td>"
+        f"<td>{details}</td></tr>"
+    )
+
+
+def merge(paths: list[str], output: str, jsonl_output: str | None = None) -> str:
+    counts, durations = summarize_shards(paths)
+    output_dir = os.path.dirname(output) or "."
+    os.makedirs(output_dir, exist_ok=True)
+
+    merged = open(jsonl_output, "w") if jsonl_output else None
+    with open(output, "w") as file:
+        file.write(
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Test report</title>"
+            f"<style>{STYLE}</style></head><body><h1>Test report</h1><p>"
+            + ", ".join(f"{outcome} {count}" for outcome, count in counts.items())
+            + f" in {len(durations)} shards, longest shard "
+            f"{max(durations.values(), default=0):.1f}s</p>"
+            "<table><tr><th>test</th><th>phase</th><th>outcome</th><th>duration</th>"
+            "<th>shard</th><th></th></tr>"
+        )
+
+        for record in read_records(paths):
+            if merged:
+                merged.write(json.dumps(record) + "\n")
+            if record["type"] == "result":
+                file.write(result_row(record))
+            elif record["type"] == "stage":
+                file.write(
+                    f"<tr><td colspan='6'>{html.escape(record['shard'])}: "
+                    f"{html.escape(record['name'])} {record['duration']:.2f}s</td></tr>"
+                )
+            elif record["type"] == "asset":
+                source = os.path.relpath(record["path"], output_dir)
+                file.write(
+                    f"<tr><td colspan='6'>{html.escape(record['test'])}: "
+                    f"<a href='{html.escape(source)}'>{html.escape(record['name'])}"
+                    "</a></td></tr>"
+                )
+
+        file.write("</table></body></html>")
+
+    if merged:
+        merged.close()
+
+    return output
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Merge streamed JSON lines reports of workers or CI shards."
+    )
+    parser.add_argument("inputs", nargs="+", help="Report files or glob patterns")
+    parser.add_argument("--html", required=True, help="Merged HTML report")
+    parser.add_argument("--jsonl", default=None, help="Merged JSON lines report")
+    args = parser.parse_args(argv)
+
+    paths = sorted(
+        {path for pattern in args.inputs for path in glob.glob(pattern)}
+        or set(args.inputs)
+    )
+    print(f"Merged {len(paths)} shards into {merge(paths, args.html, args.jsonl)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import logging as logger
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urlsplit
+
+
+@dataclass
+class TelemetryEvent:
+    kind: str
+    timestamp: float
+    text: str = ""
+    level: str | None = None
+    method: str | None = None
+    url: str | None = None
+    status: int | None = None
+    request_id: str | None = None
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.url or "").path.rstrip("/") or "/"
+
+    def describe(self) -> str:
+        if self.kind in ("console", "javascript"):
+            return f"{self.kind} {self.level}: {self.text}"
+        status = f" {self.status}" if self.status is not None else ""
+        return f"{self.kind} {self.method} {self.url}{status} {self.text}".rstrip()
+
+
+def _log_entry(params: dict) -> TelemetryEvent:
+    return TelemetryEvent(
+        kind="javascript" if params["type"] == "javascript" else "console",
+        timestamp=params["timestamp"] / 1000,
+        text=params.get("text") or "",
+        level=params.get("level"),
+    )
+
+
+def _network(kind: str):
+    def parse(params: dict) -> TelemetryEvent:
+        request = params["request"]
+        response = params.get("response") or {}
+        return TelemetryEvent(
+            kind=kind,
+            timestamp=params["timestamp"] / 1000,
+            text=params.get("errorText") or "",
+            method=request["method"],
+            url=request["url"],
+            status=response.get("status"),
+            request_id=request["request"],
+        )
+
+    return parse
+
+
+class BidiEvent:
+    # Quacks like the event classes of selenium.webdriver.common.bidi, so it
+    # can be registered on the driver's BiDi websocket connection.
+    def __init__(self, event_class: str, parse: Callable[[dict], TelemetryEvent]):
+        self.event_class = event_class
+        self.from_json = parse
+
+
+BIDI_EVENTS = (
+    BidiEvent("log.entryAdded", _log_entry),
+    BidiEvent("network.beforeRequestSent", _network("request")),
+    BidiEvent("network.responseCompleted", _network("response")),
+    BidiEvent("network.fetchError", _network("network_error")),
+)
+
+
+class BrowserTelemetry:
+    def __init__(self, test: str | None = None, capacity: int = 10_000):
+        self.test = test
+        self.capacity = capacity
+        self.events: list[TelemetryEvent] = []
+        self.dropped = 0
+        self._condition = threading.Condition()
+
+    def attach(self, browser):
+        from selenium.webdriver.common.bidi.session import session_subscribe
+
+        # Events arrive on the websocket thread, the test thread never polls.
+        connection = browser.script.conn
+        for event in BIDI_EVENTS:
+            connection.add_callback(event, self.record)
+        connection.execute(
+            session_subscribe(*(event.event_class for event in BIDI_EVENTS))
+        )
+        browser.telemetry = self
+
+    def record(self, event: TelemetryEvent):
+        if event.kind == "javascript":
+            logger.warning("JS error in %s: %s", self.test, event.text)
+
+        with self._condition:
+            if len(self.events) >= self.capacity:
+                self.dropped += 1
+                return
+            self.events.append(event)
+            self._condition.notify_all()
+
+    def mark(self) -> int:
+        with self._condition:
+            return len(self.events)
+
+    def select(self, kind: str | None = None, since: int = 0) -> list[TelemetryEvent]:
+        with self._condition:
+            return [
+                event
+                for event in self.events[since:]
+                if kind is None or event.kind == kind
+            ]
+
+    def wait_for(
+        self,
+        predicate: Callable[[TelemetryEvent], bool],
+        timeout: float,
+        since: int = 0,
+    ) -> TelemetryEvent:
+        deadline = time.monotonic() + timeout
+        position = since
+
+        with self._condition:
+            while True:
+                for event in self.events[position:]:
+                    if predicate(event):
+                        return event
+                position = len(self.events)
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No matching browser event in {timeout}s.")
+                self._condition.wait(remaining)
+
+    def wait_for_response(
+        self, method: str, path: str, timeout: float, since: int = 0
+    ) -> TelemetryEvent:
+        path = path.rstrip("/") or "/"
+        return self.wait_for(
+            lambda event: event.kind in ("response", "network_error")
+            and event.method == method.upper()
+            and event.path == path,
+            timeout,
+            since,
+        )
+
+    @property
+    def js_errors(self) -> list[TelemetryEvent]:
+        return self.select("javascript")
+
+    def counts(self) -> Counter:
+        with self._condition:
+            return Counter(event.kind for event in self.events)
@@ -0,0 +1,289 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from PIL import Image
+
+from src.waits import locked
+
+MODES = ("off", "check", "update")
+
+HASH_SIZE = 32
+HASH_DISTANCE = 0
+PIXEL_TOLERANCE = 24
+BLOCK_SIZE = 16
+MAX_CHANGED_RATIO = 0.001
+
+ELEMENT_RECTS_SCRIPT = """
+return [
+    window.devicePixelRatio,
+    arguments[0].flatMap((selector) =>
+        Array.from(document.querySelectorAll(selector), (element) => {
+            const rect = element.getBoundingClientRect();
+            return [rect.left, rect.top, rect.width, rect.height];
+        })
+    ),
+];
+"""
+
+
+def load_image(png: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(png)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def grayscale(image: np.ndarray) -> np.ndarray:
+    return image @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def downscale(gray: np.ndarray, size: int) -> np.ndarray:
+    height, width = gray.shape
+    rows = np.linspace(0, height, size + 1).astype(int)
+    columns = np.linspace(0, width, size + 1).astype(int)
+
+    # Block means from a summed-area table, one vectorized pass for all cells.
+    table = np.zeros((height + 1, width + 1), dtype=np.float64)
+    table[1:, 1:] = gray.cumsum(0).cumsum(1)
+    sums = (
+        table[rows[1:]][:, columns[1:]]
+        - table[rows[:-1]][:, columns[1:]]
+        - table[rows[1:]][:, columns[:-1]]
+        + table[rows[:-1]][:, columns[:-1]]
+    )
+    areas = np.outer(np.diff(rows), np.diff(columns)).clip(min=1)
+    return sums / areas
+
+
+def perceptual_hash(
+    image: np.ndarray, mask: np.ndarray | None = None, size: int = HASH_SIZE
+) -> str:
+    gray = grayscale(image)
+    if mask is not None:
+        gray = np.where(mask, 0, gray)
+
+    small = downscale(gray, size)
+    return np.packbits(small > small.mean()).tobytes().hex()
+
+
+def hash_distance(first: str, second: str) -> int:
+    if len(first) != len(second):
+        return len(first) * 4
+
+    bits = np.unpackbits(
+        np.frombuffer(bytes.fromhex(first), dtype=np.uint8)
+        ^ np.frombuffer(bytes.fromhex(second), dtype=np.uint8)
+    )
+    return int(bits.sum())
+
+
+def build_mask(
+    shape: tuple[int, ...], rects: list[tuple[float, float, float, float]], scale: float
+) -> np.ndarray:
+    mask = np.zeros(shape[:2], dtype=bool)
+    for left, top, width, height in rects:
+        x0, y0 = max(int(left * scale), 0), max(int(top * scale), 0)
+        x1, y1 = int((left + width) * scale + 1), int((top + height) * scale + 1)
+        mask[y0:y1, x0:x1] = True
+    return mask
+
+
+def region_diff(
+    baseline: np.ndarray,
+    actual: np.ndarray,
+    mask: np.ndarray | None = None,
+    tolerance: int = PIXEL_TOLERANCE,
+    block: int = BLOCK_SIZE,
+) -> tuple[float, list[tuple[int, int, int, int]]]:
+    if baseline.shape != actual.shape:
+        height, width = actual.shape[:2]
+        return 1.0, [(0, 0, width, height)]
+
+    changed = (
+        np.abs(baseline.astype(np.int16) - actual.astype(np.int16)).max(axis=2)
+        > tolerance
+    )
+    if mask is not None:
+        changed &= ~mask
+
+    height, width = changed.shape
+    padded = np.pad(changed, ((0, -height % block), (0, -width % block)))
+    blocks = padded.reshape(
+        padded.shape[0] // block, block, padded.shape[1] // block, block
+    ).any(axis=(1, 3))
+
+    regions = [
+        (int(x) * block, int(y) * block, block, block)
+        for y, x in zip(*np.nonzero(blocks))
+    ]
+    return float(changed.mean()), regions
+
+
+@dataclass
+class VisualResult:
+    name: str
+    status: str
+    distance: int = 0
+    changed_ratio: float = 0.0
+    regions: list[tuple[int, int, int, int]] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return self.status in ("changed", "missing")
+
+
+def _write_atomically(path: str, write):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, staging = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(descriptor, "wb") as file:
+        write(file)
+    os.replace(staging, path)
+
+
+class BaselineStore:
+    def __init__(self, root: str):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        self.index: dict[str, dict] = self._read()
+        self.changed: dict[str, dict] = {}
+
+    def _read(self) -> dict[str, dict]:
+        try:
+            with open(self.index_path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.png")
+
+    def get(self, name: str) -> dict | None:
+        return self.index.get(name)
+
+    def read(self, name: str) -> bytes:
+        with open(self.object_path(self.index[name]["sha256"]), "rb") as file:
+            return file.read()
+
+    def put(self, name: str, png: bytes, phash: str):
+        digest = hashlib.sha256(png).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            _write_atomically(path, lambda file: file.write(png))
+
+        self.index[name] = self.changed[name] = {"sha256": digest, "phash": phash}
+
+    def save(self):
+        if not self.changed:
+            return
+
+        # Browsers of a matrix and runner shards update the same index: merge
+        # this run's baselines under a lock and replace the file in one step.
+        os.makedirs(self.root, exist_ok=True)
+        with locked(self.index_path):
+            self.index = {**self._read(), **self.changed}
+            content = json.dumps(self.index, indent=1, sort_keys=True).encode()
+            _write_atomically(self.index_path, lambda file: file.write(content))
+
+    def prune(self) -> int:
+        used = {entry["sha256"] for entry in self.index.values()}
+        removed = 0
+        objects = os.path.join(self.root, "objects")
+        for directory, _, files in os.walk(objects):
+            for name in files:
+                if name.removesuffix(".png") not in used:
+                    os.remove(os.path.join(directory, name))
+                    removed += 1
+        return removed
+
+
+class VisualChecker:
+    def __init__(
+        self,
+        store: BaselineStore,
+        mode: str = "check",
+        max_changed_ratio: float = MAX_CHANGED_RATIO,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown visual mode {mode!r}, expected one of {MODES}.")
+
+        self.store = store
+        self.mode = mode
+        self.max_changed_ratio = max_changed_ratio
+        self.results: list[VisualResult] = []
+        self.elapsed = 0.0
+
+    def capture(self, browser, ignore: tuple[tuple[str, str], ...] = ()):
+        png = browser.get_screenshot_as_png()
+        selectors = [what for how, what in ignore if how == "css selector"]
+        if not selectors:
+            return png, [], 1.0
+
+        scale, rects = browser.execute_script(ELEMENT_RECTS_SCRIPT, selectors)
+        return png, rects, scale
+
+    def compare(
+        self,
+        name: str,
+        png: bytes,
+        rects: list[tuple[float, float, float, float]] = (),
+        scale: float = 1.0,
+    ) -> VisualResult:
+        started = time.perf_counter()
+        try:
+            result = self._compare(name, png, rects, scale)
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+        self.results.append(result)
+        return result
+
+    def _compare(self, name, png, rects, scale) -> VisualResult:
+        baseline = self.store.get(name)
+        if baseline and baseline["sha256"] == hashlib.sha256(png).hexdigest():
+            return VisualResult(name, "match")
+
+        actual = load_image(png)
+        mask = build_mask(actual.shape, rects, scale) if rects else None
+        phash = perceptual_hash(actual, mask)
+
+        # Only update writes baselines, a check without one fails.
+        if self.mode == "update":
+            self.store.put(name, png, phash)
+            return VisualResult(name, "updated" if baseline else "new")
+        if not baseline:
+            return VisualResult(name, "missing")
+
+        distance = hash_distance(baseline["phash"], phash)
+        if distance <= HASH_DISTANCE:
+            return VisualResult(name, "match", distance)
+
+        changed_ratio, regions = region_diff(
+            load_image(self.store.read(name)), actual, mask
+        )
+        status = "changed" if changed_ratio > self.max_changed_ratio else "match"
+        return VisualResult(name, status, distance, changed_ratio, regions)
+
+    def summary(self) -> list[str]:
+        statuses: dict[str, int] = {}
+        for result in self.results:
+            statuses[result.status] = statuses.get(result.status, 0) + 1
+
+        lines = [
+            f"{len(self.results)} screenshots compared in {self.elapsed:.2f}s ("
+            + ", ".join(f"{status} {count}" for status, count in statuses.items())
+            + ")"
+        ]
+        for result in self.results:
+            if result.status == "missing":
+                lines.append(f"   {result.name}: no baseline, run --visual update")
+            elif result.failed:
+                lines.append(
+                    f"   {result.name}: {result.changed_ratio:.2%} pixels changed "
+                    f"in {len(result.regions)} regions, hash distance {result.distance}"
+                )
+        return lines
@@ -0,0 +1,145 @@
+import json
+import math
+import os
+import tempfile
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows, the atomic replace still keeps the file whole.
+    fcntl = None
+
+POLL_FREQUENCY = 0.05
+DEFAULT_TIMEOUT = 10.0
+MIN_SAMPLES = 20
+MARGIN_FACTOR = 1.5
+MARGIN = 0.5
+MIN_TIMEOUT = 1.0
+MAX_TIMEOUT = 30.0
+
+
+def percentile(samples: list[float], rank: float) -> float:
+    ordered = sorted(samples)
+    index = max(math.ceil(len(ordered) * rank / 100) - 1, 0)
+    return ordered[index]
+
+
+@contextmanager
+def locked(path: str):
+    if fcntl is None:
+        yield
+        return
+
+    with open(path + ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def condition_name(condition) -> str:
+    name = getattr(condition, "__qualname__", type(condition).__qualname__)
+    return name.split(".<locals>")[0].split(".")[-1]
+
+
+class WaitHistory:
+    def __init__(self, path: str | None = None, keep: int = 200):
+        self.path = path
+        self.keep = keep
+        self.samples: dict[str, list[float]] = {}
+        self.recorded: dict[str, list[float]] = defaultdict(list)
+        self.timeouts: Counter = Counter()
+        # Timeouts in a row per condition, they double its budget until a wait
+        # fits the learned budget again.
+        self.streaks: dict[str, int] = {}
+        self._changed_streaks: set[str] = set()
+
+        if path:
+            self.samples, self.streaks = self._read()
+
+    def _read(self) -> tuple[dict[str, list[float]], dict[str, int]]:
+        try:
+            with open(self.path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}, {}
+
+        if not isinstance(data, dict):
+            return {}, {}
+        if not isinstance(data.get("samples"), dict):
+            # Older files hold only the samples.
+            return data, {}
+        return data["samples"], data.get("timeouts", {})
+
+    def record(self, name: str, seconds: float):
+        if self.streaks.get(name) and seconds <= self._learned(name, DEFAULT_TIMEOUT):
+            self.streaks[name] = 0
+            self._changed_streaks.add(name)
+        self.recorded[name].append(round(seconds, 4))
+
+    def record_timeout(self, name: str, timeout: float):
+        # The real duration is unknown, so a timeout is not a sample. It backs
+        # the condition off instead, or a slower app would time out forever.
+        self.timeouts[name] += 1
+        self.streaks[name] = self.streaks.get(name, 0) + 1
+        self._changed_streaks.add(name)
+
+    def _learned(self, name: str, default: float) -> float:
+        samples = self.samples.get(name, []) + self.recorded.get(name, [])
+        if len(samples) < MIN_SAMPLES:
+            return default
+
+        learned = percentile(samples, 99) * MARGIN_FACTOR + MARGIN
+        return min(max(learned, MIN_TIMEOUT), MAX_TIMEOUT)
+
+    def budget(self, name: str, default: float = DEFAULT_TIMEOUT) -> float:
+        learned = self._learned(name, default)
+        return min(learned * 2 ** self.streaks.get(name, 0), max(learned, MAX_TIMEOUT))
+
+    def save(self):
+        if not self.path or not (self.recorded or self._changed_streaks):
+            return
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        # Parallel shards share the file: merge under a lock and replace the
+        # file in one step, so nobody reads it half-written.
+        with locked(self.path):
+            samples, streaks = self._read()
+            for name, recorded in self.recorded.items():
+                samples[name] = (samples.get(name, []) + recorded)[-self.keep :]
+            for name in self._changed_streaks:
+                streaks[name] = self.streaks[name]
+
+            descriptor, staging = tempfile.mkstemp(dir=directory, suffix=".json")
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(
+                    {"samples": samples, "timeouts": streaks},
+                    file,
+                    indent=1,
+                    sort_keys=True,
+                )
+            os.replace(staging, self.path)
+
+    def summary(self, limit: int = 10) -> list[str]:
+        lines = [
+            f"{'condition':<60}{'n':>6}{'p99 s':>9}{'budget s':>10}{'timeouts':>10}"
+        ]
+
+        names = sorted(
+            set(self.recorded) | set(self.timeouts),
+            key=lambda name: (self.timeouts[name], len(self.recorded.get(name, []))),
+            reverse=True,
+        )
+        for name in names[:limit]:
+            samples = self.samples.get(name, []) + self.recorded.get(name, [])
+            p99 = percentile(samples, 99) if samples else 0.0
+            lines.append(
+                f"{name:<60}{len(samples):>6}{p99:>9.2f}"
+                f"{self.budget(name):>10.2f}{self.timeouts[name]:>10}"
+            )
+
+        return lines
@@ -0,0 +1,156 @@
+import logging as logger
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+import urllib3
+
+from src.api_client import ContactListApi
+
+
+@dataclass
+class WarmUpReport:
+    healthy_after: float | None = None
+    authenticated_after: float | None = None
+    browsers_after: float | None = None
+    browsers: int = 0
+    signed_in: int = 0
+    elapsed: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        def seconds(value: float | None) -> str:
+            return "-" if value is None else f"{value:.1f} s"
+
+        line = (
+            f"warm-up took {self.elapsed:.1f} s: app healthy after "
+            f"{seconds(self.healthy_after)}, API signed in after "
+            f"{seconds(self.authenticated_after)}, {self.browsers} browsers ready "
+            f"after {seconds(self.browsers_after)} ({self.signed_in} signed in)"
+        )
+        return "; ".join([line, *self.errors])
+
+
+def wait_until_healthy(
+    base_url: str,
+    timeout: float = 60,
+    interval: float = 1,
+    pool: urllib3.PoolManager | None = None,
+) -> float:
+    pool = pool or urllib3.PoolManager(retries=False)
+    started = time.monotonic()
+
+    while True:
+        remaining = timeout - (time.monotonic() - started)
+        try:
+            # A sleeping dyno answers the first request only once it is up.
+            response = pool.request(
+                "GET",
+                base_url,
+                timeout=urllib3.Timeout(connect=5, read=max(remaining, 1)),
+            )
+            if response.status < 500:
+                return time.monotonic() - started
+            problem = f"status {response.status}"
+        except urllib3.exceptions.HTTPError as error:
+            problem = str(error)
+
+        if time.monotonic() - started + interval > timeout:
+            raise TimeoutError(
+                f"{base_url} is not healthy after {timeout:.0f} s: {problem}"
+            )
+        logger.info("Wait for %s to wake up: %s.", base_url, problem)
+        time.sleep(interval)
+
+
+class WarmUp:
+    def __init__(
+        self,
+        base_url: str,
+        credentials: tuple[str | None, str | None],
+        launch: Callable[[], object] | None = None,
+        browsers: int = 1,
+        timeout: float = 60,
+        interval: float = 1,
+        api_factory: Callable[[str], ContactListApi] = ContactListApi,
+    ):
+        self.base_url = base_url
+        self.credentials = credentials
+        self.launch = launch
+        self.browsers = browsers if launch else 0
+        self.timeout = timeout
+        self.interval = interval
+        self.api_factory = api_factory
+        self.api: ContactListApi | None = None
+        self.report = WarmUpReport()
+        self._ready: list = []
+
+    def _wake_and_sign_in(self, started: float):
+        self.report.healthy_after = wait_until_healthy(
+            self.base_url, self.timeout, self.interval
+        )
+
+        email, password = self.credentials
+        if email and password:
+            api = self.api_factory(self.base_url)
+            api.login(email=email, password=password)
+            self.api = api
+            self.report.authenticated_after = time.monotonic() - started
+
+    def _launch_browser(self, started: float):
+        browser = self.launch()
+        if browser is not None:
+            self._ready.append(browser)
+            self.report.browsers = len(self._ready)
+            self.report.browsers_after = time.monotonic() - started
+
+    def run(self) -> WarmUpReport:
+        started = time.monotonic()
+
+        # Launching browsers does not need the app, so it overlaps the wake-up.
+        with ThreadPoolExecutor(max_workers=1 + self.browsers) as executor:
+            futures = [executor.submit(self._wake_and_sign_in, started)]
+            futures += [
+                executor.submit(self._launch_browser, started)
+                for _ in range(self.browsers)
+            ]
+            for future in futures:
+                error = future.exception()
+                if error:
+                    logger.warning("Warm-up step failed: %r", error)
+                    self.report.errors.append(str(error))
+
+        if self.api and self.api.token:
+            for browser in self._ready:
+                try:
+                    self.sign_in(browser)
+                except Exception as error:
+                    logger.warning("Could not sign the browser in: %r", error)
+                    self.report.errors.append(str(error))
+
+        self.report.elapsed = time.monotonic() - started
+        return self.report
+
+    def sign_in(self, browser):
+        # The app keeps the API token in a cookie, so the browser skips the
+        # login form.
+        browser.get(self.base_url)
+        browser.add_cookie({"name": "token", "value": self.api.token})
+        browser.signed_in = True
+        self.report.signed_in += 1
+
+    def take_browser(self, signed_in: bool = True):
+        browser = self._ready.pop(0) if self._ready else None
+        if (
+            browser is not None
+            and not signed_in
+            and getattr(browser, "signed_in", False)
+        ):
+            browser.delete_all_cookies()
+            browser.signed_in = False
+        return browser
+
+    def close(self):
+        while self._ready:
+            self._ready.pop().quit()
@@ -1,28 +1,64 @@
+from __future__ import annotations
+
 import logging as logger
 import os
+from collections import Counter
+from dataclasses import asdict
+from datetime import timedelta
+from typing import TYPE_CHECKING
 
 import pytest
-from dotenv import load_dotenv
 from faker import Faker
-from selenium import webdriver
-
-
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
-
-from src.host_config import base_url
+from pytest_metadata.plugin import metadata_key
+
+from src.api_client import ContactListApi
+from src import data_gc, events, run_history, runner, stream_report
+from src.browser_factory import BROWSER_NAMES, create_browser
+from src.cassette import MODES, Cassette, cassette_path, seed_for
+from src.command_profiler import CommandProfiler
+from src.contact_data import RUN_ID, fake_contact_info
+from src.host_config import (
+    HOSTS,
+    get_base_url,
+    get_credentials,
+    get_env_name,
+    get_environment,
+)
+from src.pairwise import (
+    MAX_STRENGTH,
+    CoveringArray,
+    case_id,
+    contact_cases,
+    contact_record,
+)
+from src.performance import METRIC_NAMES, PerformanceRecorder
+from src.static_dom import StaticBrowser
+from src.telemetry import BrowserTelemetry, TelemetryEvent
+from src.waits import WaitHistory
+from src.warmup import WarmUp
 from src.pages.add_new_contact_page import AddNewContactPage
+from src.pages.base_page import BasePage
 from src.pages.contact_details_page import ContactDetailsPage
 from src.pages.contact_list_page import ContactListPage
 from src.pages.login_page import LoginPage
 
-load_dotenv()
+if TYPE_CHECKING:
+    from selenium import webdriver
 
-firefox_path = os.getenv("FIREFOX_PATH")
-geckodriver_path = os.getenv("GECKODRIVER_PATH")
+CASSETTES_DIR = os.path.join(os.path.dirname(__file__), "cassettes")
+REPORTS_DIR = os.path.join(os.path.dirname(__file__), "reports")
 
-google_chrome_path = os.getenv("GOOGLE_CHROME_PATH")
-chromedriver_path = os.getenv("CHROMEDRIVER_PATH")
+event_handler_key = pytest.StashKey[events.EventHandler]()
+command_profiler_key = pytest.StashKey[CommandProfiler]()
+gc_report_key = pytest.StashKey[data_gc.GcReport]()
+history_key = pytest.StashKey[run_history.HistoryRecorder]()
+report_writer_key = pytest.StashKey[stream_report.ReportWriter]()
+telemetry_key = pytest.StashKey[dict[str, tuple[Counter, list[TelemetryEvent]]]]()
+pairwise_key = pytest.StashKey[CoveringArray]()
+warmup_key = pytest.StashKey[WarmUp]()
+
+# Fixtures that need the app, used to decide whether the run needs a warm-up.
+APP_FIXTURES = {"browser", "static_browser", "api_client", "setup_user"}
 
 
 def pytest_addoption(parser):
@@ -30,129 +66,537 @@ def pytest_addoption(parser):
         "--rm",
         action="store_true",
         default=False,
-        help="Delete a created contact after test",
+        help="Delete the contacts tagged by this run through the API after each test",
     )
     parser.addoption(
         "--browser_name",
         action="store",
         default="firefox",
-        help="Choose browser: chrome or firefox",
+        help="Choose browser: chrome or firefox. "
+        "A comma separated list runs the tests on each browser at the same time",
+    )
+    parser.addoption(
+        "--fresh_profile",
+        action="store_true",
+        default=False,
+        help="Launch browsers with an empty profile instead of the warm template",
+    )
+    parser.addoption(
+        "--hub",
+        action="store",
+        default=os.getenv("ITS_BROWSER_HUB"),
+        help="URL of a browser hub (python -m src.browser_hub) to take browsers from "
+        "instead of launching them",
+    )
+    parser.addoption(
+        "--telemetry",
+        action="store_true",
+        default=False,
+        help="Stream console messages, JS errors and network events over WebDriver "
+        "BiDi into a per-test buffer",
+    )
+    parser.addoption(
+        "--warmup",
+        action="store",
+        type=float,
+        default=0,
+        help="Seconds to wait for the app to wake up right after collection, while "
+        "a browser launches. 0 (the default) skips the warm-up stage",
+    )
+    parser.addoption(
+        "--pairwise",
+        action="store",
+        type=int,
+        default=0,
+        help="Run the pairwise contact tests, covering every combination of this "
+        f"many contact field classes (1-{MAX_STRENGTH}). 0 deselects them",
+    )
+    parser.addoption(
+        "--env",
+        action="store",
+        default=None,
+        help=f"Choose environment: {', '.join(HOSTS)}. Overrides ENV from .env",
+    )
+    parser.addoption(
+        "--api_cassette",
+        action="store",
+        default="off",
+        choices=MODES,
+        help="Record API calls to tests/cassettes or replay them from there",
+    )
+    parser.addoption(
+        "--events_file",
+        action="store",
+        default=os.path.join(REPORTS_DIR, "events.jsonl"),
+        help="JSON lines file for the structured events of pages, fixtures and WebDriver",
+    )
+    parser.addoption(
+        "--events_webdriver",
+        action="store_true",
+        default=False,
+        help="Also write the method, path, status and duration of every WebDriver "
+        "command to the events file",
+    )
+    parser.addoption(
+        "--profile_commands",
+        action="store_true",
+        default=False,
+        help="Profile WebDriver commands per test and page method",
+    )
+    parser.addoption(
+        "--wait_history",
+        action="store",
+        default=None,
+        help="JSON file with wait durations used to learn timeouts. "
+        "Defaults to tests/reports/wait_history-<env>.json",
+    )
+    parser.addoption(
+        "--visual",
+        action="store",
+        default="off",
+        choices=("off", "check", "update"),
+        help="Compare page screenshots with baselines or update the baselines",
+    )
+    parser.addoption(
+        "--visual_baselines",
+        action="store",
+        default=os.path.join(os.path.dirname(__file__), "visual_baselines"),
+        help="Content-addressed store of baseline screenshots",
+    )
+    parser.addoption(
+        "--gc_orphans",
+        action="store",
+        type=float,
+        default=None,
+        metavar="HOURS",
+        help="Before the session, delete contacts of earlier runs older than HOURS",
+    )
+    parser.addoption(
+        "--history",
+        action="store",
+        default=run_history.HISTORY_DB,
+        help="SQLite file that keeps test, step and fixture durations of every run. "
+        "Pass an empty value to disable",
+    )
+    parser.addoption(
+        "--stream_report",
+        action="store",
+        default=None,
+        help="JSON lines report written as tests finish. "
+        "Merge shards with python -m src.stream_report",
+    )
+    parser.addoption(
+        "--perf",
+        action="store_true",
+        default=False,
+        help="Collect page performance metrics and check them against budgets",
+    )
+    parser.addoption(
+        "--perf_report",
+        action="store",
+        default=None,
+        help="Path of a JSON file for the collected performance metrics",
     )
 
 
-@pytest.fixture
-def browser(pytestconfig):
-    browser_name = pytestconfig.getoption("--browser_name")
-    browser = None
+def pytest_cmdline_main(config):
+    browser_names = runner.split_names(config.getoption("--browser_name"))
+    if len(browser_names) < 2 or config.getoption("--collect-only"):
+        return None
 
-    if browser_name == "firefox":
-        logger.info("Prepare browser firefox.")
+    unknown = set(browser_names) - set(BROWSER_NAMES)
+    if unknown:
+        raise pytest.UsageError(f"Unknown browsers: {', '.join(sorted(unknown))}")
 
-        from selenium.webdriver.firefox.options import Options
-        from selenium.webdriver.firefox.service import Service
+    reports_dir = os.path.join(REPORTS_DIR, "matrix")
+    jobs = runner.browser_jobs(
+        browser_names,
+        runner.without_option(list(config.invocation_params.args), "--browser_name"),
+        reports_dir,
+    )
+    return runner.run_matrix(jobs, reports_dir)
 
-        options = Options()
-        if firefox_path and geckodriver_path:
-            options.binary_location = firefox_path
 
-            service = Service(executable_path=geckodriver_path)
-            browser = webdriver.Firefox(service=service, options=options)
-    elif browser_name == "chrome":
-        logger.info("Prepare browser chrome.")
+def pytest_configure(config):
+    if config.getoption("--profile_commands"):
+        config.stash[command_profiler_key] = CommandProfiler()
 
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.chrome.service import Service
+    env_name = config.getoption("--env")
+    if env_name:
+        try:
+            get_environment(env_name)
+        except (KeyError, ValueError) as error:
+            raise pytest.UsageError(str(error))
+        os.environ["ENV"] = env_name
 
-        options = Options()
-        if google_chrome_path and chromedriver_path:
-            options.binary_location = google_chrome_path
+    if not 0 <= config.getoption("--pairwise") <= MAX_STRENGTH:
+        raise pytest.UsageError(f"--pairwise should be between 0 and {MAX_STRENGTH}.")
+
+    config.stash[event_handler_key] = events.install(
+        config.getoption("--events_file"),
+        webdriver_commands=config.getoption("--events_webdriver"),
+    )
+
+    config.stash[metadata_key]["Environment"] = get_env_name()
+    config.stash[metadata_key]["Base URL"] = get_base_url()
+
+    BasePage.wait_history = WaitHistory(
+        config.getoption("--wait_history")
+        or os.path.join(REPORTS_DIR, f"wait_history-{get_env_name()}.json")
+    )
+
+    if config.getoption("--history") and not config.getoption("--collect-only"):
+        config.stash[history_key] = run_history.HistoryRecorder(
+            config.getoption("--history"),
+            get_env_name(),
+            config.getoption("--browser_name"),
+        )
+        config.pluginmanager.register(config.stash[history_key], "run_history")
+
+    if config.getoption("--stream_report"):
+        config.stash[report_writer_key] = stream_report.ReportWriter(
+            config.getoption("--stream_report"),
+            environment=get_env_name(),
+            browser=config.getoption("--browser_name"),
+        )
+        config.pluginmanager.register(config.stash[report_writer_key], "stream_report")
+
+    if config.getoption("--telemetry"):
+        config.stash[telemetry_key] = {}
+
+    if config.getoption("--visual") != "off":
+        from src.visual import BaselineStore, VisualChecker
+
+        BasePage.visual_checker = VisualChecker(
+            BaselineStore(config.getoption("--visual_baselines")),
+            config.getoption("--visual"),
+        )
+
+    if config.getoption("--perf"):
+        BasePage.performance_recorder = PerformanceRecorder()
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    ttl_hours = config.getoption("--gc_orphans")
+    if ttl_hours is None or config.getoption("--collect-only"):
+        return
+
+    email, password = get_credentials()
+    if not (email and password):
+        logger.warning("Skip garbage collection, credentials are not set.")
+        return
+
+    api = ContactListApi(get_base_url())
+    api.login(email=email, password=password)
+    config.stash[gc_report_key] = data_gc.collect(api, ttl=timedelta(hours=ttl_hours))
+
+
+def pytest_generate_tests(metafunc):
+    config = metafunc.config
+    # Without --pairwise these tests are deselected after collection.
+    if "pairwise_contact" not in metafunc.fixturenames or not config.getoption(
+        "--pairwise"
+    ):
+        return
+
+    if pairwise_key not in config.stash:
+        config.stash[pairwise_key] = contact_cases(config.getoption("--pairwise"))
+
+    rows = config.stash[pairwise_key].rows
+    metafunc.parametrize(
+        "pairwise_contact", rows, ids=[case_id(row) for row in rows], indirect=True
+    )
 
-            service = Service(executable_path=chromedriver_path)
-            browser = webdriver.Chrome(service=service, options=options)
-    else:
-        raise pytest.UsageError("--browser_name should be chrome or firefox")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--pairwise"):
+        return
+
+    selected, deselected = [], []
+    for item in items:
+        if "pairwise_contact" in item.fixturenames:
+            deselected.append(item)
+        else:
+            selected.append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_collection_finish(session):
+    config = session.config
+    if not config.getoption("--warmup") or config.getoption("--collect-only"):
+        return
+
+    ui_items = [item for item in session.items if not item.get_closest_marker("unit")]
+    if not get_base_url() or not any(
+        APP_FIXTURES & set(item.fixturenames) for item in ui_items
+    ):
+        return
+
+    warm_up = WarmUp(
+        get_base_url(),
+        get_credentials(),
+        launch=lambda: launch_browser(config),
+        browsers=int(any("browser" in item.fixturenames for item in ui_items)),
+        timeout=config.getoption("--warmup"),
+    )
+    config.stash[warmup_key] = warm_up
+    report = warm_up.run()
+
+    logger.info(report.summary())
+    config.stash[metadata_key]["Warm-up"] = f"{report.elapsed:.1f} s"
+    writer = config.stash.get(report_writer_key, None)
+    if writer:
+        writer.stage("warm-up", report.elapsed, **asdict(report))
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    token = events.current_test.set(item.nodeid)
+    try:
+        return (yield)
+    finally:
+        events.current_test.reset(token)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+
+    writer = item.config.stash.get(report_writer_key, None)
+    browser = item.funcargs.get("browser")
+    if writer and browser and report.failed and report.when == "call":
+        writer.attach(item.nodeid, "screenshot", browser.get_screenshot_as_png(), "png")
+
+    return report
+
+
+def pytest_unconfigure(config):
+    recorder = config.stash.get(history_key, None)
+    if recorder:
+        recorder.save()
+
+    BasePage.wait_history.save()
+
+    warm_up = config.stash.get(warmup_key, None)
+    if warm_up:
+        warm_up.close()
+
+    if BasePage.visual_checker:
+        BasePage.visual_checker.store.save()
+
+    handler = config.stash.get(event_handler_key, None)
+    if handler:
+        events.uninstall(handler)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    warm_up = config.stash.get(warmup_key, None)
+    if warm_up:
+        terminalreporter.section("warm-up")
+        terminalreporter.write_line(warm_up.report.summary())
+
+    cases = config.stash.get(pairwise_key, None)
+    if cases:
+        terminalreporter.section("pairwise contacts")
+        terminalreporter.write_line(cases.summary())
+
+    gc_report = config.stash.get(gc_report_key, None)
+    if gc_report:
+        terminalreporter.section("test data")
+        terminalreporter.write_line(gc_report.summary())
+
+    handler = config.stash.get(event_handler_key, None)
+    if handler:
+        events.uninstall(handler)
+        del config.stash[event_handler_key]
+
+        terminalreporter.section("events")
+        for line in handler.summary():
+            terminalreporter.write_line(line)
+
+    profiler = config.stash.get(command_profiler_key, None)
+    if profiler:
+        terminalreporter.section("webdriver commands")
+        for line in profiler.report():
+            terminalreporter.write_line(line)
+
+    if BasePage.wait_history.recorded or BasePage.wait_history.timeouts:
+        terminalreporter.section("waits")
+        for line in BasePage.wait_history.summary():
+            terminalreporter.write_line(line)
+
+    collected = config.stash.get(telemetry_key, None)
+    if collected:
+        terminalreporter.section("browser telemetry")
+        total = sum((counts for counts, _ in collected.values()), Counter())
+        terminalreporter.write_line(
+            f"{len(collected)} tests: "
+            + ", ".join(f"{kind} {count}" for kind, count in sorted(total.items()))
+        )
+        for test, (_, js_errors) in collected.items():
+            for error in js_errors:
+                terminalreporter.write_line(f"   {test}: {error.describe()}")
+
+    if BasePage.visual_checker:
+        terminalreporter.section("visual")
+        for line in BasePage.visual_checker.summary():
+            terminalreporter.write_line(line)
+
+    recorder = BasePage.performance_recorder
+    if not recorder:
+        return
+
+    terminalreporter.section("page performance (median, ms)")
+    terminalreporter.write_line(
+        f"{'page':<22}{'n':>4}" + "".join(f"{name:>20}" for name in METRIC_NAMES)
+    )
+    for page, summary in recorder.summary().items():
+        terminalreporter.write_line(
+            f"{page:<22}{summary['samples']:>4}"
+            + "".join(
+                f"{'-' if summary[name] is None else round(summary[name]):>20}"
+                for name in METRIC_NAMES
+            )
+        )
+
+    report_path = config.getoption("--perf_report")
+    if report_path:
+        recorder.dump(report_path)
+
+
+def launch_browser(config):
+    return create_browser(
+        config.getoption("--browser_name"),
+        warm_profile=not config.getoption("--fresh_profile"),
+        bidi=config.stash.get(telemetry_key, None) is not None,
+        hub_url=config.getoption("--hub"),
+    )
+
+
+@pytest.fixture
+def browser(request, pytestconfig):
+    collected = pytestconfig.stash.get(telemetry_key, None)
+    warm_up = pytestconfig.stash.get(warmup_key, None)
+
+    # The warm browser is signed in, tests that start signed out get it cleared.
+    browser = (
+        warm_up.take_browser(signed_in="setup_user" in request.fixturenames)
+        if warm_up
+        else None
+    )
+    if browser is None:
+        try:
+            browser = launch_browser(pytestconfig)
+        except ValueError:
+            raise pytest.UsageError("--browser_name should be chrome or firefox")
+
+    profiler = pytestconfig.stash.get(command_profiler_key, None)
+    if browser and profiler:
+        profiler.attach(browser)
+
+    telemetry = None
+    if browser and collected is not None:
+        telemetry = BrowserTelemetry(request.node.nodeid)
+        telemetry.attach(browser)
 
     yield browser
 
+    if telemetry:
+        # Only the summary outlives the test, the event buffer goes with it.
+        collected[request.node.nodeid] = (telemetry.counts(), telemetry.js_errors)
+
     logger.info("Browser quit.")
     if browser:
         browser.quit()
 
 
+@pytest.fixture(scope="session")
+def static_browser():
+    browser = StaticBrowser()
+    yield browser
+    browser.quit()
+
+
+@pytest.fixture
+def api_client(request, pytestconfig):
+    mode = pytestconfig.getoption("--api_cassette")
+    cassette = Cassette(cassette_path(CASSETTES_DIR, request.node.nodeid), mode=mode)
+
+    api = ContactListApi(get_base_url())
+    api.transport = cassette.wrap(api.send)
+
+    email, password = get_credentials()
+    if email and password:
+        api.login(email=email, password=password)
+
+    yield api
+
+    cassette.save()
+
+
 @pytest.fixture(autouse=True)
-def del_all_contacts(browser: webdriver.Firefox | webdriver.Chrome, pytestconfig):
+def del_all_contacts(pytestconfig):
     yield
     if pytestconfig.getoption("--rm"):
-        logger.info("Delete all contacts.")
-        link = base_url + "contactList"
-        contact_list_page = ContactListPage(browser=browser, url=link)
-        contact_list_page.open()
-
-        while True:
-            first_contact = contact_list_page.get_first_contact()
-
-            if first_contact:
-                WebDriverWait(browser, 5).until(
-                    EC.element_to_be_clickable(first_contact)
-                )
-                first_contact.click()
-                contact_details_page = ContactDetailsPage(
-                    browser=browser, url=browser.current_url
-                )
-                contact_details_page.delete_contact()
-                WebDriverWait(browser, 5).until(EC.staleness_of(first_contact))
-                contact_list_page.open()
-            else:
-                break
+        logger.info("Delete contacts created by this run.")
+
+        warm_up = pytestconfig.stash.get(warmup_key, None)
+        api = warm_up.api if warm_up else None
+        if api is None:
+            email, password = get_credentials()
+            if not (email and password):
+                return
+
+            api = ContactListApi(get_base_url())
+            api.login(email=email, password=password)
+
+        for contact in api.get_contacts():
+            if contact.run_id == RUN_ID:
+                api.delete_contact(contact.id)
 
 
 @pytest.fixture(scope="function")
 def setup_user(browser: webdriver.Firefox | webdriver.Chrome):
     logger.info("Setup user with default parameters.")
-    link = base_url + "login"
+    if getattr(browser, "signed_in", False):
+        logger.info("User is already signed in by the warm-up.")
+        return
+
+    link = get_base_url() + "login"
     page = LoginPage(browser=browser, url=link)
     page.open()
 
-    email = os.getenv("MY_EMAIL")
-    password = os.getenv("MY_PASSWORD")
+    email, password = get_credentials()
 
     if email and password:
         page.login(email=email, password=password)
 
 
 @pytest.fixture(scope="function")
-def create_contact_info(browser: webdriver.Firefox | webdriver.Chrome, setup_user):
+def create_contact_info(
+    browser: webdriver.Firefox | webdriver.Chrome, setup_user, request, pytestconfig
+):
     logger.info("Create contact.")
-    link = base_url + "addContact"
+    link = get_base_url() + "addContact"
     page = AddNewContactPage(browser=browser, url=link)
     page.open()
 
     fake = Faker()
-    fake_contact_first_name = fake.first_name()
-    fake_contact_last_name = fake.last_name()
-    fake_contact_date_of_birth = (
-        fake.date_of_birth(minimum_age=6, maximum_age=110)
-    ).strftime("%Y-%m-%d")
-    fake_contact_email = fake.email()
-    fake_contact_phone = fake.basic_phone_number()
-    fake_contact_street_address_1 = fake.street_name()
-    fake_contact_city = fake.city()
-    fake_contact_state = fake.state()
-    fake_contact_postal_code = fake.postalcode()
-    fake_contact_country = fake.country()[:40]
-
-    return (
-        fake_contact_first_name,
-        fake_contact_last_name,
-        fake_contact_date_of_birth,
-        fake_contact_email,
-        fake_contact_phone,
-        fake_contact_street_address_1,
-        fake_contact_city,
-        fake_contact_state,
-        fake_contact_postal_code,
-        fake_contact_country,
-    )
+    if pytestconfig.getoption("--api_cassette") != "off":
+        fake.seed_instance(seed_for(request.node.nodeid))
+    return fake_contact_info(fake)
+
+
+@pytest.fixture(scope="function")
+def pairwise_contact(
+    request, browser: webdriver.Firefox | webdriver.Chrome, setup_user
+):
+    logger.info("Create pairwise contact: %s.", case_id(request.param))
+    return contact_record(request.param)
 
 
 @pytest.fixture(scope="function")
@@ -160,24 +604,24 @@ def created_contact(
     browser: webdriver.Firefox | webdriver.Chrome,
     setup_user,
     create_contact_info,
-    pytestconfig,
+    api_client,
 ):
     logger.info(
-        f"Creating contact wit\n"
-        f"contact first name: {create_contact_info[0]}, last name: {create_contact_info[1]}"
+        "Creating contact with\ncontact first name: %s, last name: %s",
+        create_contact_info.first_name,
+        create_contact_info.last_name,
     )
-    add_new_contact_link = base_url + "addContact"
-    page = AddNewContactPage(browser=browser, url=add_new_contact_link)
-    page.open()
+    # Seed through the API, the add contact form has its own tests.
+    api_client.add_contact(create_contact_info)
 
-    page.add_new_contact(*create_contact_info)
-
-    WebDriverWait(browser, 10).until(EC.url_to_be(base_url + "contactList"))
-
-    contact_list_page = ContactListPage(browser=browser, url=browser.current_url)
+    contact_list_page = ContactListPage(
+        browser=browser, url=get_base_url() + "contactList"
+    )
+    contact_list_page.open()
 
     contact_list_page.go_to_contact_details_by_full_name(
-        first_name=create_contact_info[0], last_name=create_contact_info[1]
+        first_name=create_contact_info.first_name,
+        last_name=create_contact_info.last_name,
     )
 
     contact_details_page = ContactDetailsPage(browser=browser, url=browser.current_url)
@@ -1,14 +1,19 @@
+from __future__ import annotations
+
 import logging as logger
+from typing import TYPE_CHECKING
 
 import pytest
-from selenium import webdriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
-from src.host_config import base_url
+from src.contact_data import ContactRecord, fake_contact_info
+from src.host_config import get_base_url
 from src.pages.add_new_contact_page import AddNewContactPage
+from src.pages.contact_details_page import ContactDetailsPage
 from src.pages.contact_list_page import ContactListPage
 
+if TYPE_CHECKING:
+    from selenium import webdriver
+
 
 @pytest.mark.add_new_contact_page
 class TestAddNewContactPage:
@@ -19,26 +24,28 @@ class TestAddNewContactPage:
     ):
         logger.info("Starting Test: user should be in add new contact page")
 
-        link = base_url + "addContact"
+        link = get_base_url() + "addContact"
         page = AddNewContactPage(browser=browser, url=link)
         page.open()
         page.should_be_add_new_contact_page()
+        page.should_look_like_baseline()
+        page.should_have_no_js_errors()
 
     def test_logout_from_add_new_contact_page(
         self, browser: webdriver.Firefox | webdriver.Chrome, setup_user
     ):
         logger.info("Starting Test: logout from add new contact page")
 
-        link = base_url + "addContact"
+        link = get_base_url() + "addContact"
         page = AddNewContactPage(browser=browser, url=link)
         page.open()
 
         page.logout()
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url))
+        page.wait_for_url(get_base_url())
 
         assert (
-            page.browser.current_url == base_url
+            page.browser.current_url == get_base_url()
         ), f"Wrong URL after logout. URL: {page.browser.current_url}"
 
     def test_cancel_from_add_new_contact_page(
@@ -46,13 +53,13 @@ class TestAddNewContactPage:
     ):
         logger.info("Starting Test: cancel from add new contact page")
 
-        link = base_url + "addContact"
+        link = get_base_url() + "addContact"
         page = AddNewContactPage(browser=browser, url=link)
         page.open()
 
         page.cancel_from_add_new_contact_page()
 
-        WebDriverWait(browser, 5).until(EC.url_changes(link))
+        page.wait_for_url_change(link)
 
         contact_list_page = ContactListPage(browser=browser, url=browser.current_url)
         contact_list_page.should_be_contact_list_page()
@@ -65,19 +72,76 @@ class TestAddNewContactPage:
     ):
         logger.info("Starting Test: add new contact")
 
-        link = base_url + "addContact"
+        link = get_base_url() + "addContact"
         page = AddNewContactPage(browser=browser, url=link)
         page.open()
 
-        page.add_new_contact(*create_contact_info)
+        page.add_new_contact(create_contact_info)
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url + "contactList"))
+        page.wait_for_url(get_base_url() + "contactList")
 
         assert (
-            page.browser.current_url == base_url + "contactList"
+            page.browser.current_url == get_base_url() + "contactList"
         ), f"Wrong URL after add new contact. URL: {page.browser.current_url}"
 
         contact_list_page = ContactListPage(browser=browser, url=browser.current_url)
         contact_list_page.find_contact_by_full_name(
-            first_name=create_contact_info[0], last_name=create_contact_info[1]
+            first_name=create_contact_info.first_name,
+            last_name=create_contact_info.last_name,
+        )
+
+    def test_bulk_add_new_contacts(
+        self, browser: webdriver.Firefox | webdriver.Chrome, setup_user
+    ):
+        logger.info("Starting Test: bulk add new contacts")
+
+        contacts = [fake_contact_info() for _ in range(6)]
+
+        link = get_base_url() + "addContact"
+        page = AddNewContactPage(browser=browser, url=link)
+        page.open()
+
+        result = page.add_new_contacts(contacts, tabs=3)
+
+        assert len(result.latencies) == len(
+            contacts
+        ), f"Added {len(result.latencies)} of {len(contacts)} contacts."
+
+        contact_list_page = ContactListPage(
+            browser=browser, url=get_base_url() + "contactList"
+        )
+        contact_list_page.open()
+        for contact in contacts:
+            contact_list_page.find_contact_by_full_name(
+                first_name=contact.first_name, last_name=contact.last_name
+            )
+
+    def test_add_pairwise_contact(
+        self,
+        browser: webdriver.Firefox | webdriver.Chrome,
+        setup_user,
+        pairwise_contact: ContactRecord,
+    ):
+        logger.info("Starting Test: add pairwise contact")
+
+        link = get_base_url() + "addContact"
+        page = AddNewContactPage(browser=browser, url=link)
+        page.open()
+
+        page.add_new_contact(pairwise_contact)
+
+        page.wait_for_url(get_base_url() + "contactList")
+
+        contact_list_page = ContactListPage(browser=browser, url=browser.current_url)
+        contact_list_page.go_to_contact_details_by_full_name(
+            first_name=pairwise_contact.first_name,
+            last_name=pairwise_contact.last_name,
+        )
+
+        contact = ContactDetailsPage(browser=browser, url=browser.current_url)
+        stored = contact.get_contact()
+
+        assert stored == pairwise_contact, (
+            f"Incorrect contact after add\n"
+            f"Differences: {pairwise_contact.diff(stored)}"
         )
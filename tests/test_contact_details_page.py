@@ -1,15 +1,19 @@
+from __future__ import annotations
+
 import logging as logger
+from typing import TYPE_CHECKING
 
 import pytest
-from selenium import webdriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
-from src.host_config import base_url
+from src.contact_data import ContactRecord
+from src.host_config import get_base_url
 from src.pages.contact_details_page import ContactDetailsPage
 from src.pages.contact_list_page import ContactListPage
 from src.pages.edit_contact_page import EditContactPage
 
+if TYPE_CHECKING:
+    from selenium import webdriver
+
 
 @pytest.mark.contact_details_page
 class TestContactDetailsPage:
@@ -19,19 +23,21 @@ class TestContactDetailsPage:
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting Test: user should be in contact details page.")
 
         page, _ = created_contact
 
         page.should_be_contact_details_page()
+        page.should_look_like_baseline()
+        page.should_have_no_js_errors()
 
     def test_logout_from_contact_details_page(
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting Test: logout from contact details page.")
 
@@ -39,17 +45,17 @@ class TestContactDetailsPage:
 
         page.logout()
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url))
+        page.wait_for_url(get_base_url())
 
         assert (
-            page.browser.current_url == base_url
+            page.browser.current_url == get_base_url()
         ), f"Wrong URL after logout. URL: {page.browser.current_url}"
 
     def test_return_to_contact_list(
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting Test: return to contact list.")
 
@@ -64,7 +70,7 @@ class TestContactDetailsPage:
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting Test: delete contact.")
 
@@ -72,19 +78,19 @@ class TestContactDetailsPage:
 
         page.delete_contact()
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url + "contactList"))
+        page.wait_for_url(get_base_url() + "contactList")
 
         contact_list_page = ContactListPage(browser=browser, url=browser.current_url)
         contact_list_page.should_be_contact_list_page()
         contact_list_page.contact_is_not_present_in_contact_list(
-            first_name=contact_info[0], last_name=contact_info[1]
+            first_name=contact_info.first_name, last_name=contact_info.last_name
         )
 
     def test_user_can_go_to_edit_contact(
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting Test: user can go to edit contact.")
 
@@ -92,7 +98,7 @@ class TestContactDetailsPage:
 
         page.go_to_edit_contact_page()
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url + "editContact"))
+        page.wait_for_url(get_base_url() + "editContact")
 
         edit_contact_page = EditContactPage(browser=browser, url=browser.current_url)
         edit_contact_page.should_be_edit_contact_page()
@@ -1,15 +1,18 @@
+from __future__ import annotations
+
 import logging as logger
+from typing import TYPE_CHECKING
 
 import pytest
-from selenium import webdriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
-from src.host_config import base_url
+from src.host_config import get_base_url
 from src.pages.add_new_contact_page import AddNewContactPage
 from src.pages.contact_details_page import ContactDetailsPage
 from src.pages.contact_list_page import ContactListPage
 
+if TYPE_CHECKING:
+    from selenium import webdriver
+
 
 @pytest.mark.contact_list
 class TestContactListPage:
@@ -20,23 +23,25 @@ class TestContactListPage:
     ):
         logger.info("Starting Test: user should be in contact list page.")
 
-        link = base_url + "contactList"
+        link = get_base_url() + "contactList"
         page = ContactListPage(browser=browser, url=link)
         page.open()
         page.should_be_contact_list_page()
+        page.should_look_like_baseline()
+        page.should_have_no_js_errors()
 
     def test_logout(self, browser: webdriver.Firefox | webdriver.Chrome, setup_user):
         logger.info("Starting Test: logout.")
 
-        link = base_url + "contactList"
+        link = get_base_url() + "contactList"
         page = ContactListPage(browser=browser, url=link)
         page.open()
         page.logout()
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url))
+        page.wait_for_url(get_base_url())
 
         assert (
-            page.browser.current_url == base_url
+            page.browser.current_url == get_base_url()
         ), f"Wrong URL after logout. URL: {page.browser.current_url}"
 
     def test_user_can_go_to_add_new_contact(
@@ -44,7 +49,7 @@ class TestContactListPage:
     ):
         logger.info("Starting Test: user can go to add new contact.")
 
-        link = base_url + "contactList"
+        link = get_base_url() + "contactList"
         page = ContactListPage(browser=browser, url=link)
         page.open()
         page.go_to_add_new_contact()
@@ -61,21 +66,48 @@ class TestContactListPage:
         create_contact_info,
     ):
         logger.info("Starting Test: user can go to contact details.")
-        add_new_contact_link = base_url + "addContact"
+        add_new_contact_link = get_base_url() + "addContact"
         page = AddNewContactPage(browser=browser, url=add_new_contact_link)
         page.open()
 
-        page.add_new_contact(*create_contact_info)
+        page.add_new_contact(create_contact_info)
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url + "contactList"))
+        page.wait_for_url(get_base_url() + "contactList")
 
         contact_list_page = ContactListPage(browser=browser, url=browser.current_url)
 
         contact_list_page.go_to_contact_details_by_full_name(
-            first_name=create_contact_info[0], last_name=create_contact_info[1]
+            first_name=create_contact_info.first_name,
+            last_name=create_contact_info.last_name,
         )
 
         contact_details_page = ContactDetailsPage(
             browser=browser, url=browser.current_url
         )
         contact_details_page.should_be_contact_details_page()
+
+    def test_contact_rows_are_read_in_chunks(
+        self,
+        browser: webdriver.Firefox | webdriver.Chrome,
+        setup_user,
+        create_contact_info,
+    ):
+        logger.info("Starting Test: contact rows are read in chunks.")
+        add_new_contact_link = get_base_url() + "addContact"
+        page = AddNewContactPage(browser=browser, url=add_new_contact_link)
+        page.open()
+
+        page.add_new_contact(create_contact_info)
+
+        page.wait_for_url(get_base_url() + "contactList")
+
+        contact_list_page = ContactListPage(browser=browser, url=browser.current_url)
+        rows = list(contact_list_page.iter_contact_rows(chunk_size=2))
+
+        assert create_contact_info.full_name in [
+            row.full_name for row in rows
+        ], f"{create_contact_info.full_name} not in the contact list."
+        assert contact_list_page.round_trips == len(rows) // 2 + 1, (
+            f"Expected {len(rows) // 2 + 1} round trips for {len(rows)} rows, "
+            f"received: {contact_list_page.round_trips}"
+        )
@@ -1,15 +1,19 @@
+from __future__ import annotations
+
 import logging as logger
+from typing import TYPE_CHECKING
 
 import pytest
 from faker import Faker
-from selenium import webdriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
-from src.host_config import base_url
+from src.contact_data import ContactRecord, fake_contact_info
+from src.host_config import get_base_url
 from src.pages.contact_details_page import ContactDetailsPage
 from src.pages.edit_contact_page import EditContactPage
 
+if TYPE_CHECKING:
+    from selenium import webdriver
+
 
 @pytest.mark.edit_contact_page
 class TestEditContactPage:
@@ -19,7 +23,7 @@ class TestEditContactPage:
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting Test: user should be in edit contact page")
 
@@ -29,12 +33,14 @@ class TestEditContactPage:
         page = EditContactPage(browser=browser, url=browser.current_url)
 
         page.should_be_edit_contact_page()
+        page.should_look_like_baseline()
+        page.should_have_no_js_errors()
 
     def test_logout_from_edit_contact_page(
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting Test: logout from edit contact page")
 
@@ -45,17 +51,17 @@ class TestEditContactPage:
 
         page.logout()
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url))
+        page.wait_for_url(get_base_url())
 
         assert (
-            page.browser.current_url == base_url
+            page.browser.current_url == get_base_url()
         ), f"Wrong URL after logout. URL: {page.browser.current_url}"
 
     def test_return_to_contact_details(
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting Test: return to contact details from edit contact page.")
 
@@ -75,7 +81,7 @@ class TestEditContactPage:
         self,
         browser: webdriver.Firefox | webdriver.Chrome,
         setup_user,
-        created_contact: tuple[ContactDetailsPage, tuple],
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
     ):
         logger.info("Starting test: edit contact.")
 
@@ -99,3 +105,47 @@ class TestEditContactPage:
             f"Incorrect phone number of a contact\n"
             f"Expected: {fake_new_phone}, received: {new_phone}"
         )
+
+    def test_edit_all_contact_fields(
+        self,
+        browser: webdriver.Firefox | webdriver.Chrome,
+        setup_user,
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
+    ):
+        logger.info("Starting test: edit all contact fields at once.")
+
+        contact_page, contact_info = created_contact
+        contact_page.go_to_edit_contact_page()
+
+        page = EditContactPage(browser=browser, url=browser.current_url)
+
+        new_info = fake_contact_info()
+        diff = page.edit_fields(new_info)
+
+        expected = contact_info.diff(new_info)
+        assert diff == expected, (
+            f"Incorrect contact after edit\n"
+            f"Expected changes: {expected}, received: {diff}"
+        )
+
+    def test_edit_contact_to_pairwise_case(
+        self,
+        browser: webdriver.Firefox | webdriver.Chrome,
+        setup_user,
+        created_contact: tuple[ContactDetailsPage, ContactRecord],
+        pairwise_contact: ContactRecord,
+    ):
+        logger.info("Starting test: edit contact to a pairwise case.")
+
+        contact_page, contact_info = created_contact
+        contact_page.go_to_edit_contact_page()
+
+        page = EditContactPage(browser=browser, url=browser.current_url)
+
+        diff = page.edit_fields(dict(pairwise_contact.items()))
+
+        expected = contact_info.diff(pairwise_contact)
+        assert diff == expected, (
+            f"Incorrect contact after edit\n"
+            f"Expected changes: {expected}, received: {diff}"
+        )
@@ -1,18 +1,16 @@
+from __future__ import annotations
+
 import logging as logger
-import os
+from typing import TYPE_CHECKING
 
 import pytest
-from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
-from src.host_config import base_url
+from src.host_config import get_base_url, get_credentials
 from src.pages.login_page import LoginPage
 from src.pages.register_page import RegisterPage
 
-
-load_dotenv()
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 
 @pytest.mark.login
@@ -23,34 +21,35 @@ class TestLoginPage:
         self, browser: webdriver.Firefox | webdriver.Chrome
     ):
         logger.info("Starting Test: user should be in login page")
-        link = base_url + "login"
+        link = get_base_url() + "login"
         page = LoginPage(browser=browser, url=link)
         page.open()
         page.should_be_login_page()
+        page.should_look_like_baseline()
+        page.should_have_no_js_errors()
 
     def test_login(self, browser: webdriver.Firefox | webdriver.Chrome, setup_user):
         logger.info("Starting Test: login")
-        link = base_url + "login"
+        link = get_base_url() + "login"
         page = LoginPage(browser=browser, url=link)
         page.open()
 
-        email = os.getenv("MY_EMAIL")
-        password = os.getenv("MY_PASSWORD")
+        email, password = get_credentials()
 
         if email and password:
             page.login(email=email, password=password)
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url + "contactList"))
+        page.wait_for_url(get_base_url() + "contactList")
 
         assert (
-            page.browser.current_url == base_url + "contactList"
+            page.browser.current_url == get_base_url() + "contactList"
         ), f"Wrong URL after login. URL: {page.browser.current_url}"
 
     def test_user_can_go_to_register_page(
         self, browser: webdriver.Firefox | webdriver.Chrome
     ):
         logger.info("Starting Test: go to register page.")
-        link = base_url + "login"
+        link = get_base_url() + "login"
         page = LoginPage(browser=browser, url=link)
         page.open()
 
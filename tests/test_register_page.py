@@ -1,15 +1,18 @@
+from __future__ import annotations
+
 import logging as logger
+from typing import TYPE_CHECKING
 
 import pytest
 from faker import Faker
-from selenium import webdriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
-from src.host_config import base_url
+from src.host_config import get_base_url
 from src.pages.login_page import LoginPage
 from src.pages.register_page import RegisterPage
 
+if TYPE_CHECKING:
+    from selenium import webdriver
+
 
 @pytest.mark.register
 class TestRegisterPage:
@@ -19,14 +22,16 @@ class TestRegisterPage:
         self, browser: webdriver.Firefox | webdriver.Chrome
     ):
         logger.info("Starting Test: user should be in register page")
-        link = base_url + "addUser"
+        link = get_base_url() + "addUser"
         page = RegisterPage(browser=browser, url=link)
         page.open()
         page.should_be_register_page()
+        page.should_look_like_baseline()
+        page.should_have_no_js_errors()
 
     def test_register_new_user(self, browser: webdriver.Firefox | webdriver.Chrome):
         logger.info("Starting Test: register new user.")
-        link = base_url + "addUser"
+        link = get_base_url() + "addUser"
         page = RegisterPage(browser=browser, url=link)
         page.open()
 
@@ -36,8 +41,11 @@ class TestRegisterPage:
         user_email = fake.email()
         user_password = fake.password(length=8, special_chars=False)
         logger.info(
-            f"Create fake user with\n"
-            f"first name: {user_first_name}, last name: {user_last_name}, email: {user_email}, password: {user_password}"
+            "Create fake user with\nfirst name: %s, last name: %s, email: %s, password: %s",
+            user_first_name,
+            user_last_name,
+            user_email,
+            user_password,
         )
 
         page.register_new_user(
@@ -47,10 +55,10 @@ class TestRegisterPage:
             password=user_password,
         )
 
-        WebDriverWait(browser, 10).until(EC.url_to_be(base_url + "contactList"))
+        page.wait_for_url(get_base_url() + "contactList")
 
         assert (
-            page.browser.current_url == base_url + "contactList"
+            page.browser.current_url == get_base_url() + "contactList"
         ), f"Wrong URL after register. URL: {page.browser.current_url}"
 
     @pytest.mark.negative
@@ -58,7 +66,7 @@ class TestRegisterPage:
         self, browser: webdriver.Firefox | webdriver.Chrome
     ):
         logger.info("Starting Test: register new user.")
-        link = base_url + "addUser"
+        link = get_base_url() + "addUser"
         page = RegisterPage(browser=browser, url=link)
         page.open()
 
@@ -68,8 +76,11 @@ class TestRegisterPage:
         user_email = fake.email()
         user_password = fake.password(length=4, special_chars=False)
         logger.info(
-            f"Create fake user with\n"
-            f"first name: {user_first_name}, last name: {user_last_name}, email: {user_email}, password: {user_password}"
+            "Create fake user with\nfirst name: %s, last name: %s, email: %s, password: %s",
+            user_first_name,
+            user_last_name,
+            user_email,
+            user_password,
         )
 
         page.register_new_user(
@@ -85,7 +96,7 @@ class TestRegisterPage:
         self, browser: webdriver.Firefox | webdriver.Chrome
     ):
         logger.info("Starting Test: cancel from register page.")
-        link = base_url + "addUser"
+        link = get_base_url() + "addUser"
         page = RegisterPage(browser=browser, url=link)
         page.open()
 
@@ -0,0 +1,45 @@
+import logging as logger
+
+import pytest
+
+from src.host_config import get_base_url
+from src.pages.add_new_contact_page import AddNewContactPage
+from src.pages.contact_list_page import ContactListPage
+from src.pages.login_page import LoginPage
+from src.pages.register_page import RegisterPage
+from src.static_dom import StaticBrowser
+
+
+@pytest.mark.static
+class TestStaticPages:
+    def test_login_page_structure(self, static_browser: StaticBrowser):
+        logger.info("Starting Test: login page structure without a browser")
+
+        page = LoginPage(browser=static_browser, url=get_base_url() + "login")
+        page.open()
+        page.should_be_login_page()
+
+    def test_register_page_structure(self, static_browser: StaticBrowser):
+        logger.info("Starting Test: register page structure without a browser")
+
+        page = RegisterPage(browser=static_browser, url=get_base_url() + "addUser")
+        page.open()
+        page.should_be_register_page()
+
+    def test_contact_list_page_structure(self, static_browser: StaticBrowser):
+        logger.info("Starting Test: contact list page structure without a browser")
+
+        page = ContactListPage(
+            browser=static_browser, url=get_base_url() + "contactList"
+        )
+        page.open()
+        page.should_be_contact_list_page()
+
+    def test_add_new_contact_page_structure(self, static_browser: StaticBrowser):
+        logger.info("Starting Test: add new contact page structure without a browser")
+
+        page = AddNewContactPage(
+            browser=static_browser, url=get_base_url() + "addContact"
+        )
+        page.open()
+        page.should_be_add_new_contact_page()
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from src.contact_data import ContactRecord
+from src.locators import AddNewContactPageLocators, ContactListPageLocators
+from src.pages.add_new_contact_page import (
+    FILL_AND_SUBMIT_SCRIPT,
+    SUBMIT_LATENCY_SCRIPT,
+    AddNewContactPage,
+)
+from src.pages.base_page import BasePage
+from src.waits import WaitHistory
+
+
+class FakeTabs:
+    # Every tab lands on the contact list 200 ms after its submit, loading a
+    # page takes 50 ms of the test's time.
+    def __init__(self):
+        self.tabs = {"tab-0": AddNewContactPageLocators.ADD_NEW_CONTACT_PAGE_URL}
+        self.current_window_handle = "tab-0"
+        self.switch_to = self
+
+    @property
+    def current_url(self):
+        return self.tabs[self.current_window_handle]
+
+    def new_window(self, kind):
+        self.current_window_handle = f"tab-{len(self.tabs)}"
+        self.tabs[self.current_window_handle] = "about:blank"
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def close(self):
+        del self.tabs[self.current_window_handle]
+
+    def get(self, url):
+        time.sleep(0.05)
+        self.tabs[self.current_window_handle] = url
+
+    def execute_script(self, script, *args):
+        if script == FILL_AND_SUBMIT_SCRIPT:
+            self.tabs[self.current_window_handle] = (
+                ContactListPageLocators.CONTACT_LIST_PAGE_URL
+            )
+            return None
+        assert script == SUBMIT_LATENCY_SCRIPT
+        return 200.0
+
+
+@pytest.fixture(autouse=True)
+def history(monkeypatch):
+    monkeypatch.setattr(BasePage, "wait_history", WaitHistory())
+
+
+@pytest.mark.unit
+class TestAddNewContactPage:
+    def test_bulk_add_latency_is_measured_in_the_tab(self):
+        browser = FakeTabs()
+        page = AddNewContactPage(browser, browser.current_url)
+
+        result = page.add_new_contacts(
+            [ContactRecord(first_name=f"Ann{number}") for number in range(6)], tabs=3
+        )
+
+        assert result.latencies == [0.2] * 6
+        assert list(browser.tabs) == ["tab-0"]
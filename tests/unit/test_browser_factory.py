@@ -0,0 +1,92 @@
+import json
+import os
+
+import pytest
+
+from src import browser_factory
+
+
+@pytest.fixture
+def binaries_cache(tmp_path, monkeypatch):
+    cache_path = tmp_path / "binaries.json"
+    monkeypatch.setattr(browser_factory, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(browser_factory, "BINARIES_CACHE", str(cache_path))
+    browser_factory.resolve_binaries.cache_clear()
+    yield cache_path
+    browser_factory.resolve_binaries.cache_clear()
+
+
+@pytest.mark.unit
+class TestBrowserFactory:
+    def test_unknown_browser(self):
+        with pytest.raises(ValueError):
+            browser_factory.create_browser("opera")
+
+    def test_resolved_paths_are_cached(self, tmp_path, binaries_cache, monkeypatch):
+        firefox = tmp_path / "firefox"
+        geckodriver = tmp_path / "geckodriver"
+        firefox.touch()
+        geckodriver.touch()
+        monkeypatch.setenv("FIREFOX_PATH", str(firefox))
+        monkeypatch.setenv("GECKODRIVER_PATH", str(geckodriver))
+
+        assert browser_factory.resolve_binaries("firefox") == (
+            str(firefox),
+            str(geckodriver),
+        )
+        assert json.loads(binaries_cache.read_text()) == {
+            "FIREFOX_PATH": str(firefox),
+            "GECKODRIVER_PATH": str(geckodriver),
+        }
+
+        monkeypatch.delenv("FIREFOX_PATH")
+        monkeypatch.delenv("GECKODRIVER_PATH")
+        browser_factory.resolve_binaries.cache_clear()
+
+        assert browser_factory.resolve_binaries("firefox") == (
+            str(firefox),
+            str(geckodriver),
+        )
+
+    def test_stale_cached_path_is_dropped(self, binaries_cache, monkeypatch):
+        binaries_cache.write_text(json.dumps({"CHROMEDRIVER_PATH": "/missing/driver"}))
+        monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+        monkeypatch.setattr(browser_factory.shutil, "which", lambda command: None)
+
+        assert browser_factory.resolve_binaries("chrome")[1] is None
+        assert json.loads(binaries_cache.read_text()) == {}
+
+    def test_corrupt_cache_is_rebuilt(self, binaries_cache, monkeypatch):
+        binaries_cache.write_text('{"FIREFOX_PATH": "/usr/bi')
+        monkeypatch.setattr(browser_factory.shutil, "which", lambda command: None)
+
+        assert browser_factory.resolve_binaries("firefox") == (None, None)
+        assert json.loads(binaries_cache.read_text()) == {}
+
+    def test_hub_does_not_need_local_binaries(self, binaries_cache, monkeypatch):
+        from selenium import webdriver
+
+        monkeypatch.setattr(browser_factory.shutil, "which", lambda command: None)
+        monkeypatch.setattr(
+            webdriver, "Remote", lambda command_executor, options: options
+        )
+
+        options = browser_factory.create_browser(
+            "chrome", hub_url="http://127.0.0.1:4444"
+        )
+
+        assert options.binary_location == ""
+        assert options.to_capabilities()[browser_factory.HUB_CLIENT_CAPABILITY]
+
+    def test_copy_profile_skips_locks(self, tmp_path):
+        template = tmp_path / "template"
+        template.mkdir()
+        (template / "user.js").write_text("user_pref();")
+        (template / ".parentlock").touch()
+        (template / "SingletonLock").touch()
+
+        session_profile = browser_factory.copy_profile(str(template))
+        try:
+            assert sorted(os.listdir(session_profile)) == ["user.js"]
+        finally:
+            browser_factory.shutil.rmtree(session_profile)
@@ -0,0 +1,284 @@
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import urllib3
+
+from src.browser_hub import (
+    BrowserHub,
+    Driver,
+    FairQueue,
+    HubState,
+    Ticket,
+    make_handler,
+    parse_capacity,
+    requested_browser,
+)
+
+session_ids = itertools.count(1)
+
+
+class FakeDriverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    commands: list[tuple[str, str]] = []
+    sessions: list[dict] = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, value):
+        data = json.dumps({"value": value}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.commands.append((method, self.path))
+
+        if self.path == "/status":
+            return self._respond({"ready": True})
+        if self.path == "/session":
+            assert "its:client" not in json.dumps(body)
+            self.sessions.append(body["capabilities"])
+            browser = body["capabilities"]["alwaysMatch"]["browserName"]
+            return self._respond(
+                {
+                    "sessionId": f"session-{next(session_ids)}",
+                    "capabilities": {"browserName": browser},
+                }
+            )
+        if self.path.endswith("/window/handles"):
+            return self._respond(["main"])
+        if self.path.endswith("/url") and method == "GET":
+            return self._respond("about:blank")
+        return self._respond(None)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def serve(handler) -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def fake_driver():
+    FakeDriverHandler.commands = []
+    FakeDriverHandler.sessions = []
+    server, url = serve(FakeDriverHandler)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+class CountingDriver(Driver):
+    stops = 0
+
+    def stop(self):
+        type(self).stops += 1
+
+
+def start_hub(fake_driver: str, state: HubState) -> tuple[ThreadingHTTPServer, str]:
+    hub = BrowserHub(
+        state,
+        launcher=lambda browser: Driver(browser, None, fake_driver, "/opt/firefox"),
+        queue_timeout=0.3,
+    )
+    return serve(make_handler(hub))
+
+
+def new_session(pool, hub_url, browser="firefox", client="run-1"):
+    response = pool.request(
+        "POST",
+        hub_url + "/session",
+        body=json.dumps(
+            {
+                "capabilities": {
+                    "alwaysMatch": {"browserName": browser, "its:client": client},
+                    "firstMatch": [{}],
+                }
+            }
+        ),
+    )
+    return response.status, json.loads(response.data)["value"]
+
+
+@pytest.mark.unit
+class TestBrowserHub:
+    def test_fair_queue_round_robins_clients(self):
+        queue = FairQueue()
+        for client, browser in [("a", "firefox")] * 3 + [("b", "firefox")]:
+            queue.push(Ticket(client, browser))
+        queue.push(Ticket("c", "chrome"))
+
+        order = []
+        while (
+            ticket := queue.pop(lambda ticket: ticket.browser == "firefox")
+        ) is not None:
+            order.append(ticket.client)
+
+        assert order == ["a", "b", "a", "a"]
+        assert queue.waiting() == {"c": 1}
+
+    def test_capacity_and_reuse(self):
+        state = HubState({"firefox": 1, "chrome": 1}, max_sessions=1, max_reuse=2)
+
+        slot, evicted = state.acquire("a", "firefox", 0.1)
+        assert evicted == []
+        with pytest.raises(TimeoutError):
+            state.acquire("b", "firefox", 0.05)
+
+        state.register(slot, Driver("firefox", None, "http://driver"), "s1", {})
+        assert state.reusable(slot)
+        state.release(slot, keep=True)
+
+        reused, _ = state.acquire("b", "firefox", 0.1)
+        assert reused is slot and reused.uses == 2
+        assert not state.reusable(reused)
+        state.release(reused, keep=True)
+
+        # The parked Firefox makes room for a Chrome under the session cap.
+        chrome, evicted = state.acquire("c", "chrome", 0.1)
+        assert chrome.browser == "chrome"
+        assert evicted == [slot]
+
+        metrics = state.metrics()
+        assert metrics["busy"] == {"firefox": 0, "chrome": 1}
+        assert metrics["launched"] == 2
+        assert metrics["reused"] == 1
+        assert metrics["timeouts"] == 1
+
+    def test_reuse_needs_the_same_capabilities(self):
+        state = HubState({"firefox": 1}, max_sessions=2, max_reuse=5)
+        plain = {"alwaysMatch": {"browserName": "firefox"}}
+        bidi = {"alwaysMatch": {"browserName": "firefox", "webSocketUrl": True}}
+
+        slot, _ = state.acquire("a", "firefox", 0.1, plain)
+        state.register(slot, Driver("firefox", None, "http://driver"), "s1", {})
+        state.release(slot, keep=True)
+
+        other, evicted = state.acquire("b", "firefox", 0.1, bidi)
+        assert other is not slot and evicted == [slot]
+        assert other.requested == bidi
+
+    def test_idle_sessions_are_reaped(self):
+        state = HubState({"firefox": 1}, max_sessions=1)
+        slot, _ = state.acquire("crashed", "firefox", 0.1)
+        state.register(slot, Driver("firefox", None, "http://driver"), "s1", {})
+
+        assert state.reap(idle_timeout=60) == []
+        state.session("s1")
+        slot.last_seen -= 120
+
+        assert state.reap(idle_timeout=60) == [slot]
+        assert state.session("s1") is None
+        assert state.metrics()["expired"] == 1
+        state.acquire("next", "firefox", 0.1)
+
+    def test_driver_is_stopped_when_session_fails(self):
+        CountingDriver.stops = 0
+        state = HubState({"firefox": 1}, max_sessions=1)
+        # Nothing listens on the driver port, so creating the session fails.
+        hub = BrowserHub(
+            state,
+            launcher=lambda browser: CountingDriver(
+                browser, None, "http://127.0.0.1:9"
+            ),
+        )
+        body = json.dumps({"capabilities": {"alwaysMatch": {"browserName": "firefox"}}})
+
+        status, value = hub.new_session(body.encode())
+
+        assert status == 500 and value["value"]["error"] == "session not created"
+        assert CountingDriver.stops == 1
+        assert state.slots == []
+
+    def test_reuse_is_refused_above_memory_limit(self):
+        state = HubState({"firefox": 1}, 1, max_reuse=10, max_rss_mb=1000)
+        slot, _ = state.acquire("a", "firefox", 0.1)
+
+        assert state.reusable(slot, rss_mb=500)
+        assert not state.reusable(slot, rss_mb=1500)
+
+    def test_parse_capacity_and_requested_browser(self):
+        assert parse_capacity("firefox=2, chromium=1") == {"firefox": 2, "chrome": 1}
+        with pytest.raises(ValueError):
+            parse_capacity("opera=1")
+
+        assert requested_browser(
+            {"alwaysMatch": {}, "firstMatch": [{"browserName": "Chrome"}]}
+        ) == ("chrome", "anonymous")
+
+    def test_hub_proxies_webdriver_sessions(self, fake_driver):
+        state = HubState({"firefox": 1}, max_sessions=1, max_reuse=5)
+        server, hub_url = start_hub(fake_driver, state)
+        pool = urllib3.PoolManager()
+
+        try:
+            status, value = new_session(pool, hub_url)
+            assert status == 200
+            session_id = value["sessionId"]
+            assert FakeDriverHandler.sessions[0]["alwaysMatch"][
+                "moz:firefoxOptions"
+            ] == {"binary": "/opt/firefox"}
+
+            url = pool.request("GET", f"{hub_url}/session/{session_id}/url")
+            assert json.loads(url.data) == {"value": "about:blank"}
+
+            status, busy = new_session(pool, hub_url, client="run-2")
+            assert status == 500
+            assert busy["error"] == "session not created"
+
+            pool.request("DELETE", f"{hub_url}/session/{session_id}")
+            assert ("DELETE", f"/session/{session_id}/cookie") in (
+                FakeDriverHandler.commands
+            )
+            assert ("DELETE", f"/session/{session_id}") not in (
+                FakeDriverHandler.commands
+            )
+
+            status, value = new_session(pool, hub_url, client="run-2")
+            assert value["sessionId"] == session_id
+
+            unknown = pool.request("GET", f"{hub_url}/session/missing/url")
+            assert unknown.status == 404
+
+            metrics = json.loads(pool.request("GET", hub_url + "/metrics").data)
+            assert metrics["launched"] == 1
+            assert metrics["reused"] == 1
+            assert metrics["clients"] == ["run-2"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_selenium_remote_talks_to_hub(self, fake_driver):
+        from selenium import webdriver
+
+        server, hub_url = start_hub(fake_driver, HubState({"firefox": 1}, 1))
+
+        try:
+            browser = webdriver.Remote(
+                command_executor=hub_url, options=webdriver.FirefoxOptions()
+            )
+            assert browser.current_url == "about:blank"
+            browser.quit()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert FakeDriverHandler.commands[-1][0] == "DELETE"
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from faker import Faker
+
+from src.api_client import ContactListApi
+from src.cassette import Cassette, CassetteMiss, cassette_path, seed_for
+from src.contact_data import ContactRecord, fake_contact_info
+
+
+class FakeBackend:
+    def __init__(self):
+        self.calls = 0
+        self.contacts = {}
+
+    def send(self, method, path, body=None):
+        self.calls += 1
+        if path == "/users/login":
+            return 200, {"user": {"_id": "u1"}, "token": "secret-token"}
+        if method == "POST" and path == "/contacts":
+            contact_id = f"{len(self.contacts):024x}"
+            self.contacts[contact_id] = {**body, "_id": contact_id, "owner": "u1"}
+            return 201, self.contacts[contact_id]
+        contact_id = path.rsplit("/", 1)[-1]
+        if method == "GET":
+            return 200, self.contacts[contact_id]
+        return 200, "Contact deleted"
+
+
+def run_journey(api):
+    api.login("user@example.com", "password")
+    contact = api.add_contact(ContactRecord(first_name="Ann", last_name="Lee"))
+    fetched = api.get_contact(contact.id)
+    api.delete_contact(contact.id)
+    return fetched
+
+
+@pytest.mark.unit
+class TestCassette:
+    def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / "journey.jsonl")
+        backend = FakeBackend()
+
+        api = ContactListApi("https://example.com/")
+        recorder = Cassette(path, mode="record")
+        api.transport = recorder.wrap(backend.send)
+        recorded = run_journey(api)
+        recorder.save()
+
+        api = ContactListApi("https://example.com/")
+        api.transport = Cassette(path, mode="replay").wrap(backend.send)
+        replayed = run_journey(api)
+
+        assert backend.calls == 4
+        assert replayed == recorded
+        assert replayed.id != recorded.id
+
+    def test_replays_generated_contact_of_suite_test(self, tmp_path):
+        nodeid = "tests/test_contact_details_page.py::TestContactDetailsPage::test_x"
+        path = cassette_path(str(tmp_path), nodeid)
+        backend = FakeBackend()
+
+        def seed_contact(api):
+            fake = Faker()
+            fake.seed_instance(seed_for(nodeid))
+            api.login("user@example.com", "password")
+            return api.add_contact(fake_contact_info(fake))
+
+        api = ContactListApi("https://example.com/")
+        recorder = Cassette(path, mode="record")
+        api.transport = recorder.wrap(backend.send)
+        recorded = seed_contact(api)
+        recorder.save()
+
+        api = ContactListApi("https://example.com/")
+        api.transport = Cassette(path, mode="replay").wrap(backend.send)
+        replayed = seed_contact(api)
+
+        assert path.endswith(
+            "test_contact_details_page/TestContactDetailsPage_test_x.jsonl"
+        )
+        assert backend.calls == 2
+        assert replayed == recorded
+
+    def test_secrets_and_ids_are_not_stored(self, tmp_path):
+        path = tmp_path / "journey.jsonl"
+        api = ContactListApi("https://example.com/")
+        recorder = Cassette(str(path), mode="record")
+        api.transport = recorder.wrap(FakeBackend().send)
+        contact = run_journey(api)
+        recorder.save()
+
+        content = path.read_text()
+        assert "secret-token" not in content
+        assert '"password":"password"' not in content
+        assert contact.id not in content
+        assert json.loads(content.splitlines()[2])["path"] == "/contacts/{{id:1}}"
+
+    def test_unmatched_request(self, tmp_path):
+        path = tmp_path / "empty.jsonl"
+        path.write_text("")
+        api = ContactListApi("https://example.com/")
+        api.transport = Cassette(str(path), mode="replay").wrap(None)
+
+        with pytest.raises(CassetteMiss):
+            api.get_contacts()
@@ -0,0 +1,55 @@
+import pytest
+
+from src.command_profiler import CommandProfiler
+from src.pages.base_page import BasePage
+
+
+class FakeDriver:
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+    def find_element(self, how, what):
+        return self.execute("findElement", {"using": how, "value": what})
+
+    def find_elements(self, how, what):
+        return self.execute("findElements", {"using": how, "value": what})["value"]
+
+    def click(self):
+        return self.execute("clickElement")
+
+
+class FakePage(BasePage):
+    def fill(self):
+        self.browser.find_element("css selector", "#email")
+        self.browser.find_element("css selector", "#password")
+        self.browser.click()
+
+    def fill_and_check(self):
+        self.fill()
+        self.is_element_present("css selector", "#email", timeout=0)
+
+
+@pytest.mark.unit
+class TestCommandProfiler:
+    def test_commands_are_attributed_to_page_methods(self):
+        profiler = CommandProfiler()
+        driver = profiler.attach(FakeDriver())
+        page = FakePage(browser=driver, url="https://example.com/")
+
+        # Calls from one line in a loop are still told apart.
+        for _ in range(3):
+            page.fill()
+        page.fill_and_check()
+        driver.execute("getCurrentUrl")
+
+        methods = {method.name: method for method in profiler.per_page_method()}
+        fill = methods["FakePage.fill"]
+        assert (fill.calls, fill.commands, fill.element_commands) == (4, 12, 12)
+        assert fill.batchable == 8
+        # The BasePage helper counts toward the page method that called it.
+        assert methods["FakePage.fill_and_check"].commands == 1
+        assert methods["<outside page objects>"].commands == 1
+        assert sum(count for count, _ in profiler.per_test().values()) == 14
+        report = "\n".join(profiler.report())
+        assert "FakePage.fill" in report
+        assert "test_commands_are_attributed_to_page_methods" in report
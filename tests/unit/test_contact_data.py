@@ -0,0 +1,47 @@
+import pytest
+
+from src.contact_data import (
+    CONTACT_FIELDS,
+    RUN_ID,
+    ContactRecord,
+    fake_contact_info,
+    run_tag,
+)
+
+
+@pytest.mark.unit
+class TestContactRecord:
+    def test_fake_contact_info_fills_form_fields(self):
+        contact = fake_contact_info()
+
+        assert contact.first_name and contact.last_name
+        assert contact.full_name == f"{contact.first_name} {contact.last_name}"
+        assert contact.street_address_2 == run_tag()
+        assert contact.run_id == RUN_ID
+        assert ContactRecord(street_address_2="Apt 4").run_id is None
+
+    def test_api_round_trip(self):
+        contact = fake_contact_info()
+        data = contact.to_api()
+
+        assert data["firstName"] == contact.first_name
+        assert data["stateProvince"] == contact.state
+        assert ContactRecord.from_api({**data, "_id": "42"}) == contact
+        assert ContactRecord.from_api({**data, "_id": "42"}).id == "42"
+
+    def test_diff(self):
+        contact = fake_contact_info()
+        changed = contact.replace(phone="8005551234", city="Springfield")
+
+        assert contact.diff(contact.replace()) == {}
+        assert contact.diff(changed) == {
+            "phone": (contact.phone, "8005551234"),
+            "city": (contact.city, "Springfield"),
+        }
+        assert contact != changed
+
+    def test_slots(self):
+        contact = ContactRecord()
+
+        assert not hasattr(contact, "__dict__")
+        assert len(contact.astuple()) == len(CONTACT_FIELDS) == 11
@@ -0,0 +1,45 @@
+import pytest
+
+from src.pages.base_page import BasePage
+from src.pages.contact_list_page import READ_ROWS_SCRIPT, ContactListPage
+from src.waits import WaitHistory
+
+
+class FakeContactList:
+    # Shows the given row lists one after another, one per read.
+    def __init__(self, *reads: list[str]):
+        self.reads = list(reads)
+        self.calls = 0
+
+    def execute_async_script(self, script, selector, start, count, wait_ms):
+        assert script == READ_ROWS_SCRIPT
+        self.calls += 1
+        names = self.reads.pop(0) if len(self.reads) > 1 else self.reads[0]
+        rows = [[str(number), name] for number, name in enumerate(names)]
+        return rows[start : start + count]
+
+
+@pytest.fixture(autouse=True)
+def history(monkeypatch):
+    monkeypatch.setattr(BasePage, "wait_history", WaitHistory())
+
+
+@pytest.mark.unit
+class TestContactListPage:
+    def test_empty_list_passes_at_once(self):
+        browser = FakeContactList([])
+        page = ContactListPage(browser=browser, url="contactList")
+
+        page.contact_is_not_present_in_contact_list("Ann", "Lee")
+
+        assert browser.calls == 1
+
+    def test_waits_for_row_to_disappear(self):
+        browser = FakeContactList(["Ann Lee", "Bob Ray"], ["Ann Lee"], ["Bob Ray"])
+        page = ContactListPage(browser=browser, url="contactList")
+
+        page.contact_is_not_present_in_contact_list("Ann", "Lee")
+
+        assert browser.calls == 3
+        with pytest.raises(AssertionError, match="Bob Ray in the contact list"):
+            page.contact_is_not_present_in_contact_list("Bob", "Ray", timeout=0.2)
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.api_client import ApiError
+from src.contact_data import ContactRecord, run_tag
+from src.data_gc import collect, created_at, find_orphans
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def object_id(created: datetime, serial: int = 0) -> str:
+    return f"{int(created.timestamp()):08x}{serial:016x}"
+
+
+def contact(age: timedelta, run_id: str | None = "oldrun", serial: int = 0):
+    return ContactRecord(
+        id=object_id(NOW - age, serial),
+        first_name="Ada",
+        street_address_2=run_tag(run_id) if run_id else "",
+    )
+
+
+class FakeApi:
+    def __init__(self, contacts: list[ContactRecord]):
+        self.contacts = contacts
+        self.deleted: list[str] = []
+
+    def get_contacts(self):
+        return self.contacts
+
+    def delete_contact(self, contact_id: str):
+        if contact_id.endswith("404"):
+            raise ApiError("DELETE", f"/contacts/{contact_id}", 404, None)
+        if contact_id.endswith("500"):
+            raise ApiError("DELETE", f"/contacts/{contact_id}", 500, None)
+        self.deleted.append(contact_id)
+
+
+@pytest.mark.unit
+class TestDataGc:
+    def test_created_at_reads_object_id(self):
+        assert created_at(object_id(NOW)) == NOW
+
+    def test_find_orphans(self):
+        old = contact(timedelta(days=2))
+        contacts = [
+            old,
+            contact(timedelta(hours=1), serial=1),
+            contact(timedelta(days=2), run_id=None, serial=2),
+            contact(timedelta(days=2), run_id="current", serial=3),
+            contact(timedelta(days=2), run_id="current-test-1", serial=4),
+            contact(timedelta(days=2), run_id="currently", serial=5),
+        ]
+
+        orphans = find_orphans(contacts, timedelta(hours=24), NOW, "current")
+
+        assert orphans == [old, contacts[-1]]
+
+    def test_collect_deletes_in_parallel_and_reports(self):
+        contacts = [
+            contact(timedelta(days=3), serial=serial)
+            for serial in (1, 2, 3, 0x404, 0x500)
+        ]
+        api = FakeApi(contacts)
+
+        report = collect(api, ttl=timedelta(hours=1), workers=4)
+
+        assert report.scanned == report.orphans == 5
+        assert report.deleted == 4
+        assert report.failed == [contacts[-1].id]
+        assert sorted(api.deleted) == sorted(c.id for c in contacts[:3])
+
+    def test_dry_run_deletes_nothing(self):
+        api = FakeApi([contact(timedelta(days=3))])
+
+        report = collect(api, dry_run=True)
+
+        assert report.orphans == 1
+        assert report.deleted == 0
+        assert api.deleted == []
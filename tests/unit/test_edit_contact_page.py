@@ -0,0 +1,89 @@
+import pytest
+
+from src.contact_data import CONTACT_FIELDS, ContactRecord
+from src.locators import ContactDetailsPageLocators, EditContactPageLocators
+from src.pages.base_page import BATCH_SCRIPT, BasePage
+from src.pages.edit_contact_page import EditContactPage
+from src.waits import WaitHistory
+
+SELECTORS = {
+    getattr(EditContactPageLocators, field.upper())[1]: field
+    for field in CONTACT_FIELDS
+}
+
+
+class FakeElement:
+    text = "loaded"
+
+    def get_attribute(self, name):
+        return "loaded"
+
+
+class FakeContactApp:
+    def __init__(self, contact: ContactRecord):
+        self.contact = contact
+        self.current_url = EditContactPageLocators.EDIT_CONTACT_PAGE_URL
+        self.scripts = 0
+
+    def find_element(self, how, what):
+        return FakeElement()
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        if script != BATCH_SCRIPT:
+            # Contact details page reads every field at once.
+            return [getattr(self.contact, field) for field in CONTACT_FIELDS]
+
+        results = []
+        form = dict(self.contact.items())
+        for action, how, what, value in args[0]:
+            if action == "value":
+                results.append(form[SELECTORS[what]])
+                continue
+            if action == "set_value":
+                form[SELECTORS[what]] = value
+            elif action == "click":
+                self.contact = ContactRecord(**form)
+                self.current_url = ContactDetailsPageLocators.CONTACT_DETAILS_PAGE_URL
+            results.append(None)
+        return results
+
+
+@pytest.fixture(autouse=True)
+def history(monkeypatch):
+    monkeypatch.setattr(BasePage, "wait_history", WaitHistory())
+
+
+@pytest.mark.unit
+class TestEditContactPage:
+    def test_edit_fields_submits_once_and_returns_diff(self):
+        before = ContactRecord(first_name="Ann", last_name="Lee", city="Oslo")
+        app = FakeContactApp(before)
+        page = EditContactPage(app, app.current_url)
+
+        diff = page.edit_fields({"first_name": "Bob", "city": "Oslo", "phone": "1"})
+
+        assert diff == {"first_name": ("Ann", "Bob"), "phone": ("", "1")}
+        assert app.contact == before.replace(first_name="Bob", phone="1")
+        assert app.scripts == 3
+
+    def test_edit_fields_keeps_fields_missing_in_record(self):
+        before = ContactRecord(first_name="Ann", last_name="Lee", city="Oslo")
+        app = FakeContactApp(before)
+        page = EditContactPage(app, app.current_url)
+
+        diff = page.edit_fields(ContactRecord(city="Bergen", phone="1"))
+
+        assert diff == {"city": ("Oslo", "Bergen"), "phone": ("", "1")}
+        assert app.contact == before.replace(city="Bergen", phone="1")
+
+        diff = page.edit_fields({"phone": ""})
+
+        assert diff == {"phone": ("1", "")}
+
+    def test_edit_fields_rejects_unknown_fields(self):
+        app = FakeContactApp(ContactRecord())
+        page = EditContactPage(app, app.current_url)
+
+        with pytest.raises(ValueError, match="nickname"):
+            page.edit_fields({"nickname": "Bo"})
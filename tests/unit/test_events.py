@@ -0,0 +1,74 @@
+import json
+import logging as logger
+
+import pytest
+
+from src import events
+
+
+@pytest.mark.unit
+class TestEvents:
+    def test_events_are_written_with_test_id(self, tmp_path, request):
+        path = tmp_path / "events.jsonl"
+        handler = events.install(str(path), webdriver_commands=False)
+
+        token = events.current_test.set("tests/test_login_page.py::test_login")
+        try:
+            logger.info("Open %s page.", "login")
+        finally:
+            events.current_test.reset(token)
+        logger.info("Back in the running test.")
+        events.uninstall(handler)
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        messages = {record["message"]: record for record in records}
+
+        assert messages["Open login page."]["test"] == (
+            "tests/test_login_page.py::test_login"
+        )
+        assert messages["Back in the running test."]["test"] == request.node.nodeid
+        assert handler.written == len(records)
+
+    def test_ring_buffer_drops_oldest(self, tmp_path):
+        handler = events.EventHandler(
+            str(tmp_path / "events.jsonl"), capacity=2, flush_interval=60
+        )
+        for number in range(3):
+            handler.emit(logger.makeLogRecord({"msg": f"event {number}"}))
+
+        assert handler.dropped == 1
+        assert [record.msg for record, _ in handler.buffer] == ["event 1", "event 2"]
+        handler.close()
+
+    def test_webdriver_commands_are_opt_in_and_redacted(self, tmp_path):
+        webdriver_logger = logger.getLogger(events.WEBDRIVER_LOGGER)
+
+        path = tmp_path / "events.jsonl"
+        handler = events.install(str(path))
+        webdriver_logger.debug("%s %s %s", "POST", "http://d/session/1/url", "{}")
+        events.uninstall(handler)
+        assert "session/1" not in path.read_text()
+
+        handler = events.install(str(path), webdriver_commands=True)
+        webdriver_logger.debug(
+            "%s %s %s",
+            "POST",
+            "http://127.0.0.1:4444/session/1/element/2/value",
+            "{'text': 'MY_PASSWORD'}",
+        )
+        webdriver_logger.debug(
+            "Remote response: status=%s | data=%s | headers=%s",
+            200,
+            '{"value": "iVBORw0KGgo..."}',
+            {},
+        )
+        webdriver_logger.debug("Finished Request")
+        events.uninstall(handler)
+
+        messages = [
+            json.loads(line)["message"] for line in path.read_text().splitlines()
+        ]
+        assert messages[0] == "POST /session/1/element/2/value"
+        assert messages[1].startswith("status 200 in ")
+        assert len(messages) == 2
+        assert webdriver_logger.propagate and not webdriver_logger.filters
@@ -0,0 +1,161 @@
+import random
+
+import pytest
+
+from src.api_client import ContactListApi
+from src.contact_data import API_FIELDS
+from src.fuzzing import (
+    CONTACT_SPECS,
+    TARGETS,
+    Outcome,
+    classify,
+    expected_rejection,
+    fuzz,
+    js_length,
+    shrink,
+)
+
+
+class FakeServer:
+    # Forgets to limit the city length, trims the state and rejects phone numbers
+    # with brackets.
+    def __init__(self):
+        self.contacts = {}
+        self.requests = 0
+
+    def __call__(self, method, path, body=None):
+        self.requests += 1
+        if method == "DELETE":
+            self.contacts.pop(path.rsplit("/", 1)[1], None)
+            return 200, None
+
+        if not body["firstName"] or len(body["firstName"]) > 20:
+            return 400, {"message": "Contact validation failed"}
+        if "(" in body["phone"]:
+            return 400, {"message": "Phone number is invalid"}
+        if "\x00" in body["phone"]:
+            return 500, "Internal Server Error"
+
+        contact_id = f"{self.requests:024x}"
+        self.contacts[contact_id] = {
+            **body,
+            "stateProvince": body["stateProvince"].strip(),
+            "_id": contact_id,
+        }
+        return 201, self.contacts[contact_id]
+
+
+def fake_api(server: FakeServer) -> ContactListApi:
+    api = ContactListApi("http://stand-in")
+    api.transport = server
+    return api
+
+
+@pytest.mark.unit
+class TestFuzzing:
+    def test_lengths_are_counted_like_javascript(self):
+        assert js_length("abc") == 3
+        assert js_length("😀") == 2
+        assert expected_rejection(CONTACT_SPECS, {"state": "😀" * 11}) == (
+            "state is longer than 20"
+        )
+        assert expected_rejection(CONTACT_SPECS, {"first_name": ""}) == (
+            "first_name is required"
+        )
+
+    @pytest.mark.parametrize(
+        "name, valid, invalid",
+        [
+            ("date_of_birth", "2000-02-29", ["1990-02-30", "01/02/1990", "19900101"]),
+            ("email", "a+tag@b.co", ["a@b", "a b@c.com", "a@b..com"]),
+            ("phone", "(773)985-5394", ["abc", "+", "١٢٣٤٥٦٧٨٩٠"]),
+            ("postal_code", "SW1A 1AA", ["-", "1234_", "é1"]),
+        ],
+    )
+    def test_kind_rules(self, name, valid, invalid):
+        assert expected_rejection(CONTACT_SPECS, {name: valid}) is None
+        for value in invalid:
+            assert expected_rejection(CONTACT_SPECS, {name: value}) == (
+                f"{name} is not a valid {CONTACT_SPECS[name].kind}"
+            )
+
+    def test_classify(self):
+        case = {"first_name": "Ann", "city": "x" * 41}
+
+        assert classify(CONTACT_SPECS, case, Outcome(500)) == "server_error"
+        assert classify(CONTACT_SPECS, case, Outcome(400)) is None
+        assert classify(CONTACT_SPECS, {"first_name": "Ann"}, Outcome(400)) == (
+            "rejected_valid"
+        )
+        assert classify(CONTACT_SPECS, case, Outcome(201, case)) == (
+            "accepted_invalid: city is longer than 40"
+        )
+        assert classify(
+            CONTACT_SPECS, {"first_name": "Ann "}, Outcome(201, {"first_name": "Ann"})
+        ) == ("not_stored_as_sent: first_name")
+
+    def test_shrink_finds_minimal_case(self):
+        base = {"first_name": "Ann", "city": "Oslo", "state": "Ohio"}
+        case = {"first_name": "Bob", "city": "é" * 300, "state": "\n"}
+
+        def check(candidate):
+            return "long" if len(candidate["city"]) > 40 else None
+
+        minimal, attempts = shrink(case, base, "long", check, budget=500)
+
+        assert minimal == {"first_name": "Ann", "city": "a" * 41, "state": "Ohio"}
+        assert attempts <= 500
+
+    def test_fuzz_finds_and_shrinks_distinct_failures(self):
+        server = FakeServer()
+
+        report = fuzz(
+            TARGETS["contact"],
+            lambda: fake_api(server),
+            cases=300,
+            workers=4,
+            seed=7,
+        )
+
+        signatures = {failure.signature for failure in report.failures}
+        assert report.cases == 300
+        assert "accepted_invalid: city is longer than 40" in signatures
+        assert "server_error" in signatures
+        assert "not_stored_as_sent: state" in signatures
+        assert "rejected_valid" in signatures
+        assert not server.contacts
+
+        city = next(
+            failure
+            for failure in report.failures
+            if failure.signature == "accepted_invalid: city is longer than 40"
+        )
+        assert list(city.changes) == ["city"]
+        assert js_length(city.changes["city"]) == 41
+
+        phone = next(
+            failure
+            for failure in report.failures
+            if failure.signature == "rejected_valid"
+        )
+        assert phone.changes == {} and "(" in phone.minimal["phone"]
+        assert not phone.api_accepted
+
+        assert (
+            fuzz(
+                TARGETS["contact"], lambda: fake_api(FakeServer()), cases=50, seed=7
+            ).statuses
+            == fuzz(
+                TARGETS["contact"], lambda: fake_api(FakeServer()), cases=50, seed=7
+            ).statuses
+        )
+
+    def test_cases_keep_valid_fields_of_base_record(self):
+        base, case = TARGETS["register"].generate(random.Random(1))
+
+        assert (
+            set(base) == set(case) == {"first_name", "last_name", "email", "password"}
+        )
+        assert 1 <= sum(base[name] != case[name] for name in base) <= 3
+        assert expected_rejection(TARGETS["register"].specs, base) is None
+        assert set(API_FIELDS) == set(CONTACT_SPECS)
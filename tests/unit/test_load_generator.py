@@ -0,0 +1,71 @@
+import pytest
+
+from src import load_generator
+from src.load_generator import LoadConfig, LoadStats, percentile
+
+
+@pytest.mark.unit
+class TestLoadGenerator:
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([], 95) == 0
+
+    def test_stats_per_journey(self):
+        stats = LoadStats()
+        stats.record("api:add_contact", 0.2)
+        stats.record("api:add_contact", 0.4, error=True)
+        stats.record("api:contact_list", 0.1)
+
+        assert stats.journeys["api:add_contact"].count == 2
+        assert stats.journeys["api:add_contact"].error_rate == 0.5
+        assert stats.journeys["api:contact_list"].percentiles(50) == [0.1]
+
+        report = stats.report()
+        assert "api:add_contact" in report
+        assert "api:contact_list" in report
+
+    def test_crashed_users_are_reported(self, monkeypatch):
+        def crash(*args):
+            raise RuntimeError("no driver")
+
+        monkeypatch.setattr(load_generator, "api_user", crash)
+        config = LoadConfig(
+            "http://stand-in",
+            "user@example.com",
+            "secret",
+            users=2,
+            ramp_up=0,
+            duration=0.2,
+        )
+
+        stats = load_generator.run_load(config, seed=1)
+
+        assert stats.crashes == ["RuntimeError('no driver')"] * 2
+        assert "2 virtual users crashed" in stats.report()
+
+    def test_main_signs_in_with_credentials_of_env(self, monkeypatch, capsys):
+        configs = []
+
+        def run_load(config, seed=None):
+            configs.append(config)
+            return LoadStats()
+
+        monkeypatch.setattr(load_generator, "run_load", run_load)
+        monkeypatch.setattr(
+            load_generator,
+            "get_credentials",
+            lambda env=None: (
+                f"{env or 'default'}@example.com",
+                "secret",
+            ),
+        )
+        monkeypatch.setitem(load_generator.HOSTS, "dev", "http://dev-stand-in/")
+
+        load_generator.main(["--env", "dev", "--duration", "0"])
+
+        assert configs[0].base_url == "http://dev-stand-in/"
+        assert configs[0].email == "dev@example.com"
@@ -0,0 +1,20 @@
+import pytest
+
+from src import host_config
+from src.locators import By, LoginPageLocators
+
+
+@pytest.mark.unit
+class TestLocators:
+    def test_by_matches_selenium(self):
+        from selenium.webdriver.common.by import By as SeleniumBy
+
+        for name, value in vars(SeleniumBy).items():
+            if name.isupper():
+                assert getattr(By, name) == value
+
+    def test_page_url_is_resolved_on_access(self, monkeypatch):
+        monkeypatch.setitem(host_config.HOSTS, "dev", "https://dev.example.com/")
+        monkeypatch.setenv("ENV", "dev")
+
+        assert LoginPageLocators.LOGIN_PAGE_URL == "https://dev.example.com/login"
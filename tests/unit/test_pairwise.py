@@ -0,0 +1,69 @@
+import pytest
+from faker import Faker
+
+from src.contact_data import CONTACT_FIELDS, run_tag
+from src.fuzzing import CONTACT_SPECS, expected_rejection, js_length
+from src.pairwise import (
+    CONTACT_CLASSES,
+    case_id,
+    contact_cases,
+    contact_record,
+    covering_array,
+)
+
+
+@pytest.mark.unit
+class TestPairwise:
+    def test_covers_every_pair_with_few_rows(self):
+        parameters = {name: ("a", "b", "c") for name in "pqrst"}
+
+        cases = covering_array(parameters)
+
+        assert not cases.missing()
+        assert cases.tuples == 10 * 9
+        assert 9 <= len(cases.rows) <= 15 < cases.full_product == 243
+
+    @pytest.mark.parametrize("strength", [1, 3])
+    def test_other_strengths(self, strength):
+        parameters = {"browser": ("firefox", "chrome"), "os": ("linux", "mac")}
+        parameters["size"] = ("s", "m", "l")
+
+        cases = covering_array(parameters, strength)
+
+        assert not cases.missing()
+        assert len(cases.rows) == (3 if strength == 1 else 12)
+
+    def test_same_seed_gives_same_cases(self):
+        assert contact_cases(seed=3).rows == contact_cases(seed=3).rows
+
+        with pytest.raises(ValueError, match="between 1 and 3"):
+            contact_cases(strength=4)
+
+    def test_contact_cases_are_valid_records(self):
+        cases = contact_cases()
+        fake = Faker()
+        fake.seed_instance(1)
+
+        assert not cases.missing()
+        assert len(cases.rows) < 50
+        assert "x more" in cases.summary()
+
+        for classes in cases.rows:
+            record = contact_record(classes, fake)
+            assert record.street_address_2 == run_tag()
+            assert expected_rejection(CONTACT_SPECS, dict(record.items())) is None
+
+            for name, value in classes.items():
+                field = getattr(record, name)
+                if value == "empty":
+                    assert field == ""
+                if value == "max_length":
+                    assert js_length(field) == CONTACT_SPECS[name].max_length
+                    assert field == field.strip()
+
+    def test_case_id_names_unusual_classes(self):
+        typical = {name: "typical" for name in CONTACT_CLASSES}
+
+        assert case_id(typical) == "typical"
+        assert case_id({**typical, "city": "empty"}) == "city=empty"
+        assert set(CONTACT_CLASSES) == set(CONTACT_FIELDS) - {"street_address_2"}
@@ -0,0 +1,45 @@
+import pytest
+
+from src.pages.base_page import BasePage
+from src.performance import PageBudget, PageMetrics
+
+
+@pytest.mark.unit
+class TestPerformance:
+    def test_metrics_over_budget(self):
+        metrics = PageMetrics(
+            page="LoginPage",
+            url="https://example.com/login",
+            ttfb=2000,
+            dom_content_loaded=1000,
+            load=1500,
+            fcp=None,
+            lcp=None,
+            resource_count=60,
+            transfer_size=1000,
+        )
+
+        violations = metrics.over_budget(PageBudget(ttfb=1500, resource_count=50))
+
+        assert violations == ["ttfb 2000 > 1500", "resource_count 60 > 50"]
+        assert metrics.over_budget(PageBudget(ttfb=None, resource_count=None)) == []
+
+    def test_budget_is_checked_on_open_only(self, monkeypatch):
+        class Browser:
+            def get(self, url):
+                self.url = url
+
+            def __getattr__(self, name):
+                raise AssertionError(f"unexpected WebDriver call {name}")
+
+        class Recorder:
+            def collect(self, browser, page):
+                return PageMetrics(page, browser.url, 2000, 0, 0, None, None, 1, 0)
+
+        monkeypatch.setattr(BasePage, "performance_recorder", Recorder())
+        monkeypatch.setattr(BasePage, "performance_budget", PageBudget(ttfb=1500))
+
+        page = BasePage(browser=Browser(), url="https://example.com/login")
+
+        with pytest.raises(AssertionError, match="ttfb 2000 > 1500"):
+            page.open()
@@ -0,0 +1,69 @@
+import pytest
+
+from src.run_history import (
+    HistoryRecorder,
+    connect,
+    load_series,
+    render_dashboard,
+    slope,
+    trends,
+)
+
+
+def record_run(path: str, call: float, setup: float, browser: str = "firefox"):
+    recorder = HistoryRecorder(path, "test", browser)
+    recorder.steps = [
+        ("tests/test_edit.py::test_edit_contact_phone", "setup", "passed", 1.0),
+        ("tests/test_edit.py::test_edit_contact_phone", "call", "passed", call),
+        ("tests/test_login.py::test_login", "call", "passed", 2.0),
+    ]
+    recorder.fixtures = [
+        ("tests/test_edit.py::test_edit_contact_phone", "browser", "setup", setup),
+        ("tests/test_edit.py::test_edit_contact_phone", "browser", "teardown", 0.5),
+    ]
+    return recorder.save()
+
+
+@pytest.mark.unit
+class TestRunHistory:
+    def test_slope(self):
+        assert slope([1.0, 2.0, 3.0]) == pytest.approx(1.0)
+        assert slope([5.0]) == 0.0
+
+    def test_runs_are_stored(self, tmp_path):
+        path = str(tmp_path / "history.sqlite")
+
+        assert record_run(path, 7.0, 3.0) == 1
+        assert record_run(path, 8.0, 3.0) == 2
+
+        connection = connect(path)
+        [(passed, skipped)] = connection.execute(
+            "SELECT passed, skipped FROM runs WHERE id = 2"
+        )
+        assert (passed, skipped) == (2, 0)
+        assert connection.execute("SELECT COUNT(*) FROM fixtures").fetchone() == (4,)
+
+    def test_slowest_growing_tests_and_fixtures(self, tmp_path):
+        path = str(tmp_path / "history.sqlite")
+        for call, setup in ((7, 3), (8, 3), (9, 3.2), (12, 3.1), (13, 3), (13, 3)):
+            record_run(path, call, setup)
+        record_run(path, 1, 1, browser="chrome")
+
+        connection = connect(path)
+        tests, fixtures = load_series(connection, browser="firefox")
+
+        [edit, login] = trends(tests, window=3)
+        assert edit.name == "tests/test_edit.py::test_edit_contact_phone"
+        assert (edit.first, edit.last) == (9.0, 14.0)
+        assert edit.regressed
+        assert not login.regressed
+        assert {trend.name for trend in trends(fixtures)} == {
+            "browser (setup)",
+            "browser (teardown)",
+        }
+
+        dashboard = render_dashboard(
+            trends(tests), trends(fixtures), str(tmp_path / "dashboard.html")
+        )
+        with open(dashboard) as file:
+            assert "test_edit_contact_phone" in file.read()
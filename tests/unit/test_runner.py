@@ -0,0 +1,103 @@
+import os
+import subprocess
+
+import pytest
+
+from src import runner
+from src.runner import (
+    Job,
+    JobResult,
+    browser_jobs,
+    read_junit,
+    shard,
+    side_by_side,
+    summarize,
+    without_option,
+)
+
+
+@pytest.mark.unit
+class TestRunner:
+    def test_shard(self):
+        files = ["a.py", "b.py", "c.py"]
+
+        assert shard(files, 2) == [["a.py", "c.py"], ["b.py"]]
+        assert shard(files, 5) == [["a.py"], ["b.py"], ["c.py"]]
+
+    def test_every_job_has_own_run_id(self):
+        jobs = [Job("test", number, []) for number in range(2)] + [Job("dev", 0, [])]
+
+        assert len({job.run_id for job in jobs}) == 3
+        assert jobs[1].run_id.endswith("-test-1")
+
+    def test_read_junit(self, tmp_path):
+        path = tmp_path / "junit.xml"
+        path.write_text(
+            '<testsuites><testsuite tests="4" failures="1" errors="0" skipped="1"/>'
+            "</testsuites>"
+        )
+
+        assert read_junit(str(path)) == {
+            "tests": 4,
+            "failures": 1,
+            "errors": 0,
+            "skipped": 1,
+        }
+        assert read_junit(str(tmp_path / "missing.xml"))["tests"] == 0
+
+    def test_job_without_junit_fails(self, tmp_path, monkeypatch):
+        job = Job("test", 0, ["a.py"], reports_dir=str(tmp_path))
+        os.makedirs(os.path.dirname(job.report_path("xml")))
+        with open(job.report_path("xml"), "w") as file:
+            file.write('<testsuites><testsuite tests="9"/></testsuites>')
+
+        # Pytest dies before it writes a report.
+        monkeypatch.setattr(
+            runner.subprocess,
+            "run",
+            lambda command, **kwargs: subprocess.CompletedProcess(command, 0),
+        )
+        result = runner.run_job(job)
+
+        assert (result.returncode, result.tests, result.errors) == (1, 0, 1)
+        assert not os.path.exists(job.report_path("xml"))
+
+    def test_summary_has_section_per_env(self, tmp_path):
+        results = [
+            JobResult(Job("test", 0, ["a.py"], reports_dir=str(tmp_path)), 0, 3.0, 2),
+            JobResult(Job("dev", 0, ["a.py"], reports_dir=str(tmp_path)), 1, 5.0, 2, 1),
+        ]
+
+        summary = summarize(results, 5.0)
+
+        assert "== test: 1 workers, 3.0s ==" in summary
+        assert "== dev: 1 workers, 5.0s ==" in summary
+        assert "passed 1, failed 1, skipped 0" in summary
+
+    def test_without_option(self):
+        args = ["-m", "login", "--browser_name", "chrome,firefox", "--rm"]
+
+        assert without_option(args, "--browser_name") == ["-m", "login", "--rm"]
+        assert without_option(["--browser_name=chrome", "tests"], "--browser_name") == [
+            "tests"
+        ]
+
+    def test_browser_results_side_by_side(self, tmp_path):
+        results = []
+        for job, outcome in zip(
+            browser_jobs(["chrome", "firefox"], ["tests"], str(tmp_path)),
+            ("", "<failure/>"),
+        ):
+            os.makedirs(os.path.dirname(job.report_path("xml")))
+            with open(job.report_path("xml"), "w") as file:
+                file.write(
+                    '<testsuites><testsuite><testcase classname="t" name="a" time="1.5">'
+                    f"{outcome}</testcase></testsuite></testsuites>"
+                )
+            results.append(JobResult(job, 0, 2.0, 1))
+
+        assert side_by_side(results) == {
+            "t::a": {"chrome": ("passed", 1.5), "firefox": ("failed", 1.5)}
+        }
+        assert results[0].job.pytest_args == ["tests", "--browser_name=chrome"]
+        assert results[1].job.run_id.endswith("-firefox-0")
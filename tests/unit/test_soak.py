@@ -0,0 +1,114 @@
+import os
+
+import pytest
+
+from src.load_generator import Journey
+from src.soak import MB, SoakConfig, TreeSample, process_tree, run_soak, sample_tree
+
+
+def fake_process(proc, pid: int, ppid: int, ticks: int, pages: int):
+    os.makedirs(proc / str(pid))
+    (proc / str(pid) / "stat").write_text(
+        f"{pid} (Web Content (x)) S {ppid} 1 1 0 -1 0 0 0 0 0 {ticks} {ticks} 0 0"
+    )
+    (proc / str(pid) / "statm").write_text(f"1000 {pages} 10 1 0 100 0")
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.rss = 100 * MB
+        self.quit_count = 0
+
+    def quit(self):
+        self.quit_count += 1
+
+
+@pytest.mark.unit
+class TestSoak:
+    def test_sample_process_tree(self, tmp_path):
+        fake_process(tmp_path, 10, 1, 100, 1000)
+        fake_process(tmp_path, 11, 10, 50, 2000)
+        fake_process(tmp_path, 12, 11, 0, 500)
+        fake_process(tmp_path, 20, 1, 999, 9999)
+
+        assert process_tree(10, str(tmp_path)) == [10, 11, 12]
+
+        sample = sample_tree(10, str(tmp_path))
+        assert sample.processes == 3
+        assert sample.rss == 3500 * os.sysconf("SC_PAGE_SIZE")
+        assert sample.cpu_seconds == pytest.approx(300 / os.sysconf("SC_CLK_TCK"))
+
+    def test_cpu_percent(self):
+        earlier = TreeSample(1, 0, 1.0, taken=10.0)
+
+        assert TreeSample(1, 0, 1.5, taken=11.0).cpu_percent(earlier) == 50.0
+
+    def test_recycles_on_memory_threshold(self):
+        browsers = []
+
+        def start_session():
+            browsers.append(FakeBrowser())
+            return browsers[-1]
+
+        def run_journey(journey, browser):
+            browser.rss += 30 * MB if journey.name == "leaky" else 0
+            if journey.name == "broken":
+                raise RuntimeError("boom")
+
+        journeys = [
+            Journey("leaky", 1, None),
+            Journey("steady", 1, None),
+            Journey("broken", 1, None),
+        ]
+        samples = iter(range(1000))
+        report = run_soak(
+            SoakConfig(max_rss_mb=200, runs=30),
+            journeys,
+            start_session,
+            run_journey,
+            sampler=lambda browser: TreeSample(1, browser.rss, 0.0, next(samples)),
+        )
+
+        growth = report.journey_growth()
+        assert growth["leaky"]["median_mb"] == 30
+        assert growth["steady"]["total_mb"] == 0
+        assert len(report.recycles) == len(browsers) - 1 > 0
+        assert all("RSS" in reason for _, reason in report.recycles)
+        assert all(browser.quit_count == 1 for browser in browsers)
+        assert report.session_slopes()[1] > 5
+        assert any(run.error for run in report.runs)
+        assert "leaky" in "\n".join(report.summary())
+
+    def test_recycles_after_journey_limit(self):
+        report = run_soak(
+            SoakConfig(max_rss_mb=0, max_journeys=2, runs=5),
+            [Journey("steady", 1, None)],
+            FakeBrowser,
+            lambda journey, browser: None,
+            sampler=lambda browser: TreeSample(1, browser.rss, 0.0),
+        )
+
+        assert [run.session for run in report.runs] == [1, 1, 2, 2, 3]
+        assert report.recycles == [(1, "reached 2 journeys"), (2, "reached 2 journeys")]
+
+    def test_failed_session_start_is_retried(self):
+        attempts = []
+
+        def start_session():
+            attempts.append(len(attempts))
+            if len(attempts) <= 2:
+                raise RuntimeError("login failed")
+            return FakeBrowser()
+
+        report = run_soak(
+            SoakConfig(max_rss_mb=0, runs=2, retry_delay=0.01),
+            [Journey("steady", 1, None)],
+            start_session,
+            lambda journey, browser: None,
+            sampler=lambda browser: TreeSample(1, browser.rss, 0.0),
+        )
+
+        assert len(report.runs) == 2
+        assert [run.session for run in report.runs] == [1, 1]
+        assert report.session_failures == ["RuntimeError('login failed')"] * 2
+        assert "session start failed 2 times" in "\n".join(report.summary())
@@ -0,0 +1,71 @@
+import pytest
+
+from src import locators
+from src.static_dom import UnsupportedLocator, parse, select
+
+HTML = """
+<html><body>
+  <header><button id="logout" class="logout">Logout</button></header>
+  <form id="add-contact">
+    <input id="firstName" name="firstName">
+    <input id="lastName" name="lastName"/>
+    <p>Text<br>more</p>
+    <button id="submit" type="submit">Submit</button>
+  </form>
+  <table id="myTable" class="contactTable">
+    <tr><td>1</td><td>Ada Lovelace</td></tr>
+    <tr><td>2</td><td>Alan Turing</td></tr>
+  </table>
+</body></html>
+"""
+
+
+@pytest.fixture(scope="module")
+def document():
+    return parse(HTML)
+
+
+@pytest.mark.unit
+class TestStaticDom:
+    def test_css_selectors(self, document):
+        assert [
+            node.attrs["id"] for node in select(document, "css selector", "#firstName")
+        ] == ["firstName"]
+        assert len(select(document, "css selector", "#myTable tr")) == 2
+        assert len(select(document, "css selector", "form > input")) == 2
+        assert len(select(document, "css selector", "body > input")) == 0
+        assert select(document, "css selector", ".contactTable")[0].tag == "table"
+        assert len(select(document, "css selector", "button[type='submit']")) == 1
+        assert len(select(document, "css selector", "#logout, #submit")) == 2
+
+    def test_xpath_subset(self, document):
+        names = select(document, "xpath", "//table[@id='myTable']/tr/td[2]")
+        first = select(document, "xpath", "//table[@id='myTable']/tr[1]/td[2]")
+        turing = select(document, "xpath", "//table//td[contains(text(), 'Turing')]")
+
+        assert [node.text for node in names] == ["Ada Lovelace", "Alan Turing"]
+        assert [node.text for node in first] == ["Ada Lovelace"]
+        assert [node.text for node in turing] == ["Alan Turing"]
+
+    def test_other_strategies(self, document):
+        assert len(select(document, "tag name", "form")) == 1
+        assert len(select(document, "name", "lastName")) == 1
+        assert len(select(document, "class name", "logout")) == 1
+        assert select(document, "id", "missing") == []
+
+    def test_unsupported_locators(self, document):
+        with pytest.raises(UnsupportedLocator):
+            select(document, "link text", "Logout")
+        with pytest.raises(UnsupportedLocator):
+            select(document, "xpath", "//td[last()]")
+        with pytest.raises(UnsupportedLocator):
+            select(document, "css selector", "tr:first-child")
+
+    def test_every_repo_locator_is_supported(self, document):
+        for name in dir(locators):
+            page_locators = getattr(locators, name)
+            if not name.endswith("PageLocators"):
+                continue
+            for value in vars(page_locators).values():
+                if isinstance(value, tuple) and len(value) == 2:
+                    select(document, *value)
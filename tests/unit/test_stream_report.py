@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from src.stream_report import ReportWriter, merge
+
+
+class Report:
+    def __init__(self, nodeid, when, outcome, longrepr=None):
+        self.nodeid = nodeid
+        self.when = when
+        self.outcome = outcome
+        self.passed = outcome == "passed"
+        self.duration = 0.5
+        self.longrepr = longrepr
+        self.caplog = "INFO login"
+        self.capstdout = ""
+
+
+def write_shard(path, outcomes):
+    writer = ReportWriter(str(path), environment="test")
+    for number, outcome in enumerate(outcomes):
+        writer.pytest_runtest_logreport(
+            Report(f"t.py::test_{number}", "setup", "passed")
+        )
+        writer.pytest_runtest_logreport(
+            Report(f"t.py::test_{number}", "call", outcome, "assert 1 == 2")
+        )
+    return writer
+
+
+@pytest.mark.unit
+class TestStreamReport:
+    def test_results_are_on_disk_before_the_session_ends(self, tmp_path):
+        path = tmp_path / "worker-0.jsonl"
+        writer = write_shard(path, ["passed", "failed"])
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [record["type"] for record in records] == ["session", "result", "result"]
+        assert records[2]["outcome"] == "failed"
+        assert records[2]["shard"] == f"{tmp_path.name}/worker-0"
+
+        writer.close()
+        assert json.loads(path.read_text().splitlines()[-1])["counts"] == {
+            "passed": 1,
+            "failed": 1,
+        }
+
+    def test_assets_are_stored_once(self, tmp_path):
+        writer = write_shard(tmp_path / "worker-0.jsonl", [])
+        writer.attach("t.py::test_0", "screenshot", b"png", "png")
+        writer.attach("t.py::test_1", "screenshot", b"png", "png")
+        writer.close()
+
+        assert len(list((tmp_path / "worker-0.assets").iterdir())) == 1
+
+    def test_merge_shards(self, tmp_path):
+        writer = write_shard(tmp_path / "a" / "worker-0.jsonl", ["passed", "failed"])
+        writer.stage("warm-up", 12.5, healthy_after=11.0)
+        writer.close()
+        write_shard(tmp_path / "b" / "worker-0.jsonl", ["skipped"])  # crashed
+
+        output = merge(
+            [
+                str(tmp_path / "a" / "worker-0.jsonl"),
+                str(tmp_path / "b" / "worker-0.jsonl"),
+            ],
+            str(tmp_path / "report.html"),
+            str(tmp_path / "merged.jsonl"),
+        )
+
+        report = open(output).read()
+        assert "passed 1, failed 1, skipped 1 in 1 shards" in report
+        assert "assert 1 == 2" in report
+        assert "a/worker-0: warm-up 12.50s" in report
+        assert len((tmp_path / "merged.jsonl").read_text().splitlines()) == 7
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+from selenium.common import TimeoutException
+
+from src.pages.base_page import BasePage
+from src.telemetry import BIDI_EVENTS, BrowserTelemetry
+from src.waits import WaitHistory
+
+API = "https://thinking-tester-contact-list.herokuapp.com"
+
+
+class FakeConnection:
+    def __init__(self):
+        self.callbacks = {}
+        self.commands = []
+
+    def add_callback(self, event, callback):
+        self.callbacks[event.event_class] = lambda params: callback(
+            event.from_json(params)
+        )
+
+    def execute(self, command):
+        self.commands.append(next(command))
+
+    def dispatch(self, method, params):
+        self.callbacks[method](params)
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.script = type("Script", (), {"conn": FakeConnection()})()
+
+
+def request_params(method, url, request_id="1", **extra):
+    return {
+        "request": {"request": request_id, "method": method, "url": url},
+        "timestamp": 1_700_000_000_000,
+        **extra,
+    }
+
+
+@pytest.fixture
+def browser():
+    browser = FakeBrowser()
+    BrowserTelemetry("test_page").attach(browser)
+    return browser
+
+
+@pytest.mark.unit
+class TestTelemetry:
+    def test_attach_subscribes_once(self, browser):
+        (command,) = browser.script.conn.commands
+
+        assert command["method"] == "session.subscribe"
+        assert set(command["params"]["events"]) == {
+            event.event_class for event in BIDI_EVENTS
+        }
+
+    def test_events_are_parsed(self, browser):
+        connection = browser.script.conn
+        connection.dispatch(
+            "log.entryAdded",
+            {"type": "javascript", "level": "error", "text": "boom", "timestamp": 5},
+        )
+        connection.dispatch(
+            "network.responseCompleted",
+            request_params("POST", f"{API}/contacts/", response={"status": 201}),
+        )
+
+        error, response = browser.telemetry.events
+        assert error.describe() == "javascript error: boom"
+        assert response.path == "/contacts"
+        assert response.status == 201
+        assert browser.telemetry.counts() == {"javascript": 1, "response": 1}
+
+    def test_wait_for_response_wakes_up_on_event(self, browser):
+        connection = browser.script.conn
+        connection.dispatch(
+            "network.responseCompleted",
+            request_params("GET", f"{API}/contacts", response={"status": 200}),
+        )
+        mark = browser.telemetry.mark()
+
+        threading.Timer(
+            0.05,
+            connection.dispatch,
+            (
+                "network.responseCompleted",
+                request_params(
+                    "POST", f"{API}/contacts", "2", response={"status": 201}
+                ),
+            ),
+        ).start()
+
+        event = browser.telemetry.wait_for_response("post", "/contacts", 2, since=mark)
+        assert event.request_id == "2"
+
+        with pytest.raises(TimeoutError):
+            browser.telemetry.wait_for_response("GET", "/contacts", 0.05, since=mark)
+
+    def test_page_expects_response_and_checks_js_errors(self, browser, monkeypatch):
+        monkeypatch.setattr(BasePage, "wait_history", WaitHistory())
+        page = BasePage(browser, API)
+        connection = browser.script.conn
+
+        with page.expect_response("PUT", "/contacts/1", timeout=1):
+            connection.dispatch(
+                "network.responseCompleted",
+                request_params("PUT", f"{API}/contacts/1", response={"status": 200}),
+            )
+        page.should_have_no_js_errors()
+
+        with pytest.raises(TimeoutException):
+            with page.expect_response("DELETE", "/contacts/1", timeout=0.05):
+                pass
+
+        connection.dispatch(
+            "log.entryAdded",
+            {"type": "javascript", "level": "error", "text": "boom", "timestamp": 5},
+        )
+        with pytest.raises(AssertionError, match="1 JS errors: boom"):
+            page.should_have_no_js_errors()
@@ -0,0 +1,96 @@
+import io
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from src.visual import (  # noqa: E402
+    BaselineStore,
+    VisualChecker,
+    build_mask,
+    hash_distance,
+    perceptual_hash,
+    region_diff,
+)
+
+
+def page(offset: int = 0) -> np.ndarray:
+    image = np.full((240, 320, 3), 255, dtype=np.uint8)
+    image[20 : 60 + offset, 20:300] = (30, 90, 200)
+    image[100:220, 40:140] = (20, 20, 20)
+    return image
+
+
+def png(image: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+class TestVisual:
+    def test_hash_is_stable_and_sensitive(self):
+        assert hash_distance(perceptual_hash(page()), perceptual_hash(page())) == 0
+        assert hash_distance(perceptual_hash(page()), perceptual_hash(page(30))) > 0
+
+    def test_region_diff_respects_mask(self):
+        changed = page()
+        changed[110:130, 50:70] = 255
+
+        ratio, regions = region_diff(page(), changed)
+        assert ratio == pytest.approx(20 * 20 / (240 * 320))
+        assert (48, 96, 16, 16) in regions
+
+        mask = build_mask(changed.shape, [(40, 100, 100, 120)], scale=1.0)
+        assert region_diff(page(), changed, mask) == (0.0, [])
+
+    def test_store_is_content_addressed(self, tmp_path):
+        store = BaselineStore(str(tmp_path))
+        store.put("firefox/login", png(page()), "00")
+        store.put("firefox/addUser", png(page()), "00")
+        store.save()
+
+        assert len(list((tmp_path / "objects").rglob("*.png"))) == 1
+        assert BaselineStore(str(tmp_path)).read("firefox/login") == png(page())
+
+    def test_parallel_saves_merge_the_index(self, tmp_path):
+        stores = [BaselineStore(str(tmp_path)) for _ in range(8)]
+        for number, store in enumerate(stores):
+            store.put(f"browser-{number}/login", png(page(number)), "00")
+
+        threads = [threading.Thread(target=store.save) for store in stores]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        index = BaselineStore(str(tmp_path)).index
+        assert sorted(index) == [f"browser-{number}/login" for number in range(8)]
+        assert not list(tmp_path.rglob("*.tmp"))
+
+        (tmp_path / "index.json").write_text('{"firefox/login": {')
+        assert BaselineStore(str(tmp_path)).index == {}
+
+    def test_checker_flags_changed_regions(self, tmp_path):
+        checker = VisualChecker(BaselineStore(str(tmp_path)))
+
+        missing = checker.compare("firefox/login", png(page()))
+        assert missing.status == "missing" and missing.failed
+        assert "run --visual update" in checker.summary()[1]
+        assert not checker.store.changed
+
+        checker.mode = "update"
+        assert checker.compare("firefox/login", png(page())).status == "new"
+        checker.mode = "check"
+        assert checker.compare("firefox/login", png(page())).status == "match"
+
+        result = checker.compare("firefox/login", png(page(30)))
+        assert result.failed
+        assert result.regions
+
+        masked = checker.compare(
+            "firefox/login", png(page(30)), [(0, 0, 320, 100)], scale=1.0
+        )
+        assert masked.status == "match"
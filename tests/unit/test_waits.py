@@ -0,0 +1,145 @@
+import threading
+import time
+
+import pytest
+
+from src.pages.base_page import BasePage
+from src.waits import (
+    DEFAULT_TIMEOUT,
+    MAX_TIMEOUT,
+    MIN_TIMEOUT,
+    WaitHistory,
+    percentile,
+)
+
+
+class FakeDriver:
+    def __init__(self, present_after: float | None = None):
+        self.started = time.perf_counter()
+        self.present_after = present_after
+
+    def find_element(self, how, what):
+        from selenium.common import NoSuchElementException
+
+        if not self.find_elements(how, what):
+            raise NoSuchElementException(what)
+        return what
+
+    def find_elements(self, how, what):
+        if self.present_after is None:
+            return []
+        if time.perf_counter() - self.started < self.present_after:
+            return []
+        return [what]
+
+
+@pytest.fixture
+def history(monkeypatch):
+    history = WaitHistory()
+    monkeypatch.setattr(BasePage, "wait_history", history)
+    return history
+
+
+@pytest.mark.unit
+class TestWaits:
+    def test_percentile(self):
+        samples = [float(number) for number in range(1, 101)]
+
+        assert percentile(samples, 99) == 99.0
+        assert percentile(samples, 50) == 50.0
+        assert percentile([3.0], 99) == 3.0
+
+    def test_budget_is_learned_from_p99(self):
+        history = WaitHistory()
+
+        assert history.budget("Page:url_to_be") == DEFAULT_TIMEOUT
+
+        for _ in range(30):
+            history.record("Page:url_to_be", 0.2)
+        history.record("Page:url_to_be", 2.0)
+
+        assert history.budget("Page:url_to_be") == pytest.approx(2.0 * 1.5 + 0.5)
+
+        fast = WaitHistory()
+        for _ in range(30):
+            fast.record("Page:find #email", 0.01)
+
+        assert fast.budget("Page:find #email") == MIN_TIMEOUT
+
+    def test_history_is_merged_on_save(self, tmp_path):
+        path = str(tmp_path / "waits.json")
+        first = WaitHistory(path)
+        second = WaitHistory(path)
+        first.record("Page:find #email", 0.1)
+        second.record("Page:find #email", 0.3)
+
+        first.save()
+        second.save()
+
+        assert WaitHistory(path).samples == {"Page:find #email": [0.1, 0.3]}
+
+    def test_parallel_saves_keep_every_sample(self, tmp_path):
+        path = str(tmp_path / "waits.json")
+        shards = [WaitHistory(path) for _ in range(8)]
+        for number, shard in enumerate(shards):
+            shard.record("Page:find #email", float(number))
+
+        threads = [threading.Thread(target=shard.save) for shard in shards]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        samples = WaitHistory(path).samples["Page:find #email"]
+        assert sorted(samples) == [float(number) for number in range(8)]
+
+        (tmp_path / "waits.json").write_text('{"Page:find #email": [0.1]}')
+        assert WaitHistory(path).samples == {"Page:find #email": [0.1]}
+
+        (tmp_path / "waits.json").write_text('{"Page:find #email": [0.1')
+        assert WaitHistory(path).samples == {}
+
+    def test_timeouts_back_off_the_budget(self, tmp_path):
+        path = str(tmp_path / "waits.json")
+        history = WaitHistory(path)
+        for _ in range(30):
+            history.record("Page:url_to_be", 0.2)
+        assert history.budget("Page:url_to_be") == MIN_TIMEOUT
+
+        for _ in range(2):
+            history.record_timeout("Page:url_to_be", MIN_TIMEOUT)
+
+        assert history.budget("Page:url_to_be") == 4 * MIN_TIMEOUT
+        assert history.timeouts["Page:url_to_be"] == 2
+        assert "2" in history.summary()[1]
+
+        history.save()
+        history = WaitHistory(path)
+        assert history.budget("Page:url_to_be") == 4 * MIN_TIMEOUT
+
+        # A wait that needed the longer budget keeps it, a fast one resets it.
+        history.record("Page:url_to_be", 3.0)
+        assert history.streaks["Page:url_to_be"] == 2
+        history.record("Page:url_to_be", 0.2)
+        assert history.budget("Page:url_to_be") == pytest.approx(3.0 * 1.5 + 0.5)
+
+        for _ in range(10):
+            history.record_timeout("Page:url_to_be", 30)
+        assert history.budget("Page:url_to_be") == MAX_TIMEOUT
+
+    def test_negative_presence_returns_immediately(self, history):
+        page = BasePage(browser=FakeDriver(), url="https://example.com/")
+
+        started = time.perf_counter()
+        assert page.is_not_element_present("css selector", "#missing")
+        assert not page.is_element_present("css selector", "#missing", timeout=0)
+
+        assert time.perf_counter() - started < 0.1
+
+    def test_waits_poll_fast_and_are_recorded(self, history):
+        page = BasePage(browser=FakeDriver(present_after=0.1), url="https://a.b/")
+
+        assert page.find("css selector", "#email") == "#email"
+
+        [duration] = history.recorded["BasePage:find #email"]
+        assert 0.1 <= duration < 0.3
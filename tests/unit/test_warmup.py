@@ -0,0 +1,124 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.api_client import ContactListApi
+from src.warmup import WarmUp, wait_until_healthy
+
+
+class SleepingAppHandler(BaseHTTPRequestHandler):
+    # Answers 503 until it has been asked a few times, like a waking dyno.
+    requests = 0
+    wake_after = 3
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests += 1
+        status = 200 if self.requests > self.wake_after else 503
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def sleeping_app():
+    SleepingAppHandler.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SleepingAppHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.quit_count = 0
+        self.url = None
+        self.cookies = {}
+
+    def get(self, url):
+        self.url = url
+
+    def add_cookie(self, cookie):
+        self.cookies[cookie["name"]] = cookie["value"]
+
+    def delete_all_cookies(self):
+        self.cookies = {}
+
+    def quit(self):
+        self.quit_count += 1
+
+
+def fake_api(base_url: str) -> ContactListApi:
+    api = ContactListApi(base_url)
+    api.transport = lambda method, path, body=None: (200, {"token": "warm"})
+    return api
+
+
+@pytest.mark.unit
+class TestWarmUp:
+    def test_waits_until_app_is_healthy(self, sleeping_app):
+        wait_until_healthy(sleeping_app, timeout=5, interval=0.01)
+
+        assert SleepingAppHandler.requests == 4
+
+        SleepingAppHandler.requests = -100
+        with pytest.raises(TimeoutError, match="status 503"):
+            wait_until_healthy(sleeping_app, timeout=0.1, interval=0.05)
+
+    def test_overlaps_wake_up_with_browser_launch(self, sleeping_app):
+        launched = []
+
+        def launch():
+            time.sleep(0.05)
+            launched.append(FakeBrowser())
+            return launched[-1]
+
+        warm_up = WarmUp(
+            sleeping_app,
+            ("user@example.com", "secret"),
+            launch=launch,
+            browsers=2,
+            timeout=5,
+            interval=0.01,
+            api_factory=fake_api,
+        )
+        report = warm_up.run()
+
+        assert report.browsers == 2
+        assert report.healthy_after is not None
+        assert report.authenticated_after >= report.healthy_after
+        assert report.elapsed < 1
+        assert warm_up.api.token == "warm"
+        assert "2 browsers ready" in report.summary()
+        assert "(2 signed in)" in report.summary()
+        assert all(browser.cookies == {"token": "warm"} for browser in launched)
+        assert launched[0].url == sleeping_app
+
+        assert warm_up.take_browser() is launched[0]
+        assert launched[0].signed_in
+        assert warm_up.take_browser(signed_in=False) is launched[1]
+        assert not launched[1].signed_in and launched[1].cookies == {}
+
+        launched.append(FakeBrowser())
+        warm_up._ready.append(launched[-1])
+        warm_up.close()
+        assert warm_up.take_browser() is None
+        assert [browser.quit_count for browser in launched] == [0, 0, 1]
+
+    def test_failures_are_reported_not_raised(self, sleeping_app):
+        SleepingAppHandler.requests = -100
+
+        def launch():
+            raise RuntimeError("no driver")
+
+        report = WarmUp(sleeping_app, (None, None), launch=launch, timeout=0.1).run()
+
+        assert report.browsers == 0
+        assert report.authenticated_after is None
+        assert len(report.errors) == 2
+        assert "no driver" in report.summary()